@@ -0,0 +1,175 @@
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from mypy_boto3_athena.type_defs import DataCatalogTypeDef
+from mypy_boto3_glue.type_defs import GetTableResponseTypeDef, TableTypeDef
+
+from dbt.adapters.athena.constants import LOGGER
+
+GlueTableKey = Tuple[Optional[str], str, str]
+
+READ_ONLY_STATEMENTS = ("select", "with", "show", "describe", "desc", "explain", "values")
+SQL_COMMENTS = re.compile(r"/\*.*?\*/|--[^\n]*", re.DOTALL)
+# identifiers following the keywords that introduce the relation a statement writes to, e.g.
+# `create table "db"."schema"."table"`, `drop view if exists schema.view`, `insert into`, `merge into`,
+# `delete from`, `alter table ... rename to`
+WRITTEN_RELATIONS = re.compile(
+    r"\b(?:table|view|into|delete\s+from|rename\s+to)\s+(?:if\s+(?:not\s+)?exists\s+)?"
+    r"((?:[`\"]?[\w-]+[`\"]?\.){0,2}[`\"]?[\w-]+[`\"]?)",
+    re.IGNORECASE,
+)
+
+
+def _unquote(part: str) -> str:
+    return part.strip('`"').lower()
+
+
+def get_written_relations(sql: str) -> Optional[Set[Tuple[str, str]]]:
+    """
+    Get the (schema, identifier) pairs a SQL statement may modify.
+
+    Returns an empty set for read-only statements, and None when the statement may modify relations that
+    can not be identified, in which case callers should consider every relation as modified.
+    """
+    statement = SQL_COMMENTS.sub(" ", sql).strip().lower()
+    if not statement or statement.startswith(READ_ONLY_STATEMENTS):
+        return set()
+
+    relations = set()
+    for match in WRITTEN_RELATIONS.finditer(statement):
+        parts = [_unquote(p) for p in match.group(1).split(".")]
+        if len(parts) < 2:
+            # unqualified relation, the schema can't be known
+            return None
+        relations.add((parts[-2], parts[-1]))
+    return relations or None
+
+
+class GlueTableCache:
+    """
+    A thread-safe cache of Glue GetTable responses, keyed by catalog id, schema and identifier.
+
+    The cache lives as long as the adapter, entries are added on read and have to be invalidated whenever the
+    table is modified, either through Glue APIs or through SQL statements.
+    Missing tables are never cached, as they are usually created right after being looked up.
+
+    Every invalidation bumps the cache generation, responses fetched before an invalidation are not stored, as
+    they may describe the table before its modification.
+    """
+
+    def __init__(self) -> None:
+        self._tables: Dict[GlueTableKey, GetTableResponseTypeDef] = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        # the identifiers of the tables modified since the cache was created, None once unknown tables were modified
+        self._modified: Optional[Set[str]] = set()
+
+    @staticmethod
+    def _key(catalog_id: Optional[str], schema: str, identifier: str) -> GlueTableKey:
+        return catalog_id, schema.lower(), identifier.lower()
+
+    def get(
+        self, catalog_id: Optional[str], schema: Optional[str], identifier: Optional[str]
+    ) -> Optional[GetTableResponseTypeDef]:
+        if schema is None or identifier is None:
+            return None
+        with self._lock:
+            table = self._tables.get(self._key(catalog_id, schema, identifier))
+            if table is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return table
+
+    def put(self, catalog_id: Optional[str], table: GetTableResponseTypeDef, generation: int) -> None:
+        key = self._key(catalog_id, table["Table"]["DatabaseName"], table["Table"]["Name"])
+        with self._lock:
+            if generation == self.generation:
+                self._tables[key] = table
+
+    def put_many(self, catalog_id: Optional[str], tables: Iterable[TableTypeDef], generation: int) -> None:
+        with self._lock:
+            if generation != self.generation:
+                return
+            for table in tables:
+                self._tables[self._key(catalog_id, table["DatabaseName"], table["Name"])] = {  # type: ignore
+                    "Table": table
+                }
+
+    def invalidate(self, schema: Optional[str], identifier: Optional[str]) -> None:
+        """Invalidate the table in every catalog, or the whole cache if the relation isn't fully qualified"""
+        if schema is None or identifier is None:
+            self.clear()
+            return
+        with self._lock:
+            self.generation += 1
+            if self._modified is not None:
+                self._modified.add(identifier.lower())
+            for key in [k for k in self._tables if k[1] == schema.lower() and k[2] == identifier.lower()]:
+                del self._tables[key]
+
+    def invalidate_for_statement(self, sql: str) -> None:
+        """Invalidate the tables modified by a SQL statement, or the whole cache if they can't be identified"""
+        relations = get_written_relations(sql)
+        if relations is None:
+            LOGGER.debug("Clearing the Glue table cache after a statement modifying unknown relations")
+            self.clear()
+            return
+        for schema, identifier in relations:
+            self.invalidate(schema, identifier)
+
+    def clear(self) -> None:
+        """Invalidate every table, which is also how modifications of unknown tables are recorded"""
+        with self._lock:
+            self.generation += 1
+            self._tables.clear()
+            self._modified = None
+
+    def modified_identifiers(self) -> Optional[Set[str]]:
+        """Get the identifiers of the tables modified since the cache was created, None if unknown tables were"""
+        with self._lock:
+            return None if self._modified is None else set(self._modified)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._tables)}
+
+
+class DataCatalogCache:
+    """
+    A thread-safe cache of data catalog descriptors, keyed by catalog name.
+
+    Descriptors are kept for the whole invocation, unless a ttl (in seconds) is given, which is useful for long-running
+    processes where catalogs could be re-created with a different type or catalog id.
+    """
+
+    def __init__(self, ttl: Optional[float] = None) -> None:
+        self.ttl = ttl
+        self._catalogs: Dict[str, Tuple[float, Optional[DataCatalogTypeDef]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(
+        self, name: str, loader: Callable[[], Optional[DataCatalogTypeDef]]
+    ) -> Optional[DataCatalogTypeDef]:
+        key = name.lower()
+        # the lock is held while loading, so that concurrent threads wait for the first lookup instead of repeating it
+        with self._lock:
+            if key in self._catalogs:
+                loaded_at, catalog = self._catalogs[key]
+                if self.ttl is None or time.monotonic() - loaded_at < self.ttl:
+                    self.hits += 1
+                    return catalog
+            self.misses += 1
+            catalog = loader()
+            self._catalogs[key] = (time.monotonic(), catalog)
+            return catalog
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
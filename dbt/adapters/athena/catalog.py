@@ -0,0 +1,129 @@
+from array import array
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+import agate
+from dbt_common.clients.agate_helper import table_from_rows
+from mypy_boto3_glue.type_defs import ColumnOutputTypeDef
+
+CATALOG_COLUMN_NAMES = (
+    "table_database",
+    "table_schema",
+    "table_name",
+    "table_type",
+    "table_comment",
+    "column_name",
+    "column_index",
+    "column_type",
+    "column_comment",
+)
+# catalog columns which must not be coerced to another type, e.g. numeric catalog ids or table names
+CATALOG_TEXT_COLUMN_NAMES = [
+    "table_database",
+    "table_schema",
+    "table_name",
+    "table_type",
+    "table_comment",
+    "column_name",
+    "column_type",
+    "column_comment",
+]
+
+CatalogRow = Tuple[Any, ...]
+
+
+class CatalogRows(Sequence[CatalogRow]):
+    """
+    The rows of a catalog table, stored by column.
+
+    Table level fields are stored once per table, column level fields in parallel arrays, and rows are only
+    materialized when they are read, e.g. as agate builds the catalog table.
+    This avoids keeping a tuple, or a dict, per column of every table of the catalog in memory while it is fetched.
+    """
+
+    def __init__(self) -> None:
+        self._tables: List[CatalogRow] = []
+        self._table_refs = array("L")
+        self._column_names: List[str] = []
+        self._column_indexes = array("L")
+        self._column_types: List[str] = []
+        self._column_comments: List[Optional[str]] = []
+
+    def add_table(
+        self,
+        database: str,
+        schema: str,
+        name: str,
+        table_type: str,
+        comment: Optional[str],
+        columns: Iterable[ColumnOutputTypeDef],
+    ) -> None:
+        table_ref = len(self._tables)
+        self._tables.append((database, schema, name, table_type, comment or None))
+        for idx, col in enumerate(columns):
+            self._table_refs.append(table_ref)
+            self._column_names.append(col["Name"])
+            self._column_indexes.append(idx)
+            self._column_types.append(col["Type"])
+            self._column_comments.append(col.get("Comment") or None)
+
+    def extend(self, other: "CatalogRows") -> None:
+        offset = len(self._tables)
+        self._tables.extend(other._tables)
+        self._table_refs.extend(ref + offset for ref in other._table_refs)
+        self._column_names.extend(other._column_names)
+        self._column_indexes.extend(other._column_indexes)
+        self._column_types.extend(other._column_types)
+        self._column_comments.extend(other._column_comments)
+
+    @property
+    def num_tables(self) -> int:
+        return len(self._tables)
+
+    def _row(self, i: int) -> CatalogRow:
+        return (
+            *self._tables[self._table_refs[i]],
+            self._column_names[i],
+            self._column_indexes[i],
+            self._column_types[i],
+            self._column_comments[i],
+        )
+
+    def __len__(self) -> int:
+        return len(self._column_names)
+
+    @overload
+    def __getitem__(self, index: int) -> CatalogRow:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[CatalogRow]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[CatalogRow, List[CatalogRow]]:
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("catalog row index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[CatalogRow]:
+        tables = self._tables
+        for table_ref, name, idx, type_, comment in zip(
+            self._table_refs, self._column_names, self._column_indexes, self._column_types, self._column_comments
+        ):
+            yield (*tables[table_ref], name, idx, type_, comment)
+
+    def to_table(self) -> agate.Table:
+        return table_from_rows(list(self), CATALOG_COLUMN_NAMES, text_only_columns=CATALOG_TEXT_COLUMN_NAMES)
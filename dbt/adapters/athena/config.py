@@ -19,10 +19,11 @@ from dbt.adapters.athena.constants import (
 
 
 @lru_cache()
-def get_boto3_config(num_retries: int) -> config.Config:
+def get_boto3_config(num_retries: int, retry_mode: str = "standard", max_pool_connections: int = 10) -> config.Config:
     return config.Config(
         user_agent_extra="dbt-athena-community/" + importlib.metadata.version("dbt-athena-community"),
-        retries={"max_attempts": num_retries, "mode": "standard"},
+        retries={"max_attempts": num_retries, "mode": retry_mode},
+        max_pool_connections=max_pool_connections,
     )
 
 
@@ -1,13 +1,16 @@
 import json
 import re
 import time
-from concurrent.futures.thread import ThreadPoolExecutor
 from contextlib import contextmanager
+from contextvars import ContextVar
 from copy import deepcopy
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Any, ContextManager, Dict, List, Optional, Tuple
+from multiprocessing.context import SpawnContext
+from typing import Any, ContextManager, Dict, List, Optional, Tuple, Type, cast
+from uuid import uuid4
 
+import agate
 from dbt_common.exceptions import ConnectionError, DbtRuntimeError
 from dbt_common.utils import md5
 from pyathena.connection import Connection as AthenaConnection
@@ -22,7 +25,6 @@ from pyathena.formatter import (
     _escape_presto,
 )
 from pyathena.model import AthenaQueryExecution
-from pyathena.result_set import AthenaResultSet
 from pyathena.util import RetryConfig
 from tenacity import (
     retry,
@@ -32,11 +34,35 @@ from tenacity import (
 )
 from typing_extensions import Self
 
+from dbt.adapters.athena.cache import GlueTableCache
 from dbt.adapters.athena.config import get_boto3_config
 from dbt.adapters.athena.constants import LOGGER
+from dbt.adapters.athena.idempotency import client_request_tokens
+from dbt.adapters.athena.polling import (
+    get_statement_fingerprint,
+    poll_stats,
+    query_poller,
+    query_runtime_history,
+)
 from dbt.adapters.athena.query_headers import AthenaMacroQueryStringSetter
-from dbt.adapters.athena.session import get_boto3_session
+from dbt.adapters.athena.results import (
+    arrow_to_agate,
+    batches_to_agate,
+    delete_s3_prefix,
+    is_query,
+    is_reusable_query,
+    is_sorted,
+    iter_parquet_batches,
+    read_csv_result,
+    wrap_unload,
+)
+from dbt.adapters.athena.session import (
+    Boto3ClientRegistry,
+    get_boto3_session,
+    get_credentials_key,
+)
 from dbt.adapters.contracts.connection import (
+    AdapterRequiredConfig,
     AdapterResponse,
     Connection,
     ConnectionState,
@@ -44,10 +70,16 @@ from dbt.adapters.contracts.connection import (
 )
 from dbt.adapters.sql import SQLConnectionManager
 
+# the maximum age in minutes of the previous results Athena may reuse for the statement executed by the current thread
+result_reuse_max_age: ContextVar[Optional[int]] = ContextVar("result_reuse_max_age", default=None)
+# the dbt connection, i.e. the model, submitting statements from the current thread, scoping their ClientRequestToken
+client_request_scope: ContextVar[Optional[str]] = ContextVar("client_request_scope", default=None)
+
 
 @dataclass
 class AthenaAdapterResponse(AdapterResponse):
     data_scanned_in_bytes: Optional[int] = None
+    reused_previous_result: Optional[bool] = None
 
 
 @dataclass
@@ -61,6 +93,9 @@ class AthenaCredentials(Credentials):
     aws_secret_access_key: Optional[str] = None
     aws_session_token: Optional[str] = None
     poll_interval: float = 1.0
+    poll_min_interval: float = 0.1
+    poll_max_interval: float = 5.0
+    poll_history: bool = False
     debug_query_state: bool = False
     _ALIASES = {"catalog": "database"}
     num_retries: int = 5
@@ -78,6 +113,13 @@ class AthenaCredentials(Credentials):
     # Credentials in profile "athena", target "athena" invalid: Unable to create schema for 'dict'
     seed_s3_upload_args: Optional[Dict[str, Any]] = None
     lf_tags_database: Optional[Dict[str, str]] = None
+    catalog_cache_ttl: Optional[int] = None
+    metadata_concurrency: Optional[int] = None
+    defer_s3_deletes: bool = False
+    swap_partitions_diff: bool = False
+    unload_results: bool = False
+    arrow_results: bool = False
+    result_reuse_max_age: Optional[int] = None
 
     @property
     def type(self) -> str:
@@ -99,6 +141,9 @@ class AthenaCredentials(Credentials):
             "database",
             "schema",
             "poll_interval",
+            "poll_min_interval",
+            "poll_max_interval",
+            "poll_history",
             "aws_profile_name",
             "aws_access_key_id",
             "endpoint_url",
@@ -112,24 +157,28 @@ class AthenaCredentials(Credentials):
             "emr_job_execution_role_arn",
             "emr_application_id",
             "emr_application_name",
-            "lambda_function_name"
+            "lambda_function_name",
+            "catalog_cache_ttl",
+            "metadata_concurrency",
+            "defer_s3_deletes",
+            "swap_partitions_diff",
+            "unload_results",
+            "arrow_results",
+            "result_reuse_max_age",
         )
 
 
 class AthenaCursor(Cursor):
     def __init__(self, **kwargs) -> None:  # type: ignore
         super().__init__(**kwargs)
-        self._executor = ThreadPoolExecutor()
-
-    def _collect_result_set(self, query_id: str) -> AthenaResultSet:
-        query_execution = self._poll(query_id)
-        return self._result_set_class(
-            connection=self._connection,
-            converter=self._converter,
-            query_execution=query_execution,
-            arraysize=self._arraysize,
-            retry_config=self._retry_config,
-        )
+        self._statement_fingerprint: Optional[str] = None
+        self._client_request_token: Optional[str] = None
+
+    def _build_start_query_execution_request(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        request = super()._build_start_query_execution_request(*args, **kwargs)
+        if self._client_request_token:
+            request["ClientRequestToken"] = self._client_request_token
+        return request
 
     def _poll(self, query_id: str) -> AthenaQueryExecution:
         try:
@@ -144,18 +193,37 @@ class AthenaCursor(Cursor):
         return query_execution
 
     def __poll(self, query_id: str) -> AthenaQueryExecution:
-        while True:
-            query_execution = self._get_query_execution(query_id)
-            if query_execution.state in [
-                AthenaQueryExecution.STATE_SUCCEEDED,
-                AthenaQueryExecution.STATE_FAILED,
-                AthenaQueryExecution.STATE_CANCELLED,
-            ]:
-                return query_execution
-
-            if self.connection.cursor_kwargs.get("debug_query_state", False):
-                LOGGER.debug(f"Query state is: {query_execution.state}. Sleeping for {self._poll_interval}...")
-            time.sleep(self._poll_interval)
+        """
+        Wait for a query to complete. Its state is polled by the query poller shared by the process, along with the
+        other running queries of the same region and credentials, waiting longer between each poll, from
+        poll_min_interval up to poll_max_interval. A poll_interval higher than poll_max_interval is the maximum
+        interval instead, and a lower one the minimum. With poll_history, polls skip ahead to shortly before the
+        expected end of the statement.
+        """
+        cursor_kwargs = self.connection.cursor_kwargs
+        min_interval = min(cursor_kwargs.get("poll_min_interval", self._poll_interval), self._poll_interval)
+        max_interval = max(cursor_kwargs.get("poll_max_interval", self._poll_interval), self._poll_interval)
+        expected_runtime = None
+        if self._statement_fingerprint and cursor_kwargs.get("poll_history", False):
+            expected_runtime = query_runtime_history.expected_runtime(self._statement_fingerprint)
+
+        started_at = time.monotonic()
+        query_execution, polls = query_poller.poll(
+            self._connection.client,
+            self._retry_config,
+            query_id,
+            min_interval,
+            max_interval,
+            expected_runtime=expected_runtime,
+            debug_query_state=cursor_kwargs.get("debug_query_state", False),
+            client_key=cursor_kwargs.get("poll_client_key"),
+        ).result()
+        elapsed = time.monotonic() - started_at
+        poll_stats.record(polls)
+        if self._statement_fingerprint and query_execution.state == AthenaQueryExecution.STATE_SUCCEEDED:
+            query_runtime_history.record(self._statement_fingerprint, elapsed)
+        LOGGER.debug(f"Athena query {query_id} {query_execution.state} after {elapsed:.2f}s and {polls} polls")
+        return query_execution
 
     def execute(
         self,
@@ -169,6 +237,13 @@ class AthenaCursor(Cursor):
         catch_partitions_limit: bool = False,
         **kwargs: Dict[str, Any],
     ) -> Self:
+        max_age = result_reuse_max_age.get()
+        result_reuse = {"result_reuse_enable": True, "result_reuse_minutes": max_age} if max_age else {}
+        scope = client_request_scope.get()
+        # the execution started by the previous attempt, polled again when only polling it failed
+        submitted: Dict[str, Optional[str]] = {"query_id": None}
+        self._client_request_token = None
+
         @retry(
             # No need to retry if TOO_MANY_OPEN_PARTITIONS occurs.
             # Otherwise, Athena throws ICEBERG_FILESYSTEM_ERROR after retry,
@@ -199,18 +274,29 @@ class AthenaCursor(Cursor):
                 reraise=True,
             )
             def execute_with_iceberg_retries() -> AthenaCursor:
-                query_id = self._execute(
-                    operation,
-                    parameters=parameters,
-                    work_group=work_group,
-                    s3_staging_dir=s3_staging_dir,
-                    cache_size=cache_size,
-                    cache_expiration_time=cache_expiration_time,
-                )
-
-                LOGGER.debug(f"Athena query ID {query_id}")
-
-                query_execution = self._executor.submit(self._collect_result_set, query_id).result()
+                self._statement_fingerprint = get_statement_fingerprint(operation, scope)
+                query_id = submitted["query_id"]
+                if query_id is None:
+                    # a submission retried after its response was lost reattaches to the execution it started
+                    if scope is not None and self._client_request_token is None:
+                        self._client_request_token = client_request_tokens.next_token(scope, operation)
+                    query_id = self._execute(
+                        operation,
+                        parameters=parameters,
+                        work_group=work_group,
+                        s3_staging_dir=s3_staging_dir,
+                        cache_size=cache_size,
+                        cache_expiration_time=cache_expiration_time,
+                        **result_reuse,
+                    )
+                    submitted["query_id"] = query_id
+                    LOGGER.debug(f"Athena query ID {query_id}")
+                else:
+                    LOGGER.debug(f"Polling Athena query {query_id} again instead of submitting it again")
+
+                query_execution = self._poll(query_id)
+                if query_execution.reused_previous_result:
+                    LOGGER.debug(f"Athena query {query_id} reused the results of a previous execution")
                 if query_execution.state == AthenaQueryExecution.STATE_SUCCEEDED:
                     self.result_set = self._result_set_class(
                         self._connection,
@@ -220,6 +306,9 @@ class AthenaCursor(Cursor):
                         self._retry_config,
                     )
                     return self
+                # the execution itself failed, a retry has to start a new one, with a new token
+                submitted["query_id"] = None
+                self._client_request_token = None
                 raise OperationalError(query_execution.state_change_reason)
 
             return execute_with_iceberg_retries()  # type: ignore
@@ -230,6 +319,18 @@ class AthenaCursor(Cursor):
 class AthenaConnectionManager(SQLConnectionManager):
     TYPE = "athena"
 
+    def __init__(self, profile: AdapterRequiredConfig, mp_context: SpawnContext) -> None:
+        super().__init__(profile, mp_context)
+        # the size of the metadata thread pool of the adapter, which reads results and metadata concurrently
+        credentials = cast(AthenaCredentials, profile.credentials)
+        self.metadata_concurrency: int = credentials.metadata_concurrency or profile.threads
+        # shared with the adapter, so that results and metadata are read with the same boto3 clients
+        self.boto3_clients = Boto3ClientRegistry(self.metadata_concurrency)
+        # shared with the adapter, which records the tables modified during the invocation, whose results are not reused
+        self.glue_tables = GlueTableCache()
+        # the result_reuse_max_age of the model run by each connection, by connection name
+        self.result_reuse_max_ages: Dict[Optional[str], Optional[int]] = {}
+
     def set_query_header(self, query_header_context: Dict[str, Any]) -> None:
         self.query_header = AthenaMacroQueryStringSetter(self.profile, query_header_context)
 
@@ -269,6 +370,11 @@ class AthenaConnectionManager(SQLConnectionManager):
                 cursor_class=AthenaCursor,
                 cursor_kwargs={
                     "debug_query_state": creds.debug_query_state,
+                    "poll_min_interval": creds.poll_min_interval,
+                    "poll_max_interval": creds.poll_max_interval,
+                    "poll_history": creds.poll_history,
+                    # the queries of all the connections of the profile are polled with the same client
+                    "poll_client_key": get_credentials_key(creds),
                     "num_iceberg_retries": creds.num_iceberg_retries,
                 },
                 formatter=AthenaParameterFormatter(),
@@ -292,6 +398,97 @@ class AthenaConnectionManager(SQLConnectionManager):
 
         return connection
 
+    def execute(
+        self,
+        sql: str,
+        auto_begin: bool = False,
+        fetch: bool = False,
+        limit: Optional[int] = None,
+    ) -> Tuple[AdapterResponse, agate.Table]:
+        connection = self.get_thread_connection()
+        credentials = connection.credentials
+        if fetch and credentials.unload_results and is_query(sql) and not is_sorted(sql):
+            # the results are unloaded as Parquet files and read in bulk, instead of being paged through GetQueryResults
+            # sorted queries are fetched with GetQueryResults, the files written by UNLOAD do not keep the order
+            s3_path = f"{credentials.s3_staging_dir.rstrip('/')}/unload/{uuid4()}/"
+            sql = self._add_query_comment(sql)
+            try:
+                _, cursor = self.add_query(wrap_unload(sql, s3_path), auto_begin)
+                started_at = time.monotonic()
+                table = self.get_result_from_unload(connection, s3_path, limit)
+            finally:
+                self.delete_unloaded_results(connection, s3_path)
+        else:
+            token = result_reuse_max_age.set(self.get_result_reuse_max_age(connection, sql) if fetch else None)
+            try:
+                if not (fetch and credentials.arrow_results):
+                    return super().execute(sql, auto_begin=auto_begin, fetch=fetch, limit=limit)
+                sql = self._add_query_comment(sql)
+                _, cursor = self.add_query(sql, auto_begin)
+            finally:
+                result_reuse_max_age.reset(token)
+            started_at = time.monotonic()
+            table = self.get_result_from_output(connection, cursor, limit)
+        LOGGER.debug(f"Read {len(table.rows)} rows of query {cursor.query_id} in {time.monotonic() - started_at:.2f}s")
+        return self.get_response(cursor), table
+
+    def add_query(
+        self,
+        sql: str,
+        auto_begin: bool = True,
+        bindings: Optional[Any] = None,
+        abridge_sql_log: bool = False,
+        retryable_exceptions: Tuple[Type[Exception], ...] = (),
+        retry_limit: int = 1,
+    ) -> Tuple[Connection, Any]:
+        token = client_request_scope.set(self.get_thread_connection().name)
+        try:
+            return super().add_query(sql, auto_begin, bindings, abridge_sql_log, retryable_exceptions, retry_limit)
+        finally:
+            client_request_scope.reset(token)
+
+    def get_result_reuse_max_age(self, connection: Connection, sql: str) -> Optional[int]:
+        """
+        Get for how many minutes Athena may reuse previous results of a statement whose results are fetched, e.g. the
+        introspective queries of macros: the result_reuse_max_age of the model being run, else of the profile.
+        Only queries reading tables which were not modified by the invocation can reuse results, and they are not
+        reused when the max age is not set or zero.
+        """
+        if not is_reusable_query(sql, self.glue_tables.modified_identifiers()):
+            return None
+        max_age = self.result_reuse_max_ages.get(connection.name)
+        return connection.credentials.result_reuse_max_age if max_age is None else max_age
+
+    def get_result_from_unload(self, connection: Connection, s3_path: str, limit: Optional[int]) -> agate.Table:
+        s3_client = self.boto3_clients.get_client(connection, "s3")
+        bucket, _, prefix = s3_path[len("s3://") :].partition("/")
+        return batches_to_agate(iter_parquet_batches(s3_client, bucket, prefix, self.metadata_concurrency), limit)
+
+    def delete_unloaded_results(self, connection: Connection, s3_path: str) -> None:
+        """Deletes the files written by an UNLOAD statement, failing to do so does not fail the statement."""
+        s3_client = self.boto3_clients.get_client(connection, "s3")
+        bucket, _, prefix = s3_path[len("s3://") :].partition("/")
+        try:
+            deleted = delete_s3_prefix(s3_client, bucket, prefix)
+        except Exception as e:
+            LOGGER.warning(f"Failed to delete the unloaded results under {s3_path}: {e}")
+            return
+        LOGGER.debug(f"Deleted {deleted} unloaded result files under {s3_path}")
+
+    def get_result_from_output(self, connection: Connection, cursor: AthenaCursor, limit: Optional[int]) -> agate.Table:
+        """
+        Reads the CSV output of a query from S3 in a single request and parses it with pyarrow, instead of paging
+        through GetQueryResults and converting every value in Python.
+        Statements without a CSV output, e.g. DDLs, are fetched from the cursor.
+        """
+        output_location = cursor.output_location
+        if cursor.description is None or not output_location or not output_location.endswith(".csv"):
+            return self.get_result_from_cursor(cursor, limit)
+        s3_client = self.boto3_clients.get_client(connection, "s3")
+        bucket, _, key = output_location[len("s3://") :].partition("/")
+        body = s3_client.get_object(Bucket=bucket, Key=key)["Body"].read()
+        return arrow_to_agate(read_csv_result(body, cursor.description), limit)
+
     @classmethod
     def get_response(cls, cursor: AthenaCursor) -> AthenaAdapterResponse:
         code = "OK" if cursor.state == AthenaQueryExecution.STATE_SUCCEEDED else "ERROR"
@@ -301,6 +498,7 @@ class AthenaConnectionManager(SQLConnectionManager):
             rows_affected=rowcount,
             code=code,
             data_scanned_in_bytes=data_scanned_in_bytes,
+            reused_previous_result=getattr(cursor, "reused_previous_result", None),
         )
 
     @staticmethod
@@ -349,7 +547,7 @@ class AthenaParameterFormatter(Formatter):
             raise ProgrammingError("Query is none or empty.")
         operation = operation.strip()
 
-        if operation.upper().startswith(("SELECT", "WITH", "INSERT")):
+        if operation.upper().startswith(("SELECT", "WITH", "INSERT", "UNLOAD")):
             escaper = _escape_presto
         elif operation.upper().startswith(("VACUUM", "OPTIMIZE")):
             operation = operation.replace('"', "")
@@ -0,0 +1,43 @@
+import threading
+from hashlib import sha256
+from typing import Dict, Optional, Tuple
+
+from dbt_common.invocation import get_invocation_id
+
+
+def normalize_statement(sql: str) -> str:
+    """Statements differing only by whitespace are the same statement, e.g. once rendered by another macro."""
+    return " ".join(sql.split())
+
+
+class ClientRequestTokens:
+    """
+    Derives the ClientRequestToken of the submissions of statements, making them idempotent.
+
+    The n-th submission of a statement by a model gets the same token whenever it is retried, from the dbt invocation
+    id, the model, the hash of the normalized statement and n: StartQueryExecution then returns the execution already
+    started with this token instead of starting another one, e.g. when the response of a previous attempt was lost.
+    Later submissions of the same statement, e.g. introspective queries run again after a change, get new tokens.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._invocation_id: Optional[str] = None
+        self._submissions: Dict[Tuple[str, str], int] = {}
+
+    def next_token(self, scope: str, sql: str) -> str:
+        invocation_id = get_invocation_id()
+        statement_hash = sha256(normalize_statement(sql).encode()).hexdigest()
+        with self._lock:
+            if invocation_id != self._invocation_id:
+                # the counts of the previous invocations are not needed anymore, their tokens are different
+                self._invocation_id = invocation_id
+                self._submissions = {}
+            submission = self._submissions.get((scope, statement_hash), 0)
+            self._submissions[(scope, statement_hash)] = submission + 1
+        # between 32 and 128 characters, as required by Athena
+        return sha256(f"{invocation_id}:{scope}:{statement_hash}:{submission}".encode()).hexdigest()
+
+
+# shared by all the connections of the process
+client_request_tokens = ClientRequestTokens()
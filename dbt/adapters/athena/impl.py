@@ -1,28 +1,45 @@
 import csv
+import math
 import os
 import posixpath as path
+import random
 import re
-import struct
 import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import date, datetime
-from functools import lru_cache
+from functools import lru_cache, partial
+from multiprocessing.context import SpawnContext
 from textwrap import dedent
-from threading import Lock
-from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Type
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
 from urllib.parse import urlparse
 from uuid import uuid4
 
 import agate
-import mmh3
 from botocore.exceptions import ClientError
-from dbt_common.clients.agate_helper import table_from_rows
 from dbt_common.contracts.constraints import ConstraintType
 from dbt_common.exceptions import DbtRuntimeError
 from mypy_boto3_athena.type_defs import DataCatalogTypeDef, GetWorkGroupOutputTypeDef
 from mypy_boto3_glue.type_defs import (
     ColumnTypeDef,
     GetTableResponseTypeDef,
+    PartitionInputTypeDef,
+    PartitionTypeDef,
     TableInputTypeDef,
     TableTypeDef,
     TableVersionTypeDef,
@@ -30,9 +47,10 @@ from mypy_boto3_glue.type_defs import (
 from pyathena.error import OperationalError
 
 from dbt.adapters.athena import AthenaConnectionManager
+from dbt.adapters.athena.cache import DataCatalogCache
+from dbt.adapters.athena.catalog import CatalogRows
 from dbt.adapters.athena.column import AthenaColumn
-from dbt.adapters.athena.config import get_boto3_config
-from dbt.adapters.athena.connections import AthenaCursor
+from dbt.adapters.athena.connections import AthenaCursor, client_request_scope
 from dbt.adapters.athena.constants import LOGGER
 from dbt.adapters.athena.exceptions import (
     S3LocationException,
@@ -44,6 +62,19 @@ from dbt.adapters.athena.lakeformation import (
     LfTagsConfig,
     LfTagsManager,
 )
+from dbt.adapters.athena.partitions import (
+    format_partition_condition_value,
+    format_partition_key,
+    get_bucket_number,
+    get_glue_column_type,
+    get_partition_batches,
+    get_partition_expressions,
+)
+from dbt.adapters.athena.polling import (
+    POLL_HISTORY_FILE,
+    poll_stats,
+    query_runtime_history,
+)
 from dbt.adapters.athena.python_submissions import AthenaPythonJobHelper, EmrServerlessJobHelper, LambdaJobHelper
 from dbt.adapters.athena.relation import (
     AthenaRelation,
@@ -59,17 +90,24 @@ from dbt.adapters.athena.utils import (
     get_catalog_id,
     get_catalog_type,
     get_chunks,
+    get_table_name_expressions,
     is_valid_table_parameter_key,
     stringify_table_parameter_value,
 )
 from dbt.adapters.base import ConstraintSupport, PythonJobHelper, available
 from dbt.adapters.base.impl import AdapterConfig
 from dbt.adapters.base.relation import BaseRelation, InformationSchema
-from dbt.adapters.contracts.connection import AdapterResponse
+from dbt.adapters.contracts.connection import AdapterResponse, Connection
 from dbt.adapters.contracts.relation import RelationConfig
 from dbt.adapters.sql import SQLAdapter
 
-boto3_client_lock = Lock()
+S = TypeVar("S")
+T = TypeVar("T")
+
+# the last part of the locations generated by the unique s3_data_naming, these are never reused by another table
+UNIQUE_LOCATION_SUFFIX = re.compile(r"/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}/?$")
+# DeleteObjects errors worth retrying, other errors (e.g. AccessDenied) would fail again
+S3_RETRYABLE_ERROR_CODES = ("SlowDown", "InternalError", "ServiceUnavailable", "RequestTimeout")
 
 
 @dataclass
@@ -99,6 +137,9 @@ class AthenaConfig(AdapterConfig):
         force_batch: Skip creating the table as ctas and run the operation directly in batch insert mode.
         unique_tmp_table_suffix: Enforce the use of a unique id as tmp table suffix instead of __dbt_tmp.
         temp_schema: Define in which schema to create temporary tables used in incremental runs.
+        result_reuse_max_age: Minutes for which Athena may reuse previous results of the queries fetched by macros.
+        batch_concurrency: Maximum number of batches run concurrently when batching.
+        batch_max_rows: Maximum number of rows of a batch, partitions are batched by count only if not set.
     """
 
     work_group: Optional[str] = None
@@ -121,14 +162,22 @@ class AthenaConfig(AdapterConfig):
     force_batch: bool = False
     unique_tmp_table_suffix: bool = False
     temp_schema: Optional[str] = None
+    result_reuse_max_age: Optional[int] = None
+    batch_concurrency: int = 1
+    batch_max_rows: Optional[int] = None
 
 
 class AthenaAdapter(SQLAdapter):
     BATCH_CREATE_PARTITION_API_LIMIT = 100
     BATCH_DELETE_PARTITION_API_LIMIT = 25
-    INTEGER_MAX_VALUE_32_BIT_SIGNED = 0x7FFFFFFF
+    BATCH_UPDATE_PARTITION_API_LIMIT = 100
+    GET_TABLES_API_LIMIT = 100
+    GET_PARTITIONS_API_LIMIT = 1000
+    GET_PARTITIONS_MAX_SEGMENTS = 10
+    DELETE_OBJECTS_API_LIMIT = 1000
 
     ConnectionManager = AthenaConnectionManager
+    connections: AthenaConnectionManager
     Relation = AthenaRelation
     AdapterSpecificConfigs = AthenaConfig
     Column = AthenaColumn
@@ -144,6 +193,107 @@ class AthenaAdapter(SQLAdapter):
         ConstraintType.foreign_key: ConstraintSupport.NOT_SUPPORTED,
     }
 
+    def __init__(self, config: Any, mp_context: SpawnContext) -> None:
+        super().__init__(config, mp_context)
+        self._boto3_clients = self.connections.boto3_clients
+        self._glue_tables = self.connections.glue_tables
+        self._data_catalogs = DataCatalogCache(ttl=config.credentials.catalog_cache_ttl)
+        self._metadata_concurrency = self.connections.metadata_concurrency
+        self._metadata_executor: Optional[ThreadPoolExecutor] = None
+        self._metadata_executor_lock = threading.Lock()
+        self._defer_s3_deletes = config.credentials.defer_s3_deletes
+        self._swap_partitions_diff = config.credentials.swap_partitions_diff
+        self._deferred_deletes: Dict[str, Future[None]] = {}
+        self._deferred_deletes_executor: Optional[ThreadPoolExecutor] = None
+        self._deferred_deletes_lock = threading.Lock()
+        # the runtimes of the statements of previous invocations, kept in the target directory
+        self._query_runtime_history_path: Optional[str] = None
+        target_path = getattr(config, "project_target_path", None)
+        if config.credentials.poll_history and target_path:
+            self._query_runtime_history_path = os.path.join(target_path, POLL_HISTORY_FILE)
+            query_runtime_history.load(self._query_runtime_history_path)
+
+    def _get_boto3_client(self, service_name: str, retry_mode: str = "standard") -> Any:
+        """
+        Get a boto3 client bound to the current thread connection, reused for the whole invocation
+        """
+        conn = self.connections.get_thread_connection()
+        return self._boto3_clients.get_client(conn, service_name, retry_mode=retry_mode)
+
+    def _map_metadata(self, func: Callable[[S], T], items: Iterable[S]) -> List[T]:
+        """
+        Run func over items concurrently on the metadata thread pool, shared by the whole invocation and bounded by
+        metadata_concurrency, and return the results in the order of items.
+
+        The worker threads hold no dbt connection: boto3 clients have to be created by the calling thread.
+        func must not call _map_metadata itself, a bounded pool waiting on its own tasks could deadlock.
+        """
+        items = list(items)
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        with self._metadata_executor_lock:
+            if self._metadata_executor is None:
+                self._metadata_executor = ThreadPoolExecutor(
+                    max_workers=self._metadata_concurrency, thread_name_prefix="athena-metadata"
+                )
+            executor = self._metadata_executor
+        return list(executor.map(func, items))
+
+    def cleanup_connections(self) -> None:
+        # deferred deletes use the metadata executor, they have to be flushed first
+        self._flush_deferred_deletes()
+        with self._metadata_executor_lock:
+            if self._metadata_executor is not None:
+                self._metadata_executor.shutdown()
+                self._metadata_executor = None
+        stats = self._boto3_clients.stats()
+        LOGGER.debug(f"boto3 clients reused: {stats['hits']}, created: {stats['misses']}")
+        stats = self._glue_tables.stats()
+        LOGGER.debug(f"Glue table cache hits: {stats['hits']}, misses: {stats['misses']}")
+        stats = self._data_catalogs.stats()
+        LOGGER.debug(f"Data catalog lookups avoided: {stats['hits']}, performed: {stats['misses']}")
+        stats = poll_stats.stats()
+        LOGGER.debug(
+            f"Athena queries polled: {stats['queries']}, polls: {stats['polls']}, "
+            f"API calls: {stats['calls']}"
+        )
+        if self._query_runtime_history_path:
+            query_runtime_history.save(self._query_runtime_history_path)
+        super().cleanup_connections()
+
+    @contextmanager
+    def connection_named(
+        self, name: str, query_header_context: Any = None, should_release_connection: bool = True
+    ) -> Iterator[None]:
+        # the result reuse policy of the node run by the connection, the statements of other connections keep their own
+        config = getattr(query_header_context, "config", None)
+        self.connections.result_reuse_max_ages[name] = config.get("result_reuse_max_age") if config else None
+        try:
+            with super().connection_named(name, query_header_context, should_release_connection):
+                yield
+        finally:
+            self.connections.result_reuse_max_ages.pop(name, None)
+
+    def execute(
+        self,
+        sql: str,
+        auto_begin: bool = False,
+        fetch: bool = False,
+        limit: Optional[int] = None,
+    ) -> Tuple[AdapterResponse, agate.Table]:
+        try:
+            return super().execute(sql, auto_begin=auto_begin, fetch=fetch, limit=limit)
+        finally:
+            # the statement might have modified tables even if it failed
+            self._glue_tables.invalidate_for_statement(sql)
+
+    def submit_python_job(self, parsed_model: Dict[str, Any], compiled_code: str) -> AdapterResponse:
+        try:
+            return super().submit_python_job(parsed_model, compiled_code)
+        finally:
+            # python models can modify any table, through spark
+            self._glue_tables.clear()
+
     @classmethod
     def date_function(cls) -> str:
         return "now()"
@@ -164,16 +314,9 @@ class AthenaAdapter(SQLAdapter):
     @available
     def add_lf_tags_to_database(self, relation: AthenaRelation) -> None:
         conn = self.connections.get_thread_connection()
-        creds = conn.credentials
-        client = conn.handle
         if lf_tags := conn.credentials.lf_tags_database:
             config = LfTagsConfig(enabled=True, tags=lf_tags)
-            with boto3_client_lock:
-                lf_client = client.session.client(
-                    "lakeformation",
-                    client.region_name,
-                    config=get_boto3_config(num_retries=creds.effective_num_retries),
-                )
+            lf_client = self._get_boto3_client("lakeformation")
             manager = LfTagsManager(lf_client, relation, config)
             manager.process_lf_tags_database()
         else:
@@ -183,15 +326,7 @@ class AthenaAdapter(SQLAdapter):
     def add_lf_tags(self, relation: AthenaRelation, lf_tags_config: Dict[str, Any]) -> None:
         config = LfTagsConfig(**lf_tags_config)
         if config.enabled:
-            conn = self.connections.get_thread_connection()
-            creds = conn.credentials
-            client = conn.handle
-            with boto3_client_lock:
-                lf_client = client.session.client(
-                    "lakeformation",
-                    client.region_name,
-                    config=get_boto3_config(num_retries=creds.effective_num_retries),
-                )
+            lf_client = self._get_boto3_client("lakeformation")
             manager = LfTagsManager(lf_client, relation, config)
             manager.process_lf_tags()
             return
@@ -201,15 +336,7 @@ class AthenaAdapter(SQLAdapter):
     def apply_lf_grants(self, relation: AthenaRelation, lf_grants_config: Dict[str, Any]) -> None:
         lf_config = LfGrantsConfig(**lf_grants_config)
         if lf_config.data_cell_filters.enabled:
-            conn = self.connections.get_thread_connection()
-            creds = conn.credentials
-            client = conn.handle
-            with boto3_client_lock:
-                lf = client.session.client(
-                    "lakeformation",
-                    region_name=client.region_name,
-                    config=get_boto3_config(num_retries=creds.effective_num_retries),
-                )
+            lf = self._get_boto3_client("lakeformation")
             catalog = self._get_data_catalog(relation.database)
             catalog_id = get_catalog_id(catalog)
             lf_permissions = LfPermissions(catalog_id, relation, lf)  # type: ignore
@@ -222,16 +349,8 @@ class AthenaAdapter(SQLAdapter):
         helper function to cache the result of the get_work_group to avoid APIs throttling
         """
         LOGGER.debug("get_work_group for %s", work_group)
-        conn = self.connections.get_thread_connection()
-        creds = conn.credentials
-        client = conn.handle
 
-        with boto3_client_lock:
-            athena_client = client.session.client(
-                "athena",
-                region_name=client.region_name,
-                config=get_boto3_config(num_retries=creds.effective_num_retries),
-            )
+        athena_client = self._get_boto3_client("athena")
 
         return athena_client.get_work_group(WorkGroup=work_group)
 
@@ -324,29 +443,33 @@ class AthenaAdapter(SQLAdapter):
     @available
     def get_glue_table(self, relation: AthenaRelation) -> Optional[GetTableResponseTypeDef]:
         """
-        Helper function to get a relation via Glue
+        Helper function to get a relation via Glue.
+        Responses are cached until the table is modified by the adapter or by a SQL statement.
         """
-        conn = self.connections.get_thread_connection()
-        creds = conn.credentials
-        client = conn.handle
-
         data_catalog = self._get_data_catalog(relation.database)
         catalog_id = get_catalog_id(data_catalog)
 
-        with boto3_client_lock:
-            glue_client = client.session.client(
-                "glue",
-                region_name=client.region_name,
-                config=get_boto3_config(num_retries=creds.effective_num_retries),
-            )
+        if table := self._glue_tables.get(catalog_id, relation.schema, relation.identifier):
+            return table
+        generation = self._glue_tables.generation
+
+        glue_client = self._get_boto3_client("glue")
+
+        get_table_kwargs = dict(
+            DatabaseName=relation.schema,
+            Name=relation.identifier,
+        )
+        if catalog_id:
+            get_table_kwargs["CatalogId"] = catalog_id
 
         try:
-            table = glue_client.get_table(CatalogId=catalog_id, DatabaseName=relation.schema, Name=relation.identifier)
+            table = glue_client.get_table(**get_table_kwargs)
         except ClientError as e:
             if e.response["Error"]["Code"] == "EntityNotFoundException":
                 LOGGER.debug(f"Table {relation.render()} does not exists - Ignoring")
                 return None
             raise e
+        self._glue_tables.put(catalog_id, table, generation)
         return table
 
     @available
@@ -386,44 +509,135 @@ class AthenaAdapter(SQLAdapter):
 
     @available
     def clean_up_partitions(self, relation: AthenaRelation, where_condition: str) -> None:
-        conn = self.connections.get_thread_connection()
-        creds = conn.credentials
-        client = conn.handle
+        """Deletes the partitions matching where_condition, along with their data."""
+        self._clean_up_partitions(relation, [where_condition])
 
+    @available
+    def clean_up_partitions_by_values(
+        self, relation: AthenaRelation, partitioned_by: List[str], partitions: agate.Table
+    ) -> None:
+        """
+        Deletes the given partitions, along with their data.
+        The partition values are compiled into as few Glue expressions as possible, e.g. ranges of consecutive dates,
+        so that all the partitions are deleted in a single pass.
+        Values are formatted after the Glue types of the partition keys of the relation, and not the types agate
+        inferred for them: e.g. the digits of a string key are not compiled into a range matching other partitions.
+        """
+        if not partitions.rows:
+            return
+        table = self.get_glue_table(relation)
+        if table is None:
+            LOGGER.debug(f"Table {relation} does not exist, no partitions to delete")
+            return
+        key_types = {key["Name"].lower(): key["Type"] for key in table["Table"].get("PartitionKeys", [])}
+        column_types = []
+        for key in partitioned_by:
+            if key.lower() not in key_types:
+                raise DbtRuntimeError(f"{key} is not a partition key of {relation}")
+            column_types.append(get_glue_column_type(key_types[key.lower()]))
+        expressions = get_partition_expressions(partitioned_by, column_types, partitions.rows)
+        LOGGER.debug(f"Compiled {len(partitions.rows)} partitions of {relation} into {len(expressions)} expressions")
+        self._clean_up_partitions(relation, expressions)
+
+    def _clean_up_partitions(self, relation: AthenaRelation, expressions: List[str]) -> None:
+        """
+        Deletes the partitions matching any of the expressions, along with their data.
+        The data of all the matching partitions is deleted concurrently, and the partitions are then deleted from Glue
+        in batches.
+        """
         data_catalog = self._get_data_catalog(relation.database)
         catalog_id = get_catalog_id(data_catalog)
 
-        with boto3_client_lock:
-            glue_client = client.session.client(
-                "glue",
-                region_name=client.region_name,
-                config=get_boto3_config(num_retries=creds.effective_num_retries),
-            )
-        paginator = glue_client.get_paginator("get_partitions")
-        partition_params = {
-            "CatalogId": catalog_id,
-            "DatabaseName": relation.schema,
-            "TableName": relation.identifier,
-            "Expression": where_condition,
-            "ExcludeColumnSchema": True,
-        }
-        partition_pg = paginator.paginate(**partition_params)
-        partitions = partition_pg.build_full_result().get("Partitions")
-        for partition in partitions:
-            self.delete_from_s3(partition["StorageDescriptor"]["Location"])
-            glue_client.delete_partition(
+        glue_client = self._get_boto3_client("glue")
+        s3_client = self._get_boto3_client("s3")
+        num_retries = self.connections.get_thread_connection().credentials.effective_num_retries
+
+        started_at = time.monotonic()
+        partition_values = []
+        prefixes_by_bucket: Dict[str, List[str]] = {}
+        for expression in expressions:
+            for partition in self._get_partitions(
+                glue_client, catalog_id, relation, expression=expression, exclude_column_schema=True
+            ):
+                partition_location = partition["StorageDescriptor"]["Location"]
+                bucket_name, prefix = self._parse_s3_path(partition_location)
+                LOGGER.debug(
+                    f"Deleting table data: path='{partition_location}', bucket='{bucket_name}', prefix='{prefix}'"
+                )
+                prefixes_by_bucket.setdefault(bucket_name, []).append(prefix)
+                partition_values.append(partition["Values"])
+
+        deleted_objects = deleted_bytes = 0
+        for bucket_name, prefixes in prefixes_by_bucket.items():
+            objects, size = self._delete_s3_prefixes(s3_client, bucket_name, prefixes, num_retries)
+            deleted_objects += objects
+            deleted_bytes += size
+
+        # partitions are deleted once they were all listed, deleting them while paginating could skip some of them
+        for values in get_chunks(partition_values, self.BATCH_DELETE_PARTITION_API_LIMIT):
+            response = glue_client.batch_delete_partition(
                 CatalogId=catalog_id,
                 DatabaseName=relation.schema,
                 TableName=relation.identifier,
-                PartitionValues=partition["Values"],
+                PartitionsToDelete=[{"Values": v} for v in values],
             )
+            if errors := response.get("Errors"):
+                raise DbtRuntimeError(
+                    f"Failed to delete partitions of {relation}: "
+                    + ", ".join(f"{e['PartitionValues']}: {e['ErrorDetail'].get('ErrorMessage')}" for e in errors)
+                )
+
+        LOGGER.debug(
+            f"Deleted {len(partition_values)} partitions of {relation} and their {deleted_objects} objects "
+            f"({deleted_bytes} bytes) in {time.monotonic() - started_at:.2f}s"
+        )
 
     @available
     def clean_up_table(self, relation: AthenaRelation) -> None:
         # this check avoids issues for when the table location is an empty string
         # or when the table does not exist and table location is None
         if table_location := self.get_glue_table_location(relation):
-            self.delete_from_s3(table_location)
+            self._delete_from_s3_deferrable(table_location)
+
+    def _delete_from_s3_deferrable(self, s3_path: str) -> None:
+        """
+        Deletes the files of a table which is not in use anymore. With defer_s3_deletes, the files of unique locations
+        are deleted in the background instead, and the deletion is awaited at the end of the invocation.
+        Locations which are not unique are deleted right away, as they could be reused by the next table.
+        """
+        if not self._defer_s3_deletes or not UNIQUE_LOCATION_SUFFIX.search(s3_path):
+            self.delete_from_s3(s3_path)
+            return
+
+        s3_client = self._get_boto3_client("s3")
+        num_retries = self.connections.get_thread_connection().credentials.effective_num_retries
+        with self._deferred_deletes_lock:
+            if s3_path in self._deferred_deletes:
+                return
+            if self._deferred_deletes_executor is None:
+                self._deferred_deletes_executor = ThreadPoolExecutor(
+                    max_workers=self._metadata_concurrency, thread_name_prefix="athena-s3-delete"
+                )
+            LOGGER.debug(f"Deferring the deletion of {s3_path}")
+            self._deferred_deletes[s3_path] = self._deferred_deletes_executor.submit(
+                self._delete_s3_path, s3_client, s3_path, num_retries
+            )
+
+    def _flush_deferred_deletes(self) -> None:
+        """Waits for the deferred deletes to complete, failures are logged as the models using them already ran."""
+        with self._deferred_deletes_lock:
+            deferred_deletes, self._deferred_deletes = self._deferred_deletes, {}
+            executor, self._deferred_deletes_executor = self._deferred_deletes_executor, None
+        if not deferred_deletes:
+            return
+        LOGGER.debug(f"Waiting for {len(deferred_deletes)} deferred S3 deletes")
+        for s3_path, future in deferred_deletes.items():
+            try:
+                future.result()
+            except Exception as e:
+                LOGGER.error(f"Failed to delete {s3_path} in the background, its files must be deleted manually: {e}")
+        if executor is not None:
+            executor.shutdown()
 
     @available
     def generate_unique_temporary_table_suffix(self, suffix_initial: str = "__dbt_tmp") -> str:
@@ -456,10 +670,6 @@ class AthenaAdapter(SQLAdapter):
         external_location: Optional[str] = None,
         seed_s3_upload_args: Optional[Dict[str, Any]] = None,
     ) -> str:
-        conn = self.connections.get_thread_connection()
-        creds = conn.credentials
-        client = conn.handle
-
         # TODO: consider using the workgroup default location when configured
         s3_location = self.generate_s3_location(
             relation, s3_data_dir, s3_data_naming, external_location=external_location
@@ -469,17 +679,12 @@ class AthenaAdapter(SQLAdapter):
         file_name = f"{relation.identifier}.csv"
         object_name = path.join(prefix, file_name)
 
-        with boto3_client_lock:
-            s3_client = client.session.client(
-                "s3",
-                region_name=client.region_name,
-                config=get_boto3_config(num_retries=creds.effective_num_retries),
-            )
-            # This ensures cross-platform support, tempfile.NamedTemporaryFile does not
-            tmpfile = os.path.join(tempfile.gettempdir(), os.urandom(24).hex())
-            table.to_csv(tmpfile, quoting=csv.QUOTE_NONNUMERIC)
-            s3_client.upload_file(tmpfile, bucket, object_name, ExtraArgs=seed_s3_upload_args)
-            os.remove(tmpfile)
+        s3_client = self._get_boto3_client("s3")
+        # This ensures cross-platform support, tempfile.NamedTemporaryFile does not
+        tmpfile = os.path.join(tempfile.gettempdir(), os.urandom(24).hex())
+        table.to_csv(tmpfile, quoting=csv.QUOTE_NONNUMERIC)
+        s3_client.upload_file(tmpfile, bucket, object_name, ExtraArgs=seed_s3_upload_args)
+        os.remove(tmpfile)
 
         return str(s3_location)
 
@@ -487,38 +692,113 @@ class AthenaAdapter(SQLAdapter):
     def delete_from_s3(self, s3_path: str) -> None:
         """
         Deletes files from s3 given a s3 path in the format: s3://my_bucket/prefix
-        Additionally, parses the response from the s3 delete request and raises
-        a DbtRuntimeError in case it included errors.
+        The sub-prefixes of the path (e.g. partitions) are listed concurrently, and the objects are deleted in batches
+        concurrently as well. Keys failing with a retryable error (e.g. SlowDown) are retried with backoff, and a
+        DbtRuntimeError is raised in case some of them could still not be deleted.
         """
-        conn = self.connections.get_thread_connection()
-        creds = conn.credentials
-        client = conn.handle
+        s3_client = self._get_boto3_client("s3")
+        num_retries = self.connections.get_thread_connection().credentials.effective_num_retries
+        self._delete_s3_path(s3_client, s3_path, num_retries)
+
+    def _delete_s3_path(self, s3_client: Any, s3_path: str, num_retries: int) -> None:
         bucket_name, prefix = self._parse_s3_path(s3_path)
-        if self._s3_path_exists(bucket_name, prefix):
-            s3_resource = client.session.resource(
-                "s3",
-                region_name=client.region_name,
-                config=get_boto3_config(num_retries=creds.effective_num_retries),
-            )
-            s3_bucket = s3_resource.Bucket(bucket_name)
-            LOGGER.debug(f"Deleting table data: path='{s3_path}', bucket='{bucket_name}', prefix='{prefix}'")
-            response = s3_bucket.objects.filter(Prefix=prefix).delete()
-            is_all_successful = True
-            for res in response:
-                if "Errors" in res:
-                    for err in res["Errors"]:
-                        is_all_successful = False
-                        LOGGER.error(
-                            "Failed to delete files: Key='{}', Code='{}', Message='{}', s3_bucket='{}'",
-                            err["Key"],
-                            err["Code"],
-                            err["Message"],
-                            bucket_name,
-                        )
-            if is_all_successful is False:
-                raise DbtRuntimeError("Failed to delete files from S3.")
-        else:
+        started_at = time.monotonic()
+
+        objects, sub_prefixes = self._list_s3_prefix(s3_client, bucket_name, prefix)
+        if not objects and not sub_prefixes:
             LOGGER.debug("S3 path does not exist")
+            return
+
+        LOGGER.debug(f"Deleting table data: path='{s3_path}', bucket='{bucket_name}', prefix='{prefix}'")
+        deleted, size = self._delete_s3_prefixes(s3_client, bucket_name, sub_prefixes, num_retries, objects)
+        elapsed = time.monotonic() - started_at
+        throughput = deleted / max(elapsed, 0.001)
+        LOGGER.debug(
+            f"Deleted {deleted} objects ({size} bytes) from {s3_path} in {elapsed:.2f}s ({throughput:.0f} objects/s)"
+        )
+
+    def _delete_s3_prefixes(
+        self,
+        s3_client: Any,
+        bucket: str,
+        prefixes: List[str],
+        num_retries: int,
+        objects: Optional[List[Tuple[str, int]]] = None,
+    ) -> Tuple[int, int]:
+        """
+        Deletes the objects under the given prefixes of a bucket, along with the given (key, size) objects.
+        Prefixes are listed concurrently, then objects are deleted in batches, concurrently as well.
+        Returns the number and the total size of the deleted objects, or raises a DbtRuntimeError in case some of them
+        could not be deleted.
+        """
+        objects = list(objects or [])
+        for prefix_objects in self._map_metadata(
+            lambda prefix: self._list_s3_objects(s3_client, bucket, prefix), prefixes
+        ):
+            objects.extend(prefix_objects)
+
+        errors = [
+            err
+            for batch_errors in self._map_metadata(
+                lambda batch: self._delete_s3_objects(s3_client, bucket, [key for key, _ in batch], num_retries),
+                get_chunks(objects, self.DELETE_OBJECTS_API_LIMIT),
+            )
+            for err in batch_errors
+        ]
+        for err in errors:
+            LOGGER.error(
+                "Failed to delete files: Key='{}', Code='{}', Message='{}', s3_bucket='{}'",
+                err["Key"],
+                err["Code"],
+                err["Message"],
+                bucket,
+            )
+        if errors:
+            raise DbtRuntimeError("Failed to delete files from S3.")
+        return len(objects), sum(size for _, size in objects)
+
+    @staticmethod
+    def _list_s3_prefix(s3_client: Any, bucket: str, prefix: str) -> Tuple[List[Tuple[str, int]], List[str]]:
+        """Lists the (key, size) of the objects directly under a s3 prefix, and its sub-prefixes."""
+        objects, sub_prefixes = [], []
+        for page in s3_client.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix, Delimiter="/"):
+            objects.extend((obj["Key"], obj["Size"]) for obj in page.get("Contents", []))
+            sub_prefixes.extend(p["Prefix"] for p in page.get("CommonPrefixes", []))
+        return objects, sub_prefixes
+
+    @staticmethod
+    def _list_s3_objects(s3_client: Any, bucket: str, prefix: str) -> List[Tuple[str, int]]:
+        """Lists the (key, size) of all the objects under a s3 prefix."""
+        return [
+            (obj["Key"], obj["Size"])
+            for page in s3_client.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix)
+            for obj in page.get("Contents", [])
+        ]
+
+    @staticmethod
+    def _delete_s3_objects(s3_client: Any, bucket: str, keys: List[str], num_retries: int) -> List[Dict[str, str]]:
+        """
+        Deletes a batch of at most 1000 keys, retrying the keys which failed with a retryable error.
+        Returns the errors of the keys which could not be deleted.
+        """
+        errors: List[Dict[str, str]] = []
+        for attempt in range(num_retries + 1):
+            response = s3_client.delete_objects(
+                Bucket=bucket, Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True}
+            )
+            retryable = []
+            for err in response.get("Errors", []):
+                (retryable if err["Code"] in S3_RETRYABLE_ERROR_CODES else errors).append(err)
+            if not retryable:
+                break
+            if attempt == num_retries:
+                errors.extend(retryable)
+                break
+            keys = [err["Key"] for err in retryable]
+            delay = random.uniform(0, min(20, 2**attempt))
+            LOGGER.debug(f"Retrying to delete {len(keys)} objects in {delay:.1f}s: {retryable[0]['Code']}")
+            time.sleep(delay)
+        return errors
 
     @staticmethod
     def _parse_s3_path(s3_path: str) -> Tuple[str, str]:
@@ -532,64 +812,57 @@ class AthenaAdapter(SQLAdapter):
         prefix = o.path.lstrip("/").rstrip("/") + "/"
         return bucket_name, prefix
 
-    def _s3_path_exists(self, s3_bucket: str, s3_prefix: str) -> bool:
-        """Checks whether a given s3 path exists."""
-        conn = self.connections.get_thread_connection()
-        creds = conn.credentials
-        client = conn.handle
-        with boto3_client_lock:
-            s3_client = client.session.client(
-                "s3",
-                region_name=client.region_name,
-                config=get_boto3_config(num_retries=creds.effective_num_retries),
-            )
-        response = s3_client.list_objects_v2(Bucket=s3_bucket, Prefix=s3_prefix)
-        return True if "Contents" in response else False
-
     @staticmethod
-    def _get_one_table_for_catalog(table: TableTypeDef, database: str) -> List[Dict[str, Any]]:
-        table_catalog = {
-            "table_database": database,
-            "table_schema": table["DatabaseName"],
-            "table_name": table["Name"],
-            "table_type": get_table_type(table).value,
-            "table_comment": table.get("Parameters", {}).get("comment", table.get("Description", "")),
-        }
-        return [
-            {
-                **table_catalog,
-                **{
-                    "column_name": col["Name"],
-                    "column_index": idx,
-                    "column_type": col["Type"],
-                    "column_comment": col.get("Comment", ""),
-                },
-            }
-            for idx, col in enumerate(table["StorageDescriptor"]["Columns"] + table.get("PartitionKeys", []))
-        ]
+    def _get_one_table_for_catalog(rows: CatalogRows, table: TableTypeDef, database: str) -> None:
+        rows.add_table(
+            database,
+            table["DatabaseName"],
+            table["Name"],
+            get_table_type(table).value,
+            table.get("Parameters", {}).get("comment", table.get("Description", "")),
+            table["StorageDescriptor"]["Columns"] + table.get("PartitionKeys", []),
+        )
 
     @staticmethod
-    def _get_one_table_for_non_glue_catalog(table: TableTypeDef, schema: str, database: str) -> List[Dict[str, Any]]:
-        table_catalog = {
-            "table_database": database,
-            "table_schema": schema,
-            "table_name": table["Name"],
-            "table_type": get_table_type(table).value,
-            "table_comment": table.get("Parameters", {}).get("comment", ""),
-        }
-        return [
-            {
-                **table_catalog,
-                **{
-                    "column_name": col["Name"],
-                    "column_index": idx,
-                    "column_type": col["Type"],
-                    "column_comment": col.get("Comment", ""),
-                },
-            }
+    def _get_one_table_for_non_glue_catalog(rows: CatalogRows, table: TableTypeDef, schema: str, database: str) -> None:
+        rows.add_table(
+            database,
+            schema,
+            table["Name"],
+            get_table_type(table).value,
+            table.get("Parameters", {}).get("comment"),
             # TODO: review this code part as TableTypeDef class does not contain "Columns" attribute
-            for idx, col in enumerate(table["Columns"] + table.get("PartitionKeys", []))
-        ]
+            table["Columns"] + table.get("PartitionKeys", []),
+        )
+
+    def _get_glue_schema_catalog(
+        self, glue_client: Any, catalog_id: Optional[str], database: str, schema: str
+    ) -> CatalogRows:
+        kwargs = {
+            "DatabaseName": schema,
+            "MaxResults": self.GET_TABLES_API_LIMIT,
+        }
+        # If the catalog is `awsdatacatalog` we don't need to pass CatalogId as boto3
+        # infers it from the account Id.
+        if catalog_id:
+            kwargs["CatalogId"] = catalog_id
+
+        rows = CatalogRows()
+        for page in glue_client.get_paginator("get_tables").paginate(**kwargs):
+            for table in page["TableList"]:
+                self._get_one_table_for_catalog(rows, table, database)
+        return rows
+
+    def _get_non_glue_schema_catalog(self, athena_client: Any, database: str, schema: str) -> CatalogRows:
+        rows = CatalogRows()
+        for page in athena_client.get_paginator("list_table_metadata").paginate(
+            CatalogName=database,
+            DatabaseName=schema,
+            MaxResults=50,  # Limit supported by this operation
+        ):
+            for table in page["TableMetadataList"]:
+                self._get_one_table_for_non_glue_catalog(rows, table, schema, database)
+        return rows
 
     def _get_one_catalog(
         self,
@@ -599,61 +872,37 @@ class AthenaAdapter(SQLAdapter):
     ) -> agate.Table:
         """
         This function is invoked by Adapter.get_catalog for each schema.
+        Schemas are fetched concurrently, using a client with adaptive retries to slow down when throttled.
         """
-        data_catalog = self._get_data_catalog(information_schema.database)
+        database = information_schema.database
+        data_catalog = self._get_data_catalog(database)
         data_catalog_type = get_catalog_type(data_catalog)
 
-        conn = self.connections.get_thread_connection()
-        creds = conn.credentials
-        client = conn.handle
-        if data_catalog_type == AthenaCatalogType.GLUE:
-            with boto3_client_lock:
-                glue_client = client.session.client(
-                    "glue",
-                    region_name=client.region_name,
-                    config=get_boto3_config(num_retries=creds.effective_num_retries),
-                )
+        # rows of the schemas which are not used would be filtered out by _catalog_filter_table
+        used = {(d.lower(), s.lower()) for d, s in used_schemas if d is not None and s is not None}
+        schemas = {schema for schema in schemas if (database.lower(), schema.lower()) in used}
 
-            catalog = []
-            paginator = glue_client.get_paginator("get_tables")
-            for schema in schemas:
-                kwargs = {
-                    "DatabaseName": schema,
-                    "MaxResults": 100,
-                }
-                # If the catalog is `awsdatacatalog` we don't need to pass CatalogId as boto3
-                # infers it from the account Id.
-                catalog_id = get_catalog_id(data_catalog)
-                if catalog_id:
-                    kwargs["CatalogId"] = catalog_id
-
-                for page in paginator.paginate(**kwargs):
-                    for table in page["TableList"]:
-                        catalog.extend(self._get_one_table_for_catalog(table, information_schema.database))
-            table = agate.Table.from_object(catalog)
+        started_at = time.monotonic()
+        if data_catalog_type == AthenaCatalogType.GLUE:
+            glue_client = self._get_boto3_client("glue", retry_mode="adaptive")
+            catalog_id = get_catalog_id(data_catalog)
+            schema_rows = self._map_metadata(
+                lambda schema: self._get_glue_schema_catalog(glue_client, catalog_id, database, schema), sorted(schemas)
+            )
         else:
-            with boto3_client_lock:
-                athena_client = client.session.client(
-                    "athena",
-                    region_name=client.region_name,
-                    config=get_boto3_config(num_retries=creds.effective_num_retries),
-                )
-
-            catalog = []
-            paginator = athena_client.get_paginator("list_table_metadata")
-            for schema in schemas:
-                for page in paginator.paginate(
-                    CatalogName=information_schema.database,
-                    DatabaseName=schema,
-                    MaxResults=50,  # Limit supported by this operation
-                ):
-                    for table in page["TableMetadataList"]:
-                        catalog.extend(
-                            self._get_one_table_for_non_glue_catalog(table, schema, information_schema.database)
-                        )
-            table = agate.Table.from_object(catalog)
+            athena_client = self._get_boto3_client("athena", retry_mode="adaptive")
+            schema_rows = self._map_metadata(
+                lambda schema: self._get_non_glue_schema_catalog(athena_client, database, schema), sorted(schemas)
+            )
+        rows = CatalogRows()
+        for r in schema_rows:
+            rows.extend(r)
+        LOGGER.debug(
+            f"Fetched catalog of {len(schemas)} schemas in {database}: "
+            f"{rows.num_tables} tables, {len(rows)} columns in {time.monotonic() - started_at:.2f}s"
+        )
 
-        return self._catalog_filter_table(table, used_schemas)
+        return self._catalog_filter_table(rows.to_table(), used_schemas)
 
     def _get_catalog_schemas(self, relation_configs: Iterable[RelationConfig]) -> AthenaSchemaSearchMap:
         """
@@ -667,28 +916,21 @@ class AthenaAdapter(SQLAdapter):
         return info_schema_name_map
 
     def _get_data_catalog(self, database: str) -> Optional[DataCatalogTypeDef]:
+        """
+        Get the data catalog descriptor, looked up once per invocation (or once per catalog_cache_ttl)
+        """
         if database:
-            conn = self.connections.get_thread_connection()
-            creds = conn.credentials
-            client = conn.handle
-            if database.lower() == "awsdatacatalog":
-                with boto3_client_lock:
-                    sts = client.session.client(
-                        "sts",
-                        region_name=client.region_name,
-                        config=get_boto3_config(num_retries=creds.effective_num_retries),
-                    )
-                catalog_id = sts.get_caller_identity()["Account"]
-                return {"Name": database, "Type": "GLUE", "Parameters": {"catalog-id": catalog_id}}
-            with boto3_client_lock:
-                athena = client.session.client(
-                    "athena",
-                    region_name=client.region_name,
-                    config=get_boto3_config(num_retries=creds.effective_num_retries),
-                )
-            return athena.get_data_catalog(Name=database)["DataCatalog"]
+            return self._data_catalogs.get_or_load(database, lambda: self._lookup_data_catalog(database))
         return None
 
+    def _lookup_data_catalog(self, database: str) -> DataCatalogTypeDef:
+        if database.lower() == "awsdatacatalog":
+            sts = self._get_boto3_client("sts")
+            catalog_id = sts.get_caller_identity()["Account"]
+            return {"Name": database, "Type": "GLUE", "Parameters": {"catalog-id": catalog_id}}
+        athena = self._get_boto3_client("athena")
+        return athena.get_data_catalog(Name=database)["DataCatalog"]
+
     @available
     def list_relations_without_caching(self, schema_relation: AthenaRelation) -> List[BaseRelation]:
         data_catalog = self._get_data_catalog(schema_relation.database)
@@ -696,24 +938,50 @@ class AthenaAdapter(SQLAdapter):
             # For non-Glue Data Catalogs, use the original Athena query against INFORMATION_SCHEMA approach
             return super().list_relations_without_caching(schema_relation)  # type: ignore
 
-        conn = self.connections.get_thread_connection()
-        creds = conn.credentials
-        client = conn.handle
-        with boto3_client_lock:
-            glue_client = client.session.client(
-                "glue",
-                region_name=client.region_name,
-                config=get_boto3_config(num_retries=creds.effective_num_retries),
-            )
+        # schemas are listed concurrently when dbt populates the relation cache, adaptive retries slow down the
+        # client when Glue throttles these calls
+        glue_client = self._get_boto3_client("glue", retry_mode="adaptive")
 
         kwargs = {
             "DatabaseName": schema_relation.schema,
+            "MaxResults": self.GET_TABLES_API_LIMIT,
         }
-        if catalog_id := get_catalog_id(data_catalog):
+        catalog_id = get_catalog_id(data_catalog)
+        if catalog_id:
             kwargs["CatalogId"] = catalog_id
+        generation = self._glue_tables.generation
         paginator = glue_client.get_paginator("get_tables")
+
+        started_at = time.monotonic()
+        relations: List[BaseRelation] = []
+        quote_policy = {"database": True, "schema": True, "identifier": True}
         try:
-            tables = paginator.paginate(**kwargs).build_full_result().get("TableList")
+            # pages are processed as they come, instead of building the full result first
+            for page in paginator.paginate(**kwargs):
+                tables = page["TableList"]
+                # get_tables returns the same table definitions as get_table, they are reused by get_glue_table
+                self._glue_tables.put_many(catalog_id, tables, generation)
+                for table in tables:
+                    if "TableType" not in table:
+                        LOGGER.info(f"Table '{table['Name']}' has no TableType attribute - Ignoring")
+                        continue
+                    _type = table["TableType"]
+                    _detailed_table_type = table.get("Parameters", {}).get("table_type", "")
+                    if _type == "VIRTUAL_VIEW":
+                        _type = self.Relation.View
+                    else:
+                        _type = self.Relation.Table
+
+                    relations.append(
+                        self.Relation.create(
+                            schema=schema_relation.schema,
+                            database=schema_relation.database,
+                            identifier=table["Name"],
+                            quote_policy=quote_policy,
+                            type=_type,
+                            detailed_table_type=_detailed_table_type,
+                        )
+                    )
         except ClientError as e:
             # don't error out when schema doesn't exist
             # this allows dbt to create and manage schemas/databases
@@ -722,32 +990,28 @@ class AthenaAdapter(SQLAdapter):
                 return []
             else:
                 raise e
-
-        relations: List[BaseRelation] = []
-        quote_policy = {"database": True, "schema": True, "identifier": True}
-        for table in tables:
-            if "TableType" not in table:
-                LOGGER.info(f"Table '{table['Name']}' has no TableType attribute - Ignoring")
-                continue
-            _type = table["TableType"]
-            _detailed_table_type = table.get("Parameters", {}).get("table_type", "")
-            if _type == "VIRTUAL_VIEW":
-                _type = self.Relation.View
-            else:
-                _type = self.Relation.Table
-
-            relations.append(
-                self.Relation.create(
-                    schema=schema_relation.schema,
-                    database=schema_relation.database,
-                    identifier=table["Name"],
-                    quote_policy=quote_policy,
-                    type=_type,
-                    detailed_table_type=_detailed_table_type,
-                )
-            )
+        LOGGER.debug(
+            f"Listed {len(relations)} relations in schema {schema_relation.schema} "
+            f"in {time.monotonic() - started_at:.2f}s"
+        )
         return relations
 
+    def _relations_cache_for_schemas(
+        self,
+        relation_configs: Iterable[RelationConfig],
+        cache_schemas: Optional[Set[BaseRelation]] = None,
+    ) -> None:
+        """
+        Populate the relations cache, listing the schemas concurrently on the dbt threads.
+        The table definitions listed along the way prewarm the Glue table cache used by get_glue_table.
+        """
+        started_at = time.monotonic()
+        super()._relations_cache_for_schemas(relation_configs, cache_schemas)
+        LOGGER.debug(
+            f"Populated the relation cache for {len(self.cache.schemas)} schemas "
+            f"in {time.monotonic() - started_at:.2f}s, Glue table cache: {self._glue_tables.stats()}"
+        )
+
     def _get_one_catalog_by_relations(
         self,
         information_schema: InformationSchema,
@@ -757,63 +1021,92 @@ class AthenaAdapter(SQLAdapter):
         """
         Overwrite of _get_one_catalog_by_relations for Athena, in order to use glue apis.
         This function is invoked by Adapter.get_catalog_by_relations.
+        Relations are grouped by schema and fetched with GetTables, concurrently across schemas.
         """
-        _table_definitions = []
-        for _rel in relations:
-            glue_table_definition = self.get_glue_table(_rel)
-            if glue_table_definition:
-                _table_definition = self._get_one_table_for_catalog(glue_table_definition["Table"], _rel.database)
-                _table_definitions.extend(_table_definition)
-        table = agate.Table.from_object(_table_definitions)
-        # picked from _catalog_filter_table, force database + schema to be strings
-        return table_from_rows(
-            table.rows,
-            table.column_names,
-            text_only_columns=["table_database", "table_schema", "table_name"],
+        database = information_schema.database
+        catalog_id = get_catalog_id(self._get_data_catalog(database))
+        glue_client = self._get_boto3_client("glue", retry_mode="adaptive")
+
+        names_by_schema: Dict[str, Set[str]] = {}
+        for relation in relations:
+            names_by_schema.setdefault(relation.schema.lower(), set()).add(relation.identifier.lower())
+
+        def get_schema_tables(schema: str) -> List[TableTypeDef]:
+            tables = []
+            missing = set()
+            for name in names_by_schema[schema]:
+                table = self._glue_tables.get(catalog_id, schema, name)
+                if table is None:
+                    missing.add(name)
+                else:
+                    tables.append(table["Table"])
+            if missing:
+                tables.extend(self._get_glue_tables_by_name(glue_client, catalog_id, database, schema, missing))
+            return tables
+
+        started_at = time.monotonic()
+        rows = CatalogRows()
+        for tables in self._map_metadata(get_schema_tables, sorted(names_by_schema)):
+            for table in tables:
+                self._get_one_table_for_catalog(rows, table, database)
+        LOGGER.debug(
+            f"Fetched catalog of {len(relations)} relations in {len(names_by_schema)} schemas of {database} "
+            f"in {time.monotonic() - started_at:.2f}s"
         )
+        return rows.to_table()
+
+    def _get_glue_tables_by_name(
+        self, glue_client: Any, catalog_id: Optional[str], database: str, schema: str, names: Set[str]
+    ) -> List[TableTypeDef]:
+        """
+        Fetch the given tables of a schema with as few GetTables calls as possible, either by listing the tables
+        matching name expressions, or by scanning the whole schema when it needs fewer pages.
+        The size of the schema is only known when its relations are in the relation cache.
+        """
+        expressions = list(get_table_name_expressions(names))
+        expression_calls = max(len(expressions), math.ceil(len(names) / self.GET_TABLES_API_LIMIT))
+        schema_size = len(self.cache.get_relations(database, schema))
+        scan_calls = math.ceil(max(schema_size, len(names)) / self.GET_TABLES_API_LIMIT)
+
+        kwargs: Dict[str, Any] = {"DatabaseName": schema, "MaxResults": self.GET_TABLES_API_LIMIT}
+        # If the catalog is `awsdatacatalog` we don't need to pass CatalogId as boto3
+        # infers it from the account Id.
+        if catalog_id:
+            kwargs["CatalogId"] = catalog_id
+        if schema_size and scan_calls <= expression_calls:
+            LOGGER.debug(f"Scanning schema {schema} to fetch {len(names)} of its {schema_size} tables")
+            requests = [kwargs]
+        else:
+            requests = [{**kwargs, "Expression": expression} for expression in expressions]
+
+        generation = self._glue_tables.generation
+        paginator = glue_client.get_paginator("get_tables")
+        fetched: Dict[str, TableTypeDef] = {}
+        for request in requests:
+            for page in paginator.paginate(**request):
+                for table in page["TableList"]:
+                    fetched[table["Name"].lower()] = table
+        self._glue_tables.put_many(catalog_id, fetched.values(), generation)
+        # expressions and scans can return more tables than requested
+        return [table for name, table in fetched.items() if name in names]
 
     @available
     def swap_table(self, src_relation: AthenaRelation, target_relation: AthenaRelation) -> None:
-        conn = self.connections.get_thread_connection()
-        creds = conn.credentials
-        client = conn.handle
-
         data_catalog = self._get_data_catalog(src_relation.database)
         src_catalog_id = get_catalog_id(data_catalog)
 
-        with boto3_client_lock:
-            glue_client = client.session.client(
-                "glue",
-                region_name=client.region_name,
-                config=get_boto3_config(num_retries=creds.effective_num_retries),
-            )
+        glue_client = self._get_boto3_client("glue")
 
         src_table = glue_client.get_table(
             CatalogId=src_catalog_id, DatabaseName=src_relation.schema, Name=src_relation.identifier
         ).get("Table")
 
-        src_table_get_partitions_paginator = glue_client.get_paginator("get_partitions")
-        src_table_partitions_result = src_table_get_partitions_paginator.paginate(
-            **{
-                "CatalogId": src_catalog_id,
-                "DatabaseName": src_relation.schema,
-                "TableName": src_relation.identifier,
-            }
-        )
-        src_table_partitions = src_table_partitions_result.build_full_result().get("Partitions")
+        src_table_partitions = self._get_partitions(glue_client, src_catalog_id, src_relation)
 
         data_catalog = self._get_data_catalog(src_relation.database)
         target_catalog_id = get_catalog_id(data_catalog)
 
-        target_get_partitions_paginator = glue_client.get_paginator("get_partitions")
-        target_table_partitions_result = target_get_partitions_paginator.paginate(
-            **{
-                "CatalogId": target_catalog_id,
-                "DatabaseName": target_relation.schema,
-                "TableName": target_relation.identifier,
-            }
-        )
-        target_table_partitions = target_table_partitions_result.build_full_result().get("Partitions")
+        target_table_partitions = self._get_partitions(glue_client, target_catalog_id, target_relation)
 
         target_table_version = {
             "Name": target_relation.identifier,
@@ -830,48 +1123,208 @@ class AthenaAdapter(SQLAdapter):
         )
         LOGGER.debug(f"Table {target_relation.render()} swapped with the content of {src_relation.render()}")
 
-        # we delete the target table partitions in any case
-        # if source table has partitions we need to delete and add partitions
-        # it source table hasn't any partitions we need to delete target table partitions
-        if target_table_partitions:
-            for partition_batch in get_chunks(target_table_partitions, AthenaAdapter.BATCH_DELETE_PARTITION_API_LIMIT):
-                glue_client.batch_delete_partition(
-                    CatalogId=target_catalog_id,
-                    DatabaseName=target_relation.schema,
-                    TableName=target_relation.identifier,
-                    PartitionsToDelete=[{"Values": partition["Values"]} for partition in partition_batch],
+        # the target partitions are made to match the source ones, whether the source table is partitioned or not
+        if self._swap_partitions_diff:
+            self._swap_partitions(
+                glue_client, target_catalog_id, target_relation, src_table_partitions, target_table_partitions
+            )
+        else:
+            self._replace_partitions(
+                glue_client, target_catalog_id, target_relation, src_table_partitions, target_table_partitions
+            )
+
+        self._glue_tables.invalidate(src_relation.schema, src_relation.identifier)
+        self._glue_tables.invalidate(target_relation.schema, target_relation.identifier)
+
+    def _get_partitions(
+        self,
+        glue_client: Any,
+        catalog_id: Optional[str],
+        relation: AthenaRelation,
+        expression: Optional[str] = None,
+        exclude_column_schema: bool = False,
+    ) -> List[PartitionTypeDef]:
+        """
+        Lists the partitions of a table, optionally only those matching an expression.
+
+        Glue has no way to count partitions, so a first page is read to estimate the size of the table: when it does
+        not hold all the partitions, the table is scanned in segments, which Glue lists in parallel, concurrently on
+        the metadata thread pool.
+        """
+        params: Dict[str, Any] = {
+            "CatalogId": catalog_id,
+            "DatabaseName": relation.schema,
+            "TableName": relation.identifier,
+            "ExcludeColumnSchema": exclude_column_schema,
+        }
+        if expression:
+            params["Expression"] = expression
+        started_at = time.monotonic()
+
+        first_page = glue_client.get_partitions(**params, MaxResults=self.GET_PARTITIONS_API_LIMIT)
+        if not first_page.get("NextToken"):
+            return first_page["Partitions"]
+
+        total_segments = min(self.GET_PARTITIONS_MAX_SEGMENTS, self._metadata_concurrency)
+        if total_segments <= 1:
+            partitions = first_page["Partitions"] + self._get_partitions_segment(
+                glue_client, params, starting_token=first_page["NextToken"]
+            )
+        else:
+            partitions = [
+                partition
+                for segment in self._map_metadata(
+                    lambda segment_number: self._get_partitions_segment(
+                        glue_client, params, segment={"SegmentNumber": segment_number, "TotalSegments": total_segments}
+                    ),
+                    range(total_segments),
                 )
+                for partition in segment
+            ]
+        LOGGER.debug(
+            f"Listed {len(partitions)} partitions of {relation} in {total_segments} segments "
+            f"in {time.monotonic() - started_at:.2f}s"
+        )
+        return partitions
+
+    def _get_partitions_segment(
+        self,
+        glue_client: Any,
+        params: Dict[str, Any],
+        segment: Optional[Dict[str, int]] = None,
+        starting_token: Optional[str] = None,
+    ) -> List[PartitionTypeDef]:
+        """Lists all the partitions of a segment of a table, or of the whole table when no segment is given."""
+        segment_params = {**params, "Segment": segment} if segment else params
+        pages = glue_client.get_paginator("get_partitions").paginate(
+            **segment_params,
+            PaginationConfig={"PageSize": self.GET_PARTITIONS_API_LIMIT, "StartingToken": starting_token},
+        )
+        return [partition for page in pages for partition in page["Partitions"]]
+
+    def _replace_partitions(
+        self,
+        glue_client: Any,
+        catalog_id: Optional[str],
+        target_relation: AthenaRelation,
+        src_partitions: List[PartitionTypeDef],
+        target_partitions: List[PartitionTypeDef],
+    ) -> None:
+        """
+        Deletes every partition of the target table, then re-creates every source partition.
+        Errors returned by the batch APIs for single partitions are ignored.
+        """
+        for partition_batch in get_chunks(target_partitions, self.BATCH_DELETE_PARTITION_API_LIMIT):
+            glue_client.batch_delete_partition(
+                CatalogId=catalog_id,
+                DatabaseName=target_relation.schema,
+                TableName=target_relation.identifier,
+                PartitionsToDelete=[{"Values": partition["Values"]} for partition in partition_batch],
+            )
+
+        for partition_batch in get_chunks(src_partitions, self.BATCH_CREATE_PARTITION_API_LIMIT):
+            glue_client.batch_create_partition(
+                CatalogId=catalog_id,
+                DatabaseName=target_relation.schema,
+                TableName=target_relation.identifier,
+                PartitionInputList=[
+                    {
+                        "Values": partition["Values"],
+                        "StorageDescriptor": partition["StorageDescriptor"],
+                        "Parameters": partition["Parameters"],
+                    }
+                    for partition in partition_batch
+                ],
+            )
+
+    def _swap_partitions(
+        self,
+        glue_client: Any,
+        catalog_id: Optional[str],
+        target_relation: AthenaRelation,
+        src_partitions: List[PartitionTypeDef],
+        target_partitions: List[PartitionTypeDef],
+    ) -> None:
+        """
+        Makes the partitions of the target table match the source partitions, only touching the partitions which differ:
+        target partitions missing from the source are deleted, source partitions missing from the target are created,
+        and partitions with a different storage descriptor or parameters are updated. Batches run concurrently.
+        Unlike _replace_partitions, errors returned by the batch APIs for single partitions are raised.
+        """
 
-        if src_table_partitions:
-            for partition_batch in get_chunks(src_table_partitions, AthenaAdapter.BATCH_CREATE_PARTITION_API_LIMIT):
-                glue_client.batch_create_partition(
-                    CatalogId=target_catalog_id,
-                    DatabaseName=target_relation.schema,
-                    TableName=target_relation.identifier,
-                    PartitionInputList=[
-                        {
-                            "Values": partition["Values"],
-                            "StorageDescriptor": partition["StorageDescriptor"],
-                            "Parameters": partition["Parameters"],
-                        }
-                        for partition in partition_batch
-                    ],
+        def partition_input(partition: PartitionTypeDef) -> PartitionInputTypeDef:
+            return {
+                "Values": partition["Values"],
+                "StorageDescriptor": partition["StorageDescriptor"],
+                "Parameters": partition["Parameters"],
+            }
+
+        src_by_values = {tuple(p["Values"]): p for p in src_partitions}
+        target_by_values = {tuple(p["Values"]): p for p in target_partitions}
+        to_delete = [p for values, p in target_by_values.items() if values not in src_by_values]
+        to_create = [p for values, p in src_by_values.items() if values not in target_by_values]
+        to_update = [
+            p
+            for values, p in src_by_values.items()
+            if values in target_by_values
+            and (
+                p["StorageDescriptor"] != target_by_values[values]["StorageDescriptor"]
+                or p.get("Parameters", {}) != target_by_values[values].get("Parameters", {})
+            )
+        ]
+
+        table_kwargs = {
+            "CatalogId": catalog_id,
+            "DatabaseName": target_relation.schema,
+            "TableName": target_relation.identifier,
+        }
+        calls: List[Callable[[], Any]] = []
+        for batch in get_chunks(to_delete, self.BATCH_DELETE_PARTITION_API_LIMIT):
+            calls.append(
+                partial(
+                    glue_client.batch_delete_partition,
+                    **table_kwargs,
+                    PartitionsToDelete=[{"Values": p["Values"]} for p in batch],
+                )
+            )
+        for batch in get_chunks(to_create, self.BATCH_CREATE_PARTITION_API_LIMIT):
+            calls.append(
+                partial(
+                    glue_client.batch_create_partition,
+                    **table_kwargs,
+                    PartitionInputList=[partition_input(p) for p in batch],
+                )
+            )
+        for batch in get_chunks(to_update, self.BATCH_UPDATE_PARTITION_API_LIMIT):
+            calls.append(
+                partial(
+                    glue_client.batch_update_partition,
+                    **table_kwargs,
+                    Entries=[{"PartitionValueList": p["Values"], "PartitionInput": partition_input(p)} for p in batch],
                 )
+            )
+
+        responses = self._map_metadata(lambda call: call(), calls)
+        if errors := [err for response in responses for err in response.get("Errors", [])]:
+            failures = ", ".join(
+                f"{e.get('PartitionValues') or e.get('PartitionValueList')}: {e['ErrorDetail']}" for e in errors
+            )
+            raise DbtRuntimeError(f"Failed to swap partitions of {target_relation}: {failures}")
+
+        full_swap_calls = math.ceil(len(target_partitions) / self.BATCH_DELETE_PARTITION_API_LIMIT) + math.ceil(
+            len(src_partitions) / self.BATCH_CREATE_PARTITION_API_LIMIT
+        )
+        LOGGER.debug(
+            f"Swapped partitions of {target_relation}: {len(to_delete)} deleted, {len(to_create)} created, "
+            f"{len(to_update)} updated, {len(src_partitions) - len(to_create) - len(to_update)} unchanged, "
+            f"in {len(calls)} API calls instead of {full_swap_calls}"
+        )
 
     def _get_glue_table_versions_to_expire(self, relation: AthenaRelation, to_keep: int) -> List[TableVersionTypeDef]:
         """
         Given a table and the amount of its version to keep, it returns the versions to delete
         """
-        conn = self.connections.get_thread_connection()
-        creds = conn.credentials
-        client = conn.handle
-
-        with boto3_client_lock:
-            glue_client = client.session.client(
-                "glue",
-                region_name=client.region_name,
-                config=get_boto3_config(num_retries=creds.effective_num_retries),
-            )
+        glue_client = self._get_boto3_client("glue")
 
         paginator = glue_client.get_paginator("get_table_versions")
         response_iterator = paginator.paginate(
@@ -887,19 +1340,10 @@ class AthenaAdapter(SQLAdapter):
 
     @available
     def expire_glue_table_versions(self, relation: AthenaRelation, to_keep: int, delete_s3: bool) -> List[str]:
-        conn = self.connections.get_thread_connection()
-        creds = conn.credentials
-        client = conn.handle
-
         data_catalog = self._get_data_catalog(relation.database)
         catalog_id = get_catalog_id(data_catalog)
 
-        with boto3_client_lock:
-            glue_client = client.session.client(
-                "glue",
-                region_name=client.region_name,
-                config=get_boto3_config(num_retries=creds.effective_num_retries),
-            )
+        glue_client = self._get_boto3_client("glue")
 
         versions_to_delete = self._get_glue_table_versions_to_expire(relation, to_keep)
         LOGGER.debug(f"Versions to delete: {[v['VersionId'] for v in versions_to_delete]}")
@@ -918,7 +1362,7 @@ class AthenaAdapter(SQLAdapter):
                 deleted_versions.append(version)
                 LOGGER.debug(f"Deleted version {version} of table {relation.render()} ")
                 if delete_s3:
-                    self.delete_from_s3(location)
+                    self._delete_from_s3_deferrable(location)
                     LOGGER.debug(f"{location} was deleted")
             except Exception as err:
                 LOGGER.debug(f"There was an error when expiring table version {version} with error: {err}")
@@ -946,19 +1390,10 @@ class AthenaAdapter(SQLAdapter):
             after CREATE OR REPLACE VIEW or ALTER TABLE statements.
             Every dbt run should create not more than one table version.
         """
-        conn = self.connections.get_thread_connection()
-        creds = conn.credentials
-        client = conn.handle
-
         data_catalog = self._get_data_catalog(relation.database)
         catalog_id = get_catalog_id(data_catalog)
 
-        with boto3_client_lock:
-            glue_client = client.session.client(
-                "glue",
-                region_name=client.region_name,
-                config=get_boto3_config(num_retries=creds.effective_num_retries),
-            )
+        glue_client = self._get_boto3_client("glue")
 
         # By default, there is no need to update Glue Table
         need_to_update_table = False
@@ -1058,6 +1493,7 @@ class AthenaAdapter(SQLAdapter):
                 TableInput=table_input,
                 SkipArchive=skip_archive_table_version,
             )
+            self._glue_tables.invalidate(relation.schema, relation.identifier)
 
     def generate_python_submission_response(self, submission_result: Any) -> AdapterResponse:
         if not submission_result:
@@ -1078,16 +1514,7 @@ class AthenaAdapter(SQLAdapter):
 
     @available
     def list_schemas(self, database: str) -> List[str]:
-        conn = self.connections.get_thread_connection()
-        creds = conn.credentials
-        client = conn.handle
-
-        with boto3_client_lock:
-            glue_client = client.session.client(
-                "glue",
-                region_name=client.region_name,
-                config=get_boto3_config(num_retries=creds.effective_num_retries),
-            )
+        glue_client = self._get_boto3_client("glue")
 
         paginator = glue_client.get_paginator("get_databases")
         result = []
@@ -1106,36 +1533,10 @@ class AthenaAdapter(SQLAdapter):
 
     @available
     def get_columns_in_relation(self, relation: AthenaRelation) -> List[AthenaColumn]:
-        conn = self.connections.get_thread_connection()
-        creds = conn.credentials
-        client = conn.handle
-
-        data_catalog = self._get_data_catalog(relation.database)
-        catalog_id = get_catalog_id(data_catalog)
-
-        with boto3_client_lock:
-            glue_client = client.session.client(
-                "glue",
-                region_name=client.region_name,
-                config=get_boto3_config(num_retries=creds.effective_num_retries),
-            )
-
-        get_table_kwargs = dict(
-            DatabaseName=relation.schema,
-            Name=relation.identifier,
-        )
-        if catalog_id:
-            get_table_kwargs["CatalogId"] = catalog_id
-
-        try:
-            table = glue_client.get_table(**get_table_kwargs)["Table"]
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "EntityNotFoundException":
-                LOGGER.debug("table not exist, catching the error")
-                return []
-            else:
-                LOGGER.error(e)
-                raise e
+        glue_table = self.get_glue_table(relation)
+        if not glue_table:
+            return []
+        table = glue_table["Table"]
 
         table_type = get_table_type(table)
 
@@ -1153,19 +1554,10 @@ class AthenaAdapter(SQLAdapter):
         schema_name = relation.schema
         table_name = relation.identifier
 
-        conn = self.connections.get_thread_connection()
-        creds = conn.credentials
-        client = conn.handle
-
         data_catalog = self._get_data_catalog(relation.database)
         catalog_id = get_catalog_id(data_catalog)
 
-        with boto3_client_lock:
-            glue_client = client.session.client(
-                "glue",
-                region_name=client.region_name,
-                config=get_boto3_config(num_retries=creds.effective_num_retries),
-            )
+        glue_client = self._get_boto3_client("glue")
 
         try:
             glue_client.delete_table(CatalogId=catalog_id, DatabaseName=schema_name, Name=table_name)
@@ -1176,6 +1568,8 @@ class AthenaAdapter(SQLAdapter):
             else:
                 LOGGER.error(e)
                 raise e
+        finally:
+            self._glue_tables.invalidate(schema_name, table_name)
 
     @available.parse_none
     def valid_snapshot_target(self, relation: BaseRelation) -> None:
@@ -1299,53 +1693,41 @@ class AthenaAdapter(SQLAdapter):
     @available
     def format_one_partition_key(self, partition_key: str) -> str:
         """Check if partition key uses Iceberg hidden partitioning or bucket partitioning"""
-        hidden = re.search(r"^(hour|day|month|year)\((.+)\)", partition_key.lower())
-        bucket = re.search(r"bucket\((.+),", partition_key.lower())
-        if hidden:
-            return f"date_trunc('{hidden.group(1)}', {hidden.group(2)})"
-        elif bucket:
-            return bucket.group(1)
-        else:
-            return partition_key.lower()
+        return format_partition_key(partition_key)
 
     @available
-    def murmur3_hash(self, value: Any, num_buckets: int) -> int:
-        """
-        Computes a hash for the given value using the MurmurHash3 algorithm and returns a bucket number.
-
-        This method was adopted from https://github.com/apache/iceberg-python/blob/main/pyiceberg/transforms.py#L240
-        """
-        if isinstance(value, int):  # int, long
-            hash_value = mmh3.hash(struct.pack("<q", value))
-        elif isinstance(value, (datetime, date)):  # date, time, timestamp, timestampz
-            timestamp = int(value.timestamp()) if isinstance(value, datetime) else int(value.strftime("%s"))
-            hash_value = mmh3.hash(struct.pack("<q", timestamp))
-        elif isinstance(value, (str, bytes)):  # string
-            hash_value = mmh3.hash(value)
-        else:
-            raise TypeError(f"Need to add support data type for hashing: {type(value)}")
-
-        return int((hash_value & self.INTEGER_MAX_VALUE_32_BIT_SIGNED) % num_buckets)
+    def murmur3_hash(self, value: Any, num_buckets: int) -> Optional[int]:
+        """Computes a hash for the given value using the MurmurHash3 algorithm and returns a bucket number."""
+        return get_bucket_number(value, num_buckets)
 
     @available
     def format_value_for_partition(self, value: Any, column_type: str) -> Tuple[str, str]:
         """Formats a value based on its column type for inclusion in a SQL query."""
-        comp_func = "="  # Default comparison function
-        if value is None:
-            return "null", " is "
-        elif column_type == "integer":
-            return str(value), comp_func
-        elif column_type == "string":
-            # Properly escape single quotes in the string value
-            escaped_value = str(value).replace("'", "''")
-            return f"'{escaped_value}'", comp_func
-        elif column_type == "date":
-            return f"DATE'{value}'", comp_func
-        elif column_type == "timestamp":
-            return f"TIMESTAMP'{value}'", comp_func
-        else:
-            # Raise an error for unsupported column types
-            raise ValueError(f"Unsupported column type: {column_type}")
+        return format_partition_condition_value(value, column_type)
+
+    @available
+    def get_partition_batches(
+        self,
+        table: agate.Table,
+        partitioned_by: List[str],
+        partitions_limit: int,
+        batch_max_rows: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Get the predicates of the batches of a model exceeding the partitions limit, from the distinct partition values
+        of its rows, see partitions.get_partition_batches.
+        With batch_max_rows, the last column of the table is the number of rows of each partition, and partitions are
+        bin-packed into batches of at most batch_max_rows rows.
+        """
+        started_at = time.monotonic()
+        column_types = [self.convert_type(table, idx) for idx in range(len(partitioned_by))]
+        sizes = [row[len(partitioned_by)] for row in table.rows] if batch_max_rows else None
+        batches = get_partition_batches(
+            partitioned_by, column_types, table.rows, partitions_limit, sizes=sizes, max_batch_size=batch_max_rows
+        )
+        elapsed = time.monotonic() - started_at
+        LOGGER.debug(f"Planned {len(batches)} batches of {len(table.rows)} partition rows in {elapsed:.2f}s")
+        return batches
 
     @available
     def run_optimize_with_partition_limit_catching(self, optimize_query: str) -> None:
@@ -1357,14 +1739,69 @@ class AthenaAdapter(SQLAdapter):
                 if "ICEBERG_OPTIMIZE_MORE_RUNS_NEEDED" not in str(e):
                     raise e
 
-    def _run_query(self, sql: str, catch_partitions_limit: bool) -> AthenaCursor:
+    def _run_query(self, sql: str, catch_partitions_limit: bool, conn: Optional[Connection] = None) -> AthenaCursor:
+        """
+        Run a statement with a cursor of the thread connection, or of conn, e.g. the connection of the thread which
+        submitted the statement to another thread.
+        """
         query = self.connections._add_query_comment(sql)
-        conn = self.connections.get_thread_connection()
+        conn = conn or self.connections.get_thread_connection()
         cursor: AthenaCursor = conn.handle.cursor()
         LOGGER.debug(f"Running Athena query:\n{query}")
+        scope = client_request_scope.set(conn.name)
         try:
             cursor.execute(query, catch_partitions_limit=catch_partitions_limit)
         except OperationalError as e:
             LOGGER.debug(f"CAUGHT EXCEPTION: {e}")
             raise e
+        finally:
+            client_request_scope.reset(scope)
+            self._glue_tables.invalidate_for_statement(sql)
         return cursor
+
+    @available
+    def run_batches(self, sqls: List[str], concurrency: int = 1) -> None:
+        """
+        Run the statements of the batches of a model, e.g. the inserts into disjoint partitions of a model exceeding
+        the partitions limit, up to concurrency at a time.
+
+        Each statement is retried like any other statement. Once a batch failed, the batches not started yet are
+        skipped, the running ones are awaited, and the first failure is raised.
+        Beyond the concurrent DML queries allowed by the account, Athena throttles the submissions, which are retried.
+        """
+        conn = self.connections.get_thread_connection()
+        num_batches = len(sqls)
+        failed = threading.Event()
+
+        def run_batch(batch: Tuple[int, str]) -> bool:
+            index, sql = batch
+            if failed.is_set():
+                return False
+            LOGGER.debug(f"BATCH PROCESSING: {index} OF {num_batches}")
+            try:
+                self._run_query(sql, catch_partitions_limit=False, conn=conn)
+            except Exception as e:
+                failed.set()
+                raise DbtRuntimeError(f"Batch {index} of {num_batches} failed: {e}") from e
+            return True
+
+        batches = list(enumerate(sqls, start=1))
+        if concurrency <= 1 or num_batches <= 1:
+            for batch in batches:
+                run_batch(batch)
+            return
+
+        started_at = time.monotonic()
+        with ThreadPoolExecutor(
+            max_workers=min(concurrency, num_batches), thread_name_prefix="athena-batch"
+        ) as executor:
+            futures = [executor.submit(run_batch, batch) for batch in batches]
+        errors = [future.exception() for future in futures if future.exception() is not None]
+        if errors:
+            skipped = sum(1 for future in futures if future.exception() is None and not future.result())
+            LOGGER.debug(f"{skipped} of {num_batches} batches skipped after a batch failed")
+            raise errors[0]
+        LOGGER.debug(
+            f"Ran {num_batches} batches, {min(concurrency, num_batches)} at a time, "
+            f"in {time.monotonic() - started_at:.2f}s"
+        )
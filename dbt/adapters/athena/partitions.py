@@ -0,0 +1,422 @@
+import heapq
+import re
+import struct
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+import mmh3
+from dbt_common.exceptions import DbtRuntimeError
+
+_pack_long = struct.Struct("<q").pack
+
+# maximum length of the expressions accepted by Glue GetPartitions
+GLUE_EXPRESSION_MAX_LEN = 2048
+# consecutive values are compiled into a range from this number of values, below an IN list is as short
+MIN_RANGE_LEN = 3
+# maximum length of the queries accepted by Athena
+ATHENA_QUERY_MAX_LEN = 262144
+
+# partition values are compiled into ranges only for these column types, whose values are ordered like numbers and
+# dates in Glue and SQL, e.g. not for the digits of string keys, nor for decimals with values between integers
+RANGE_COLUMN_TYPES = ("integer", "date")
+# the column types of partition values, by the Glue type of their key
+GLUE_COLUMN_TYPES = {
+    "tinyint": "integer",
+    "smallint": "integer",
+    "int": "integer",
+    "integer": "integer",
+    "bigint": "integer",
+    "date": "date",
+    "timestamp": "timestamp",
+    "string": "string",
+    "varchar": "string",
+    "char": "string",
+    "float": "number",
+    "double": "number",
+    "decimal": "number",
+    "boolean": "boolean",
+}
+
+INTEGER_MAX_VALUE_32_BIT_SIGNED = 0x7FFFFFFF
+EPOCH = datetime(1970, 1, 1)
+EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+EPOCH_ORDINAL = EPOCH.toordinal()
+ONE_MICROSECOND = timedelta(microseconds=1)
+BUCKET_PARTITION_TRANSFORM = re.compile(r"bucket\((.+?),\s*(\d+)\)")
+
+
+K = TypeVar("K", bound=Hashable)
+ValueFormatter = Callable[[Any, Optional[str]], str]
+
+
+def get_glue_column_type(glue_type: str) -> str:
+    """Gets the column type of the values of a partition key, given its Glue type, e.g. bigint or varchar(10)."""
+    column_type = GLUE_COLUMN_TYPES.get(glue_type.split("(")[0].strip().lower())
+    if column_type is None:
+        raise DbtRuntimeError(f"Need to add support for column type {glue_type}")
+    return column_type
+
+
+def format_partition_value(value: Any, column_type: Optional[str]) -> str:
+    """Formats a partition value as a literal of a partition predicate, given the dbt type of its column."""
+    if column_type in ("integer", "number") or column_type is None:
+        return str(value)
+    if column_type == "boolean":
+        return str(value).lower()
+    if column_type in ("string", "date", "timestamp"):
+        return f"'{value}'"
+    raise DbtRuntimeError(f"Need to add support for column type {column_type}")
+
+
+def _is_next(previous: Any, value: Any) -> bool:
+    """Whether value directly follows previous, for the types of values which can be compiled into ranges."""
+    if isinstance(value, datetime) or isinstance(previous, datetime):
+        return False
+    if isinstance(value, date) and isinstance(previous, date):
+        return value - previous == timedelta(days=1)
+    if isinstance(value, (int, Decimal)) and isinstance(previous, (int, Decimal)):
+        return value == previous + 1
+    return False
+
+
+def _get_runs(values: List[Any]) -> List[List[Any]]:
+    """Splits sorted values into runs of consecutive values."""
+    runs: List[List[Any]] = []
+    for value in values:
+        if runs and _is_next(runs[-1][-1], value):
+            runs[-1].append(value)
+        else:
+            runs.append([value])
+    return runs
+
+
+def _get_key_predicates(
+    key: str, values: List[Any], column_type: Optional[str], max_len: int, format_value: ValueFormatter
+) -> List[str]:
+    """
+    Compiles the sorted values of a key into predicates: ranges for runs of consecutive dates or integers of date
+    or integer keys, and IN lists for the remaining values, split so that no predicate is longer than max_len.
+    """
+    predicates = []
+    if values and values[-1] is None:
+        predicates.append(f"{key} is null")
+        values = values[:-1]
+    singles: List[str] = []
+    runs = _get_runs(values) if column_type in RANGE_COLUMN_TYPES else [[value] for value in values]
+    for run in runs:
+        if len(run) >= MIN_RANGE_LEN:
+            low, high = format_value(run[0], column_type), format_value(run[-1], column_type)
+            predicates.append(f"{key} between {low} and {high}")
+        else:
+            singles.extend(format_value(v, column_type) for v in run)
+
+    in_list: List[str] = []
+    for literal in singles:
+        if in_list and len(f"{key} in ({', '.join(in_list + [literal])})") > max_len:
+            predicates.append(f"{key} in ({', '.join(in_list)})")
+            in_list = []
+        in_list.append(literal)
+    if len(in_list) == 1:
+        predicates.append(f"{key}={in_list[0]}")
+    elif in_list:
+        predicates.append(f"{key} in ({', '.join(in_list)})")
+    return predicates
+
+
+def get_partition_predicates(
+    partition_keys: Sequence[str],
+    column_types: Sequence[Optional[str]],
+    partitions: Iterable[Sequence[Any]],
+    max_len: int = GLUE_EXPRESSION_MAX_LEN,
+    format_value: ValueFormatter = format_partition_value,
+) -> List[str]:
+    """
+    Compiles partition values into a minimal list of predicates, each matching a set of the given partitions and
+    being at most max_len characters long (unless a single partition would not fit).
+    Values are formatted as literals of Glue expressions, or with format_value, e.g. as literals of SQL predicates.
+
+    Partitions are grouped by the values of all their keys but the last one, and the values of the last key of
+    each group are compiled into ranges of consecutive dates or integers, and IN lists for the other values.
+    """
+    *prefix_keys, last_key = partition_keys
+    groups: Dict[Tuple[Any, ...], Set[Any]] = {}
+    for partition in partitions:
+        groups.setdefault(tuple(partition[:-1]), set()).add(partition[-1])
+
+    predicates: List[str] = []
+    for prefix in sorted(groups, key=lambda p: tuple(str(v) for v in p)):
+        conditions = [
+            f"{key} is null" if value is None else f"{key}={format_value(value, column_type)}"
+            for key, value, column_type in zip(prefix_keys, prefix, column_types)
+        ]
+        prefix_condition = " and ".join(conditions)
+        budget = max_len - len(prefix_condition) - len(" and ()")
+        values = sorted(groups[prefix], key=lambda v: (v is None, v if v is not None else 0))
+        for key_predicate in _get_key_predicates(last_key, values, column_types[-1], budget, format_value):
+            predicates.append(f"{prefix_condition} and {key_predicate}" if prefix_condition else key_predicate)
+    return predicates
+
+
+def get_partition_expressions(
+    partition_keys: Sequence[str],
+    column_types: Sequence[Optional[str]],
+    partitions: Iterable[Sequence[Any]],
+    max_len: int = GLUE_EXPRESSION_MAX_LEN,
+) -> List[str]:
+    """
+    Compiles partition values into a minimal list of Glue GetPartitions expressions, each at most max_len long,
+    by OR-ing together the predicates of get_partition_predicates.
+    """
+    expressions = []
+    expression = ""
+    for predicate in get_partition_predicates(partition_keys, column_types, partitions, max_len - len("()")):
+        term = f"({predicate})"
+        if expression and len(expression) + len(" or ") + len(term) > max_len:
+            expressions.append(expression)
+            expression = ""
+        expression = f"{expression} or {term}" if expression else term
+    if expression:
+        expressions.append(expression)
+    return expressions
+
+
+def format_partition_key(partition_key: str) -> str:
+    """Check if partition key uses Iceberg hidden partitioning or bucket partitioning"""
+    hidden = re.search(r"^(hour|day|month|year)\((.+)\)", partition_key.lower())
+    bucket = re.search(r"bucket\((.+),", partition_key.lower())
+    if hidden:
+        return f"date_trunc('{hidden.group(1)}', {hidden.group(2)})"
+    elif bucket:
+        return bucket.group(1)
+    else:
+        return partition_key.lower()
+
+
+def format_partition_condition_value(value: Any, column_type: Optional[str]) -> Tuple[str, str]:
+    """Formats a value of a partition, given its column type, as a SQL literal and the operator comparing it."""
+    if value is None:
+        return "null", " is "
+    elif column_type == "integer":
+        return str(value), "="
+    elif column_type == "string":
+        # Properly escape single quotes in the string value
+        escaped_value = str(value).replace("'", "''")
+        return f"'{escaped_value}'", "="
+    elif column_type == "date":
+        return f"DATE'{value}'", "="
+    elif column_type == "timestamp":
+        return f"TIMESTAMP'{value}'", "="
+    else:
+        # Raise an error for unsupported column types
+        raise ValueError(f"Unsupported column type: {column_type}")
+
+
+def _decimal_key(value: Decimal) -> bytes:
+    # integers of agate tables are decimals
+    if value != value.to_integral_value():
+        raise TypeError(f"Need to add support data type for hashing: {type(value)} with a scale")
+    return _pack_long(int(value))
+
+
+def _date_key(value: date) -> bytes:
+    return _pack_long(value.toordinal() - EPOCH_ORDINAL)
+
+
+def _timestamp_key(value: datetime) -> bytes:
+    epoch = EPOCH if value.tzinfo is None else EPOCH_UTC
+    return _pack_long((value - epoch) // ONE_MICROSECOND)
+
+
+def _str_key(value: str) -> bytes:
+    return value.encode("utf-8")
+
+
+def _bytes_key(value: bytes) -> bytes:
+    return value
+
+
+def _get_hash_key_func(value_type: type) -> Callable[[Any], bytes]:
+    """How to get the bytes Iceberg hashes from values of a type."""
+    if issubclass(value_type, int):  # int, long
+        return _pack_long
+    if issubclass(value_type, Decimal):
+        return _decimal_key
+    if issubclass(value_type, datetime):  # timestamp, timestamptz
+        return _timestamp_key
+    if issubclass(value_type, date):
+        return _date_key
+    if issubclass(value_type, str):
+        return _str_key
+    if issubclass(value_type, bytes):
+        return _bytes_key
+    raise TypeError(f"Need to add support data type for hashing: {value_type}")
+
+
+def iceberg_hash(value: Any) -> Optional[int]:
+    """
+    Computes the 32 bits MurmurHash3 of a value as specified by Iceberg, see
+    https://iceberg.apache.org/spec/#appendix-b-32-bit-hash-requirements: ints are hashed as longs, dates as days and
+    timestamps as microseconds from the epoch, and strings as their UTF-8 bytes. Nulls are not hashed.
+    """
+    if value is None:
+        return None
+    return mmh3.hash(_get_hash_key_func(type(value))(value))
+
+
+def get_bucket_numbers(values: Iterable[Any], num_buckets: int) -> List[Optional[int]]:
+    """
+    Computes the Iceberg buckets of a column of values, e.g. the distinct values of a bucketed key, None for nulls.
+
+    The conversion of the values to the bytes to hash is looked up once per type of value, and values are packed
+    with a precompiled struct, instead of dispatching on the type of every value.
+    """
+    key_funcs: Dict[type, Callable[[Any], bytes]] = {}
+    hash_ = mmh3.hash
+    buckets: List[Optional[int]] = []
+    for value in values:
+        if value is None:
+            buckets.append(None)
+            continue
+        value_type = type(value)
+        key_func = key_funcs.get(value_type)
+        if key_func is None:
+            key_func = key_funcs[value_type] = _get_hash_key_func(value_type)
+        buckets.append((hash_(key_func(value)) & INTEGER_MAX_VALUE_32_BIT_SIGNED) % num_buckets)
+    return buckets
+
+
+def get_bucket_number(value: Any, num_buckets: int) -> Optional[int]:
+    """Computes the Iceberg bucket of a value, None for a null."""
+    return get_bucket_numbers([value], num_buckets)[0]
+
+
+def pack_partitions(sizes: Dict[K, int], partitions_limit: int, max_batch_size: int) -> List[List[K]]:
+    """
+    Bin-packs partitions by size into batches of at most partitions_limit partitions and, unless a partition is larger
+    on its own, of at most max_batch_size.
+
+    As many batches as needed at least are balanced: partitions are placed from the largest, each into the least
+    loaded batch with room left, and a batch is only added when none has room. Partitions keep their order within
+    a batch, the batches receiving the largest partitions come first.
+    """
+    order = {partition: i for i, partition in enumerate(sizes)}
+    capped_size = sum(min(size, max_batch_size) for size in sizes.values())
+    num_batches = max(-(-len(sizes) // partitions_limit), -(-capped_size // max_batch_size))
+    batches: List[List[K]] = [[] for _ in range(num_batches)]
+    # (size, index, partitions) of the batches which may receive more partitions
+    open_batches: List[Tuple[int, int, List[K]]] = [(0, i, batch) for i, batch in enumerate(batches)]
+    for partition, size in sorted(sizes.items(), key=lambda item: (-item[1], order[item[0]])):
+        if open_batches and (open_batches[0][0] == 0 or open_batches[0][0] + size <= max_batch_size):
+            batch_size, index, batch = heapq.heappop(open_batches)
+        else:
+            batch_size, index, batch = 0, len(batches), []
+            batches.append(batch)
+        batch.append(partition)
+        if len(batch) < partitions_limit:
+            heapq.heappush(open_batches, (batch_size + size, index, batch))
+    return [sorted(batch, key=order.__getitem__) for batch in batches if batch]
+
+
+def _format_sql_value(value: Any, column_type: Optional[str]) -> str:
+    literal, _ = format_partition_condition_value(value, column_type)
+    return literal
+
+
+def get_partition_batches(
+    partitioned_by: Sequence[str],
+    column_types: Sequence[Optional[str]],
+    rows: Iterable[Sequence[Any]],
+    partitions_limit: int,
+    sizes: Optional[Sequence[int]] = None,
+    max_batch_size: Optional[int] = None,
+) -> List[str]:
+    """
+    Plans the batches of a model exceeding the partitions limit: the partitions of its rows, e.g. the distinct
+    partition values of a query, are batched by at most partitions_limit partitions, and the partitions of each batch
+    are compiled into a compact predicate matching exactly them, see get_partition_predicates.
+
+    Partitions are deduplicated with a dict, keeping the order of the rows. With a bucketed key, every partition is
+    combined with every bucket, each bucket matching the values of the rows which hash into it.
+
+    Given the size of the partition of each row, e.g. its number of rows, and a max_batch_size, partitions are
+    bin-packed by size instead, see pack_partitions. Partitions of bucketed models are batched by count only, the
+    size of their buckets being unknown.
+    """
+    rows = list(rows)
+    # the keys but the bucketed one, which is matched by bucket conditions
+    key_indexes = []
+    buckets: Dict[Optional[int], Dict[str, None]] = {}
+    bucket_column = None
+    for idx, (partition_key, column_type) in enumerate(zip(partitioned_by, column_types)):
+        bucket_match = BUCKET_PARTITION_TRANSFORM.search(partition_key)
+        if not bucket_match:
+            key_indexes.append(idx)
+            continue
+        bucket_column = bucket_match.group(1)
+        num_buckets = int(bucket_match.group(2))
+        values = list(dict.fromkeys(row[idx] for row in rows))
+        for value, bucket in zip(values, get_bucket_numbers(values, num_buckets)):
+            literal, _ = format_partition_condition_value(value, column_type)
+            buckets.setdefault(bucket, {})[literal] = None
+    keys = [format_partition_key(partitioned_by[idx]) for idx in key_indexes]
+    key_types = [column_types[idx] for idx in key_indexes]
+    partition_rows = [tuple(row[idx] for idx in key_indexes) for row in rows]
+
+    partition_batches: List[List[Tuple[Tuple[Any, ...], Optional[str]]]]
+    if sizes is not None and max_batch_size and bucket_column is None:
+        partition_sizes: Dict[Tuple[Any, ...], int] = {}
+        for partition, size in zip(partition_rows, sizes):
+            partition_sizes[partition] = partition_sizes.get(partition, 0) + int(size or 0)
+        packed = pack_partitions(partition_sizes, partitions_limit, max_batch_size)
+        partition_batches = [[(partition, None) for partition in batch] for batch in packed]
+    else:
+        partitions = list(dict.fromkeys(partition_rows))
+        bucket_conditions: List[Optional[str]] = [None]
+        if bucket_column is not None:
+            bucket_conditions = [
+                f"{bucket_column} is null" if bucket is None else f"{bucket_column} IN ({', '.join(literals)})"
+                for bucket, literals in buckets.items()
+            ]
+        combined = [(partition, condition) for partition in partitions for condition in bucket_conditions]
+        partition_batches = [combined[i : i + partitions_limit] for i in range(0, len(combined), partitions_limit)]
+    return [_get_batch_predicate(keys, key_types, batch) for batch in partition_batches]
+
+
+def _get_batch_predicate(
+    keys: Sequence[str],
+    column_types: Sequence[Optional[str]],
+    batch: List[Tuple[Tuple[Any, ...], Optional[str]]],
+) -> str:
+    """Compiles the partitions of a batch, along with their bucket condition if bucketed, into a single predicate."""
+    by_bucket: Dict[Optional[str], List[Tuple[Any, ...]]] = {}
+    for partition, bucket_condition in batch:
+        by_bucket.setdefault(bucket_condition, []).append(partition)
+    predicates = []
+    for bucket_condition, partitions in by_bucket.items():
+        partition_predicates = (
+            get_partition_predicates(keys, column_types, partitions, ATHENA_QUERY_MAX_LEN, _format_sql_value)
+            if keys
+            else []
+        )
+        if bucket_condition is None:
+            predicates.extend(partition_predicates)
+        elif partition_predicates:
+            predicates.extend(f"({predicate}) and {bucket_condition}" for predicate in partition_predicates)
+        else:
+            predicates.append(bucket_condition)
+    if len(predicates) == 1:
+        return predicates[0]
+    return " or ".join(f"({predicate})" for predicate in predicates)
@@ -0,0 +1,365 @@
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from hashlib import md5
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+from botocore.exceptions import ClientError
+from pyathena.error import OperationalError
+from pyathena.model import AthenaQueryExecution
+from pyathena.util import RetryConfig, retry_api_call
+
+from dbt.adapters.athena.cache import SQL_COMMENTS
+from dbt.adapters.athena.constants import LOGGER
+from dbt.adapters.athena.utils import get_chunks
+
+# every poll waits this many times longer than the previous one, up to the maximum poll interval
+POLL_BACKOFF_FACTOR = 1.5
+# with a runtime history, polls made after this many polls skip ahead to this fraction of the expected runtime
+POLL_HISTORY_WARMUP_POLLS = 5
+POLL_HISTORY_RUNTIME_FRACTION = 0.8
+# weight of the latest runtime in the expected runtime of a statement
+POLL_HISTORY_SMOOTHING = 0.5
+# statements kept in the runtime history, the least recently run ones are dropped first
+POLL_HISTORY_MAX_STATEMENTS = 10000
+# file of the target directory keeping the runtime history across invocations
+POLL_HISTORY_FILE = "athena_query_runtimes.json"
+# BatchGetQueryExecution calls made at the same time by the query poller
+POLL_MAX_CONCURRENT_CALLS = 8
+# error codes of a BatchGetQueryExecution call denied by the IAM policy of the credentials
+ACCESS_DENIED_ERROR_CODES = ("AccessDenied", "AccessDeniedException")
+
+# literals, numbers and unique suffixes differ between runs of the same statement, e.g. temporary table names
+STATEMENT_VARIABLE_PARTS = re.compile(
+    r"'(?:[^']|'')*'|[0-9a-f]{8}(?:[-_]?[0-9a-f]{4}){3}[-_]?[0-9a-f]{12}|\b\d+\b", re.IGNORECASE
+)
+
+
+def get_statement_fingerprint(sql: str, scope: Optional[str] = None) -> str:
+    """
+    Get an identifier of the shape of a statement, shared by its runs across invocations, batches and retries.
+    Comments are left out, as the dbt query comment may differ between invocations, and the scope, i.e. the node
+    run by the connection, is part of the identifier instead, so that the statements of different models do not
+    share it.
+    """
+    normalized = STATEMENT_VARIABLE_PARTS.sub("?", " ".join(SQL_COMMENTS.sub(" ", sql).lower().split()))
+    return md5(f"{scope}\n{normalized}".encode()).hexdigest()
+
+
+def get_poll_delay(
+    polls: int,
+    elapsed: float,
+    min_interval: float,
+    max_interval: float,
+    expected_runtime: Optional[float] = None,
+) -> float:
+    """
+    Get how long to wait before the next poll of a query, given the number of polls made and the time elapsed.
+
+    Polls start every min_interval and back off exponentially up to max_interval, so that short statements are
+    noticed as soon as they finish, while long ones make few API calls.
+    When the expected runtime of the statement is known, polls skip ahead to shortly before its expected end, once
+    the first polls had a chance to catch statements failing right away.
+    """
+    delay = min(max_interval, min_interval * POLL_BACKOFF_FACTOR**polls)
+    if expected_runtime is not None and polls >= POLL_HISTORY_WARMUP_POLLS:
+        delay = max(delay, expected_runtime * POLL_HISTORY_RUNTIME_FRACTION - elapsed)
+    return max(delay, min_interval)
+
+
+class QueryRuntimeHistory:
+    """
+    A thread-safe history of the runtime of statements, keyed by statement fingerprint.
+    The expected runtime of a statement is a moving average of its runtimes, weighting recent runs more.
+    The history is kept across invocations in a JSON file of the target directory.
+    """
+
+    def __init__(self) -> None:
+        self._runtimes: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def expected_runtime(self, fingerprint: str) -> Optional[float]:
+        with self._lock:
+            return self._runtimes.get(fingerprint)
+
+    def record(self, fingerprint: str, runtime: float) -> None:
+        with self._lock:
+            previous = self._runtimes.pop(fingerprint, None)
+            if previous is None:
+                self._runtimes[fingerprint] = runtime
+            else:
+                self._runtimes[fingerprint] = POLL_HISTORY_SMOOTHING * runtime + (1 - POLL_HISTORY_SMOOTHING) * previous
+            while len(self._runtimes) > POLL_HISTORY_MAX_STATEMENTS:
+                del self._runtimes[next(iter(self._runtimes))]
+
+    def load(self, path: str) -> None:
+        """Load the runtimes saved by previous invocations, the runtimes recorded by this one take precedence"""
+        try:
+            with open(path) as f:
+                runtimes = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            LOGGER.debug(f"Failed to load the query runtime history from {path}: {e}")
+            return
+        with self._lock:
+            loaded = {k: float(v) for k, v in runtimes.items() if k not in self._runtimes}
+            self._runtimes = {**loaded, **self._runtimes}
+
+    def save(self, path: str) -> None:
+        with self._lock:
+            runtimes = dict(self._runtimes)
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            # replaced at once, so that concurrent invocations do not read a partial file
+            with open(f"{path}.tmp", "w") as f:
+                json.dump(runtimes, f)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            LOGGER.debug(f"Failed to save the query runtime history to {path}: {e}")
+
+
+class PollStats:
+    """
+    Thread-safe counters of the queries polled, the times their state was checked, and the BatchGetQueryExecution
+    and GetQueryExecution calls made for them, a single batch call checking the state of many queries.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.polls = 0
+        self.calls = 0
+
+    def record(self, polls: int) -> None:
+        with self._lock:
+            self.queries += 1
+            self.polls += polls
+
+    def record_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"queries": self.queries, "polls": self.polls, "calls": self.calls}
+
+
+QUERY_STATES_DONE = (
+    AthenaQueryExecution.STATE_SUCCEEDED,
+    AthenaQueryExecution.STATE_FAILED,
+    AthenaQueryExecution.STATE_CANCELLED,
+)
+
+
+@dataclass
+class PolledQuery:
+    query_id: str
+    client_key: Hashable
+    retry_config: RetryConfig
+    min_interval: float
+    max_interval: float
+    expected_runtime: Optional[float]
+    debug_query_state: bool
+    future: "Future[Tuple[AthenaQueryExecution, int]]" = field(default_factory=Future)
+    started_at: float = field(default_factory=time.monotonic)
+    polls: int = 0
+    delay: float = 0.0
+    next_poll_at: float = field(default_factory=time.monotonic)
+    # whether calls checking the query are running
+    in_flight: bool = False
+
+
+class QueryPoller:
+    """
+    Polls the state of all the running queries of the process from a single thread.
+
+    Queries are grouped by client key, i.e. by region and credentials, and the queries of a group are polled with a
+    single client, the first one registered for the group: the clients of the connections of the dbt threads are
+    interchangeable, so that the queries of all the threads are checked by the same BatchGetQueryExecution calls.
+    The due queries are checked with a call per group and per 50 queries, the calls being made concurrently, so that
+    a throttled call only delays the queries it checks, and the threads waiting for them are woken up through
+    futures once they are done.
+    A query is polled up to half of its poll delay early when other queries are polled, so that the polls of
+    concurrent queries are coalesced into the same calls.
+    When a BatchGetQueryExecution call fails, the queries it checks are polled one by one with GetQueryExecution,
+    so that only the queries which can not be polled fail. Groups whose credentials are not allowed to call
+    BatchGetQueryExecution are always polled one by one.
+    """
+
+    BATCH_GET_QUERY_EXECUTION_API_LIMIT = 50
+
+    def __init__(self) -> None:
+        self._queries: Dict[str, PolledQuery] = {}
+        self._clients: Dict[Hashable, Any] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # client keys whose credentials are denied BatchGetQueryExecution
+        self._batch_denied: Set[Hashable] = set()
+
+    def poll(
+        self,
+        client: Any,
+        retry_config: RetryConfig,
+        query_id: str,
+        min_interval: float,
+        max_interval: float,
+        expected_runtime: Optional[float] = None,
+        debug_query_state: bool = False,
+        client_key: Optional[Hashable] = None,
+    ) -> "Future[Tuple[AthenaQueryExecution, int]]":
+        """
+        Starts polling a query, returns a future of its final query execution and of the number of polls made.
+        The first poll happens right away. The query is polled with the client of its client key, the region and
+        credentials of the client, or with its own client without a client key.
+        """
+        if client_key is None:
+            client_key = id(client)
+        query = PolledQuery(
+            query_id, client_key, retry_config, min_interval, max_interval, expected_runtime, debug_query_state
+        )
+        with self._condition:
+            self._clients.setdefault(client_key, client)
+            self._queries[query_id] = query
+            if self._thread is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=POLL_MAX_CONCURRENT_CALLS, thread_name_prefix="athena-query-poller-call"
+                )
+                self._thread = threading.Thread(target=self._run, name="athena-query-poller", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return query.future
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                waiting = [query for query in self._queries.values() if not query.in_flight]
+                if not waiting:
+                    self._condition.wait()
+                    continue
+                now = time.monotonic()
+                next_poll_at = min(query.next_poll_at for query in waiting)
+                if next_poll_at > now:
+                    self._condition.wait(next_poll_at - now)
+                    continue
+                due = [query for query in waiting if query.next_poll_at - now <= query.delay / 2]
+                for query in due:
+                    query.in_flight = True
+                batches = self._get_batches(due)
+            for client, batch in batches:
+                self._executor.submit(self._poll_batch, client, batch)  # type: ignore
+
+    def _get_batches(self, queries: List[PolledQuery]) -> List[Tuple[Any, List[PolledQuery]]]:
+        by_client_key: Dict[Hashable, List[PolledQuery]] = {}
+        for query in queries:
+            by_client_key.setdefault(query.client_key, []).append(query)
+        return [
+            (self._clients[client_key], batch)
+            for client_key, client_queries in by_client_key.items()
+            for batch in get_chunks(client_queries, self.BATCH_GET_QUERY_EXECUTION_API_LIMIT)
+        ]
+
+    def _poll_batch(self, client: Any, queries: List[PolledQuery]) -> None:
+        try:
+            self._check_batch(client, queries)
+        except Exception as e:
+            # the waiting threads must not wait forever for queries which can not be polled
+            LOGGER.debug(f"Failed to poll Athena queries: {e}")
+            for query in queries:
+                if not query.future.done():
+                    self._done(query, exception=e)
+        finally:
+            with self._condition:
+                for query in queries:
+                    query.in_flight = False
+                self._condition.notify()
+
+    def _check_batch(self, client: Any, queries: List[PolledQuery]) -> None:
+        executions: Dict[str, Any] = {}
+        errors: Dict[str, Exception] = {}
+        client_key = queries[0].client_key
+        unchecked = queries
+        if client_key not in self._batch_denied:
+            try:
+                response = retry_api_call(
+                    client.batch_get_query_execution,
+                    config=queries[0].retry_config,
+                    QueryExecutionIds=[query.query_id for query in queries],
+                )
+                unchecked = []
+                executions = {e["QueryExecutionId"]: e for e in response.get("QueryExecutions", [])}
+                for unprocessed in response.get("UnprocessedQueryExecutionIds", []):
+                    if unprocessed.get("ErrorCode"):
+                        errors[unprocessed["QueryExecutionId"]] = OperationalError(
+                            f"{unprocessed['ErrorCode']}: {unprocessed.get('ErrorMessage')}"
+                        )
+            except ClientError as e:
+                if e.response["Error"]["Code"] not in ACCESS_DENIED_ERROR_CODES:
+                    LOGGER.debug(f"Failed to poll Athena queries in batch, polling them one by one: {e}")
+                else:
+                    LOGGER.warning(
+                        "BatchGetQueryExecution is denied, Athena queries are polled one by one. "
+                        "Allow athena:BatchGetQueryExecution to poll them with fewer API calls."
+                    )
+                    with self._condition:
+                        self._batch_denied.add(client_key)
+            except Exception as e:
+                LOGGER.debug(f"Failed to poll Athena queries in batch, polling them one by one: {e}")
+            finally:
+                poll_stats.record_call()
+
+        for query in unchecked:
+            try:
+                response = retry_api_call(
+                    client.get_query_execution, config=query.retry_config, QueryExecutionId=query.query_id
+                )
+                executions[query.query_id] = response["QueryExecution"]
+            except Exception as e:
+                errors[query.query_id] = OperationalError(*e.args)
+            finally:
+                poll_stats.record_call()
+
+        now = time.monotonic()
+        for query in queries:
+            query.polls += 1
+            if query.query_id in executions:
+                query_execution = AthenaQueryExecution({"QueryExecution": executions[query.query_id]})
+                if query_execution.state in QUERY_STATES_DONE:
+                    self._done(query, result=(query_execution, query.polls))
+                    continue
+                state = query_execution.state
+            elif query.query_id in errors:
+                self._done(query, exception=errors[query.query_id])
+                continue
+            else:
+                state = "UNKNOWN"
+            query.delay = get_poll_delay(
+                query.polls - 1, now - query.started_at, query.min_interval, query.max_interval, query.expected_runtime
+            )
+            query.next_poll_at = now + query.delay
+            if query.debug_query_state:
+                LOGGER.debug(f"Query state is: {state}. Sleeping for {query.delay:.2f}...")
+
+    def _done(
+        self,
+        query: PolledQuery,
+        result: Optional[Tuple[AthenaQueryExecution, int]] = None,
+        exception: Optional[Exception] = None,
+    ) -> None:
+        with self._condition:
+            self._queries.pop(query.query_id, None)
+        if exception is not None:
+            query.future.set_exception(exception)
+        else:
+            query.future.set_result(result)  # type: ignore
+
+
+# shared by all the connections of the process
+query_runtime_history = QueryRuntimeHistory()
+poll_stats = PollStats()
+query_poller = QueryPoller()
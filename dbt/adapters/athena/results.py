@@ -0,0 +1,240 @@
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import agate
+from dbt_common.clients.agate_helper import Integer, ISODateTime, Number
+from dbt_common.exceptions import DbtRuntimeError
+
+from dbt.adapters.athena.cache import SQL_COMMENTS
+from dbt.adapters.athena.utils import get_chunks
+
+if TYPE_CHECKING:
+    import pyarrow
+
+QUERY_STATEMENTS = ("select", "with")
+ATHENA_INTEGER_TYPES = ("tinyint", "smallint", "integer", "int", "bigint")
+ATHENA_FLOAT_TYPES = ("float", "real", "double")
+TRAILING_SEMICOLONS = re.compile(r"[\s;]+$")
+SQL_LITERALS = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"")
+ORDER_BY = re.compile(r"\border\s+by\b", re.IGNORECASE)
+# the relations the materializations create and drop in every run, e.g. the staging tables of incremental models
+TEMPORARY_RELATIONS = re.compile(r"\w+__(?:dbt_tmp\w*|ha|bkp|tmp_not_partitioned)\b", re.IGNORECASE)
+IDENTIFIERS = re.compile(r"[\w-]+")
+DELETE_OBJECTS_API_LIMIT = 1000
+
+
+def import_pyarrow() -> Any:
+    """pyarrow is an optional dependency, only needed to read results from S3 instead of GetQueryResults."""
+    try:
+        import pyarrow
+        import pyarrow.csv  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise DbtRuntimeError(
+            "Reading Athena results from S3 requires pyarrow, install it with `pip install dbt-athena-community[arrow]`"
+        ) from e
+    return pyarrow
+
+
+def is_query(sql: str) -> bool:
+    """Whether a statement is a query, e.g. not a DDL or an INSERT, whose results can be unloaded or reused."""
+    return SQL_COMMENTS.sub(" ", sql).strip().lower().startswith(QUERY_STATEMENTS)
+
+
+def is_reusable_query(sql: str, modified_identifiers: Optional[Iterable[str]]) -> bool:
+    """
+    Whether Athena may reuse the results of a previous run of a statement, as it does not check whether the tables
+    read by the statement changed since. Only queries reading tables which are not modified by the invocation qualify,
+    i.e. not the temporary relations of the materializations, nor the tables modified so far, which are matched by
+    identifier. modified_identifiers is None when unknown tables were modified, and no query qualifies anymore.
+    """
+    if not is_query(sql) or modified_identifiers is None:
+        return False
+    statement = SQL_COMMENTS.sub(" ", sql)
+    if TEMPORARY_RELATIONS.search(statement):
+        return False
+    return not set(modified_identifiers).intersection(i.lower() for i in IDENTIFIERS.findall(statement))
+
+
+def is_sorted(sql: str) -> bool:
+    """
+    Whether the rows of a query are sorted, i.e. it has an ORDER BY clause outside of any parentheses, unlike e.g.
+    window functions or subqueries. The files written by UNLOAD are read back in the order of their keys, which
+    loses the order of the rows.
+    """
+    sql = SQL_LITERALS.sub("''", SQL_COMMENTS.sub(" ", sql))
+    depth, start = 0, 0
+    top_level_parts = []
+    for match in re.finditer(r"[()]", sql):
+        if depth == 0:
+            top_level_parts.append(sql[start : match.start()])
+        depth += 1 if match.group() == "(" else -1
+        start = match.end()
+    top_level_parts.append(sql[start:])
+    return any(ORDER_BY.search(part) for part in top_level_parts)
+
+
+def wrap_unload(sql: str, s3_path: str) -> str:
+    """
+    Wraps a query into an UNLOAD statement writing its results as Parquet files under s3_path.
+    The trailing semicolons of the query, e.g. of the queries of macros, would be a syntax error within UNLOAD.
+    """
+    query = TRAILING_SEMICOLONS.sub("", sql)
+    return f"UNLOAD (\n{query}\n) TO '{s3_path}' WITH (format = 'PARQUET', compression = 'SNAPPY')"
+
+
+def iter_parquet_batches(s3_client: Any, bucket: str, prefix: str, max_workers: int) -> Iterator["pyarrow.RecordBatch"]:
+    """
+    Yields the record batches of the Parquet files under a S3 prefix, e.g. the output of an UNLOAD statement.
+    Files are downloaded and decoded concurrently, and yielded in the order of their keys.
+    """
+    pa = import_pyarrow()
+
+    def read_file(key: str) -> "pyarrow.Table":
+        body = s3_client.get_object(Bucket=bucket, Key=key)["Body"].read()
+        return pa.parquet.read_table(pa.BufferReader(body))
+
+    keys = sorted(
+        obj["Key"]
+        for page in s3_client.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix)
+        for obj in page.get("Contents", [])
+    )
+    if not keys:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as executor:
+        for table in executor.map(read_file, keys):
+            yield from table.to_batches()
+
+
+def delete_s3_prefix(s3_client: Any, bucket: str, prefix: str) -> int:
+    """Deletes the objects under a S3 prefix, e.g. the output of an UNLOAD statement once read, returns their number."""
+    keys = [
+        obj["Key"]
+        for page in s3_client.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix)
+        for obj in page.get("Contents", [])
+    ]
+    for batch in get_chunks(keys, DELETE_OBJECTS_API_LIMIT):
+        response = s3_client.delete_objects(
+            Bucket=bucket, Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+        )
+        errors = response.get("Errors", [])
+        if errors:
+            raise DbtRuntimeError(
+                f"Failed to delete {len(errors)} objects under s3://{bucket}/{prefix}: {errors[0].get('Message')}"
+            )
+    return len(keys)
+
+
+def batches_to_agate(batches: Iterable["pyarrow.RecordBatch"], limit: Optional[int] = None) -> agate.Table:
+    """Builds an agate table from record batches, reading at most limit rows."""
+    pa = import_pyarrow()
+    collected = []
+    num_rows = 0
+    for batch in batches:
+        if limit and num_rows >= limit:
+            break
+        collected.append(batch)
+        num_rows += batch.num_rows
+    if not collected:
+        return agate.Table([], [])
+    return arrow_to_agate(pa.Table.from_batches(collected), limit)
+
+
+def _athena_to_arrow_type(pa: Any, description: Sequence[Any]) -> "pyarrow.DataType":
+    """The arrow type to parse a column of an Athena CSV result as, given its cursor description."""
+    type_code = description[1].lower()
+    if type_code in ATHENA_INTEGER_TYPES:
+        return pa.int64()
+    if type_code in ATHENA_FLOAT_TYPES:
+        return pa.float64()
+    if type_code == "decimal":
+        return pa.decimal128(description[4], description[5])
+    if type_code == "boolean":
+        return pa.bool_()
+    if type_code == "date":
+        return pa.date32()
+    if type_code == "timestamp":
+        return pa.timestamp("ms")
+    # strings, and the values which pyathena does not convert either (e.g. arrays, maps, rows, json)
+    return pa.string()
+
+
+def read_csv_result(body: bytes, description: Sequence[Sequence[Any]]) -> "pyarrow.Table":
+    """
+    Parses the CSV output of a query in bulk, with the column types of its cursor description.
+    Athena quotes every value but nulls, so that quoted empty strings are kept as empty strings.
+    """
+    pa = import_pyarrow()
+    column_names = [d[0] for d in description]
+    column_types = {d[0]: _athena_to_arrow_type(pa, d) for d in description}
+    return pa.csv.read_csv(
+        pa.BufferReader(body),
+        read_options=pa.csv.ReadOptions(column_names=column_names, skip_rows=1),
+        convert_options=pa.csv.ConvertOptions(
+            column_types=column_types,
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=False,
+        ),
+    )
+
+
+def _agate_column(pa: Any, column: Any) -> Tuple[agate.data_types.DataType, List[Any]]:
+    """
+    The agate type and the Python values of an arrow column, which are converted in bulk.
+    Types are the ones dbt infers for results fetched with a cursor, nested values are represented as json strings.
+    """
+    arrow_type = column.type
+    values = column.to_pylist()
+    convert: Optional[Callable[[Any], Any]] = None
+    if pa.types.is_integer(arrow_type):
+        data_type: agate.data_types.DataType = Integer()
+    elif pa.types.is_floating(arrow_type):
+        data_type = Number()
+        convert = data_type.cast
+    elif pa.types.is_decimal(arrow_type):
+        data_type = Number()
+    elif pa.types.is_boolean(arrow_type):
+        data_type = agate.Boolean()
+    elif pa.types.is_date(arrow_type):
+        data_type = agate.Date()
+    elif pa.types.is_timestamp(arrow_type):
+        data_type = ISODateTime()
+    elif pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        data_type = agate.Text()
+    elif pa.types.is_nested(arrow_type):
+        data_type = agate.Text()
+        convert = lambda v: json.dumps(v, default=str)  # noqa: E731
+    else:
+        data_type = agate.Text()
+        convert = str
+    if convert is not None:
+        values = [None if v is None else convert(v) for v in values]
+    return data_type, values
+
+
+def arrow_to_agate(table: "pyarrow.Table", limit: Optional[int] = None) -> agate.Table:
+    """
+    Builds an agate table from an arrow table, reading at most limit rows.
+
+    Column types are derived from the arrow schema instead of being inferred by agate for every value, and values
+    are converted to Python column by column, so that rows are only assembled at the end, without any cast.
+    """
+    pa = import_pyarrow()
+    if limit:
+        table = table.slice(0, limit)
+    column_names = agate.utils.deduplicate(table.schema.names, column_names=True)
+    column_types, columns = zip(*(_agate_column(pa, column) for column in table.columns)) if column_names else ((), ())
+    rows = [agate.Row(values, column_names) for values in zip(*columns)]
+    return agate.Table(rows, column_names, column_types, _is_fork=True)
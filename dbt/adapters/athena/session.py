@@ -3,8 +3,9 @@ import threading
 import time
 from functools import cached_property
 from hashlib import md5
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 from uuid import UUID
+from weakref import WeakKeyDictionary
 
 import boto3
 import boto3.session
@@ -44,6 +45,85 @@ def get_boto3_session_from_credentials(credentials: Any) -> boto3.session.Sessio
     )
 
 
+def get_credentials_key(credentials: Any) -> Tuple[Optional[str], ...]:
+    """Identifies the region, endpoint and AWS identity of credentials, whose clients are interchangeable."""
+    return (
+        credentials.region_name,
+        credentials.endpoint_url,
+        credentials.aws_profile_name,
+        credentials.aws_access_key_id,
+        credentials.aws_session_token,
+    )
+
+
+class Boto3ClientRegistry:
+    """
+    A registry of boto3 clients, shared by all the threads of a dbt invocation.
+
+    Clients are keyed by the boto3 session of the connection which created them, the service name, the region, the
+    retry and the connection pool configuration. boto3 clients are thread-safe once built, so only their construction
+    (which loads the botocore service models) is serialized, and every following call reuses the existing client.
+    Their connection pool is as large as the metadata thread pool which shares them, given by metadata_concurrency.
+    """
+
+    def __init__(self, metadata_concurrency: int = 0) -> None:
+        self.metadata_concurrency = metadata_concurrency
+        self._clients: "WeakKeyDictionary[Any, Dict[Tuple[str, str, int, str, int], Any]]" = WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._creation_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_client(self, connection: Connection, service_name: str, retry_mode: str = "standard") -> Any:
+        """
+        Get the client of the given service for the connection, creating it on first use.
+
+        Args:
+            connection (Connection): An open Athena connection, its handle holds the boto3 session.
+            service_name (str): The name of the AWS service, e.g. glue, s3, athena.
+            retry_mode (str): The botocore retry mode, `adaptive` additionally rate limits the client when throttled.
+
+        Returns:
+            Any: The boto3 client.
+        """
+        handle = connection.handle
+        num_retries = connection.credentials.effective_num_retries
+        # clients are shared by the metadata thread pool, their connection pool must be as large as the pool
+        max_pool_connections = max(10, self.metadata_concurrency)
+        key = (service_name, handle.region_name, num_retries, retry_mode, max_pool_connections)
+
+        with self._lock:
+            clients = self._clients.setdefault(handle.session, {})
+            if key in clients:
+                self.hits += 1
+                return clients[key]
+
+        # boto3 sessions are not thread-safe, client creation must not happen concurrently
+        with self._creation_lock:
+            client = handle.session.client(
+                service_name,
+                region_name=handle.region_name,
+                config=get_boto3_config(
+                    num_retries=num_retries, retry_mode=retry_mode, max_pool_connections=max_pool_connections
+                ),
+            )
+
+        with self._lock:
+            self.misses += 1
+            LOGGER.debug(f"Created boto3 {service_name} client for connection {connection.name}")
+            return clients.setdefault(key, client)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the hit and miss counters of the registry.
+
+        Returns:
+            Dict[str, int]: The number of reused clients (hits) and created clients (misses).
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
 class AthenaSparkSessionManager:
     """
     A helper class to manage Athena Spark Sessions.
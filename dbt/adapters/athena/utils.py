@@ -1,7 +1,7 @@
 import json
 import re
 from enum import Enum
-from typing import Any, Generator, List, Optional, TypeVar
+from typing import Any, Generator, Iterable, List, Optional, TypeVar
 
 from mypy_boto3_athena.type_defs import DataCatalogTypeDef
 
@@ -61,3 +61,18 @@ def get_chunks(lst: List[T], n: int) -> Generator[List[T], None, None]:
 def ellipsis_comment(s: str, max_len: int = 255) -> str:
     """Ellipsis string if it exceeds max length"""
     return f"{s[:(max_len - 3)]}..." if len(s) > max_len else s
+
+
+def get_table_name_expressions(names: Iterable[str], max_len: int = 2048) -> Generator[str, None, None]:
+    """
+    Yield Glue GetTables expressions matching the given table names, each one being at most max_len characters long.
+    The expressions may match other tables sharing a prefix with the given names, results have to be filtered.
+    """
+    expression = ""
+    for name in sorted({re.escape(name.lower()) for name in names}):
+        if expression and len(expression) + len(name) + 1 > max_len:
+            yield expression
+            expression = ""
+        expression = f"{expression}|{name}" if expression else name
+    if expression:
+        yield expression
@@ -1,4 +1,16 @@
 {% macro process_bucket_column(col, partition_key, table, ns, col_index) %}
+    {#
+        Deprecated: partition batches are planned by adapter.get_partition_batches, see get_partition_batches.
+        Kept for the projects calling it, it records the bucket of a value with the same helpers as the planner.
+    #}
+    {%- if ns.process_bucket_column_warned is not defined or not ns.process_bucket_column_warned -%}
+        {%- do exceptions.warn(
+            "process_bucket_column is deprecated and will be removed in a future release, "
+            ~ "use adapter.get_partition_batches to plan partition batches instead."
+        ) -%}
+        {%- set ns.process_bucket_column_warned = true -%}
+    {%- endif -%}
+
     {# Extract bucket information from the partition key #}
     {%- set bucket_match = modules.re.search('bucket\((.+?),\s*(\d+)\)', partition_key) -%}
 
@@ -25,8 +25,8 @@
 {% macro batch_incremental_insert(tmp_relation, target_relation, dest_cols_csv) %}
     {% set partitions_batches = get_partition_batches(tmp_relation) %}
     {% do log('BATCHES TO PROCESS: ' ~ partitions_batches | length) %}
+    {%- set insert_batches_partitions = [] -%}
     {%- for batch in partitions_batches -%}
-        {%- do log('BATCH PROCESSING: ' ~ loop.index ~ ' OF ' ~ partitions_batches|length) -%}
         {%- set insert_batch_partitions -%}
             insert into {{ target_relation }} ({{ dest_cols_csv }})
                 (
@@ -35,8 +35,9 @@
                    where {{ batch }}
                 );
         {%- endset -%}
-        {%- do run_query(insert_batch_partitions) -%}
+        {%- do insert_batches_partitions.append(insert_batch_partitions) -%}
     {%- endfor -%}
+    {%- do adapter.run_batches(insert_batches_partitions, config.get('batch_concurrency', 1) | int) -%}
 {% endmacro %}
 
 
@@ -84,31 +85,7 @@
     select distinct {{partitioned_keys}} from {{ tmp_relation }};
   {% endcall %}
   {%- set table = load_result('get_partitions').table -%}
-  {%- set rows = table.rows -%}
-  {%- set partitions = [] -%}
-  {%- for row in rows -%}
-    {%- set single_partition = [] -%}
-    {%- for col in row -%}
-      {%- set column_type = adapter.convert_type(table, loop.index0) -%}
-      {%- if column_type == 'integer' or column_type is none -%}
-        {%- set value = col|string -%}
-      {%- elif column_type == 'string' -%}
-        {%- set value = "'" + col + "'" -%}
-      {%- elif column_type == 'date' -%}
-        {%- set value = "'" + col|string + "'" -%}
-      {%- elif column_type == 'timestamp' -%}
-        {%- set value = "'" + col|string + "'" -%}
-      {%- else -%}
-        {%- do exceptions.raise_compiler_error('Need to add support for column type ' + column_type) -%}
-      {%- endif -%}
-      {%- do single_partition.append(partitioned_by[loop.index0] + '=' + value) -%}
-    {%- endfor -%}
-    {%- set single_partition_expression = single_partition | join(' and ') -%}
-    {%- do partitions.append('(' + single_partition_expression + ')') -%}
-  {%- endfor -%}
-  {%- for i in range(partitions | length) %}
-    {%- do adapter.clean_up_partitions(target_relation, partitions[i]) -%}
-  {%- endfor -%}
+  {%- do adapter.clean_up_partitions_by_values(target_relation, partitioned_by, table) -%}
 {%- endmacro %}
 
 {% macro remove_partitions_from_columns(columns_with_partitions, partition_keys) %}
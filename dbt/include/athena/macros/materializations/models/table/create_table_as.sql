@@ -175,10 +175,11 @@
     {%- set dest_columns = adapter.get_columns_in_relation(tmp_relation) -%}
     {%- set dest_cols_csv = dest_columns | map(attribute='quoted') | join(', ') -%}
 
+    {%- set insert_batches_partitions_sql = [] -%}
     {%- for batch in partitions_batches -%}
-        {%- do log('BATCH PROCESSING: ' ~ loop.index ~ ' OF ' ~ partitions_batches | length) -%}
-
         {%- if loop.index == 1 -%}
+            {# the first batch creates the table, the other batches are inserted into it concurrently #}
+            {%- do log('BATCH PROCESSING: ' ~ loop.index ~ ' OF ' ~ partitions_batches | length) -%}
             {%- set create_target_relation_sql -%}
                 select {{ dest_cols_csv }}
                 from {{ tmp_relation }}
@@ -193,11 +194,10 @@
                 where {{ batch }}
             {%- endset -%}
 
-            {%- do run_query(insert_batch_partitions_sql) -%}
+            {%- do insert_batches_partitions_sql.append(insert_batch_partitions_sql) -%}
         {%- endif -%}
-
-
     {%- endfor -%}
+    {%- do adapter.run_batches(insert_batches_partitions_sql, config.get('batch_concurrency', 1) | int) -%}
 
     {%- do drop_relation(tmp_relation) -%}
 
@@ -61,6 +61,10 @@ setup(
         "pydantic>=1.10,<3.0",
         "tenacity>=8.2,<10.0",
     ],
+    extras_require={
+        # reading query results in bulk, with the unload_results and arrow_results options
+        "arrow": ["pyarrow>=14.0,<22.0"],
+    },
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "License :: OSI Approved :: Apache Software License",
@@ -0,0 +1,77 @@
+"""
+Micro-benchmark of fetching query results into agate, on a synthetic distinct-partition query result.
+
+Compares the GetQueryResults path (values converted one by one by pyathena, then types inferred by agate for every
+value) with the CSV output of the query parsed by pyarrow and converted column by column, reporting the wall time
+of the conversion. Network time is excluded: the GetQueryResults path additionally pages through the results 1000
+rows per request, while the arrow path downloads a single object. Requires pyarrow.
+
+    PYTHONPATH=. python tests/benchmarks/arrow_results.py --rows 1000000
+"""
+import argparse
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, List, Sequence
+
+import agate
+from dbt_common.clients.agate_helper import table_from_data_flat
+from pyathena.converter import DefaultTypeConverter
+
+from dbt.adapters.athena import AthenaConnectionManager
+from dbt.adapters.athena.results import arrow_to_agate, read_csv_result
+
+# (name, type_code, display_size, internal_size, precision, scale, null_ok), as in a cursor description
+DESCRIPTION = [
+    ("dt", "date", None, None, 0, 0, "UNKNOWN"),
+    ("hour", "integer", None, None, 10, 0, "UNKNOWN"),
+    ("source", "varchar", None, None, 2147483647, 0, "UNKNOWN"),
+]
+GET_QUERY_RESULTS_PAGE_SIZE = 1000
+
+
+def synthetic_rows(num_rows: int) -> List[List[str]]:
+    start = date(2000, 1, 1)
+    return [
+        [(start + timedelta(days=i // 240)).isoformat(), str(i % 24), f"source_{i // 24 % 10}"] for i in range(num_rows)
+    ]
+
+
+def get_query_results(rows: List[List[str]]) -> agate.Table:
+    converter = DefaultTypeConverter()
+    column_names = [d[0] for d in DESCRIPTION]
+    types = [d[1] for d in DESCRIPTION]
+    converted = [tuple(converter.convert(t, v) for t, v in zip(types, row)) for row in rows]
+    return table_from_data_flat(AthenaConnectionManager.process_results(column_names, converted), column_names)
+
+
+def arrow(body: bytes) -> agate.Table:
+    return arrow_to_agate(read_csv_result(body, DESCRIPTION))
+
+
+def to_csv(rows: Sequence[Sequence[Any]]) -> bytes:
+    lines = [",".join(f'"{d[0]}"' for d in DESCRIPTION)]
+    lines.extend(",".join(f'"{v}"' for v in row) for row in rows)
+    return "\n".join(lines).encode()
+
+
+def measure(name: str, fetch: Callable[[], agate.Table]) -> None:
+    started_at = time.perf_counter()
+    table = fetch()
+    elapsed = time.perf_counter() - started_at
+    print(f"{name:<16} {len(table.rows):>10} rows {elapsed:>8.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.rows)
+    body = to_csv(rows)
+    print(f"GetQueryResults requests avoided: {-(-args.rows // GET_QUERY_RESULTS_PAGE_SIZE)}")
+    measure("GetQueryResults", lambda: get_query_results(rows))
+    measure("arrow", lambda: arrow(body))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Micro-benchmark of assigning the Iceberg buckets of the distinct values of a bucketed key, on synthetic values.
+
+Compares hashing the values one by one, dispatching on the type of every value (the former murmur3_hash), with
+get_bucket_numbers, which looks up the conversion of a column of values once per type and packs them with a
+precompiled struct. The former implementation hashed dates and timestamps as local seconds instead of days and
+microseconds, its buckets are only compared for ints and strings.
+
+    PYTHONPATH=. python tests/benchmarks/bucket_numbers.py --values 1000000
+"""
+import argparse
+import struct
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+import mmh3
+
+from dbt.adapters.athena.partitions import get_bucket_numbers
+
+NUM_BUCKETS = 16
+
+
+def per_value(values: List[Any], num_buckets: int) -> List[int]:
+    buckets = []
+    for value in values:
+        if isinstance(value, int):
+            hash_value = mmh3.hash(struct.pack("<q", value))
+        elif isinstance(value, (datetime, date)):
+            timestamp = int(value.timestamp()) if isinstance(value, datetime) else int(value.strftime("%s"))
+            hash_value = mmh3.hash(struct.pack("<q", timestamp))
+        elif isinstance(value, (str, bytes)):
+            hash_value = mmh3.hash(value)
+        else:
+            raise TypeError(f"Need to add support data type for hashing: {type(value)}")
+        buckets.append(int((hash_value & 0x7FFFFFFF) % num_buckets))
+    return buckets
+
+
+def synthetic_columns(num_values: int) -> Dict[str, List[Any]]:
+    start = datetime(2000, 1, 1)
+    return {
+        "int": list(range(num_values)),
+        "string": [f"user_{i}" for i in range(num_values)],
+        "date": [start.date() + timedelta(days=i % 36500) for i in range(num_values)],
+        "timestamp": [start + timedelta(seconds=i) for i in range(num_values)],
+    }
+
+
+def measure(name: str, column: str, plan: Callable[[], List[Any]]) -> List[Any]:
+    started_at = time.perf_counter()
+    buckets = plan()
+    elapsed = time.perf_counter() - started_at
+    print(f"{name:<10} {column:<10} {len(buckets):>10} values {elapsed:>8.2f}s")
+    return buckets
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--values", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    for column, values in synthetic_columns(args.values).items():
+        expected = measure("per value", column, lambda: per_value(values, NUM_BUCKETS))
+        buckets = measure("column", column, lambda: get_bucket_numbers(values, NUM_BUCKETS))
+        if column in ("int", "string"):
+            assert buckets == expected, "the implementations assign different buckets"
+
+
+if __name__ == "__main__":
+    main()
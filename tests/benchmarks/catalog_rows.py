@@ -0,0 +1,91 @@
+"""
+Micro-benchmark of the catalog table construction, on a synthetic catalog.
+
+Compares building the catalog from one dict per column (the former implementation) with CatalogRows, reporting
+the wall time and the peak memory allocated while building the agate table.
+
+    PYTHONPATH=. python tests/benchmarks/catalog_rows.py --tables 50000 --columns 40
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+import agate
+
+from dbt.adapters.athena.catalog import CatalogRows
+
+
+def synthetic_tables(num_tables: int, num_columns: int) -> List[Dict[str, Any]]:
+    columns = [{"Name": f"column_{i}", "Type": "string", "Comment": f"comment {i}"} for i in range(num_columns)]
+    return [
+        {
+            "DatabaseName": f"schema_{i % 100}",
+            "Name": f"table_{i}",
+            "Parameters": {"comment": f"table {i}"},
+            "StorageDescriptor": {"Columns": columns},
+        }
+        for i in range(num_tables)
+    ]
+
+
+def dict_rows(tables: List[Dict[str, Any]]) -> agate.Table:
+    catalog = []
+    for table in tables:
+        table_catalog = {
+            "table_database": "awsdatacatalog",
+            "table_schema": table["DatabaseName"],
+            "table_name": table["Name"],
+            "table_type": "table",
+            "table_comment": table["Parameters"]["comment"],
+        }
+        for idx, col in enumerate(table["StorageDescriptor"]["Columns"]):
+            catalog.append(
+                {
+                    **table_catalog,
+                    "column_name": col["Name"],
+                    "column_index": idx,
+                    "column_type": col["Type"],
+                    "column_comment": col["Comment"],
+                }
+            )
+    return agate.Table.from_object(catalog)
+
+
+def catalog_rows(tables: List[Dict[str, Any]]) -> agate.Table:
+    rows = CatalogRows()
+    for table in tables:
+        rows.add_table(
+            "awsdatacatalog",
+            table["DatabaseName"],
+            table["Name"],
+            "table",
+            table["Parameters"]["comment"],
+            table["StorageDescriptor"]["Columns"],
+        )
+    return rows.to_table()
+
+
+def measure(name: str, build: Callable[[List[Dict[str, Any]]], agate.Table], tables: List[Dict[str, Any]]) -> None:
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    table = build(tables)
+    elapsed = time.perf_counter() - started_at
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<12} {len(table.rows):>10} rows {elapsed:>8.2f}s {peak / 2**20:>10.1f} MiB peak")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, default=50_000)
+    parser.add_argument("--columns", type=int, default=40)
+    args = parser.parse_args()
+
+    tables = synthetic_tables(args.tables, args.columns)
+    measure("dicts", dict_rows, tables)
+    measure("CatalogRows", catalog_rows, tables)
+
+
+if __name__ == "__main__":
+    main()
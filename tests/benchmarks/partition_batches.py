@@ -0,0 +1,164 @@
+"""
+Micro-benchmark of planning the batches of a model exceeding the partitions limit, on synthetic distinct partitions.
+
+Compares the Python planner of the adapter with the Jinja planner it replaced, which formatted every cell through
+adapter calls (converting the type of its column each time) and deduplicated partitions with a list lookup, and
+reports the length of the predicates, OR-ed equalities for the Jinja planner and ranges or IN lists for the Python one.
+The Jinja planner is quadratic in the number of partitions, it only runs on the first --jinja-rows rows.
+
+    PYTHONPATH=. python tests/benchmarks/partition_batches.py --rows 100000
+"""
+import argparse
+import re
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Callable, List
+
+import agate
+from jinja2 import Environment
+
+from dbt.adapters.athena import AthenaAdapter
+from dbt.adapters.athena.partitions import (
+    format_partition_condition_value,
+    format_partition_key,
+    get_bucket_number,
+    get_partition_batches,
+)
+
+PARTITIONED_BY = ["dt", "hour", "source"]
+PARTITIONS_LIMIT = 100
+
+# the previous get_partition_batches and process_bucket_column macros, once the distinct partitions are fetched
+JINJA_PLANNER = r"""
+{% macro process_bucket_column(col, partition_key, table, ns, col_index) %}
+    {%- set bucket_match = modules.re.search('bucket\((.+?),\s*(\d+)\)', partition_key) -%}
+    {%- if bucket_match -%}
+        {%- set column_type = adapter.convert_type(table, col_index) -%}
+        {%- set ns.is_bucketed = true -%}
+        {%- set ns.bucket_column = bucket_match[1] -%}
+        {%- set bucket_num = adapter.murmur3_hash(col, bucket_match[2] | int) -%}
+        {%- set formatted_value, comp_func = adapter.format_value_for_partition(col, column_type) -%}
+        {%- if bucket_num not in ns.bucket_numbers %}
+            {%- do ns.bucket_numbers.append(bucket_num) %}
+            {%- do ns.bucket_conditions.update({bucket_num: [formatted_value]}) -%}
+        {%- elif formatted_value not in ns.bucket_conditions[bucket_num] %}
+            {%- do ns.bucket_conditions[bucket_num].append(formatted_value) -%}
+        {%- endif -%}
+    {%- endif -%}
+{% endmacro %}
+
+{%- set rows = table.rows -%}
+{%- set ns = namespace(partitions = [], bucket_conditions = {}, bucket_numbers = [], bucket_column = None,
+                       is_bucketed = false) -%}
+{%- for row in rows -%}
+    {%- set single_partition = [] -%}
+    {%- set counter = namespace(value=0) -%}
+    {%- for col, partition_key in zip(row, partitioned_by) -%}
+        {%- do process_bucket_column(col, partition_key, table, ns, counter.value) -%}
+        {%- set bucket_match = modules.re.search('bucket\((.+?),\s*(\d+)\)', partition_key) -%}
+        {%- if not bucket_match -%}
+            {%- set column_type = adapter.convert_type(table, counter.value) -%}
+            {%- set value, comp_func = adapter.format_value_for_partition(col, column_type) -%}
+            {%- set partition_key_formatted = adapter.format_one_partition_key(partitioned_by[counter.value]) -%}
+            {%- do single_partition.append(partition_key_formatted + comp_func + value) -%}
+        {%- endif -%}
+        {%- set counter.value = counter.value + 1 -%}
+    {%- endfor -%}
+    {%- set single_partition_expression = single_partition | join(' and ') -%}
+    {%- if single_partition_expression not in ns.partitions %}
+        {%- do ns.partitions.append(single_partition_expression) -%}
+    {%- endif -%}
+{%- endfor -%}
+{%- if ns.is_bucketed -%}
+    {%- set total_batches = ns.partitions | length * ns.bucket_numbers | length -%}
+{%- else -%}
+    {%- set total_batches = ns.partitions | length -%}
+{%- endif -%}
+{%- set batches_per_partition_limit = (total_batches // athena_partitions_limit)
+                                      + (total_batches % athena_partitions_limit > 0) -%}
+{%- for i in range(batches_per_partition_limit) -%}
+    {%- set batch_conditions = [] -%}
+    {%- if ns.is_bucketed -%}
+        {%- for partition_expression in ns.partitions -%}
+            {%- for bucket_num in ns.bucket_numbers -%}
+                {%- set bucket_condition = ns.bucket_column + " IN ("
+                                           + ns.bucket_conditions[bucket_num] | join(", ") + ")" -%}
+                {%- do batch_conditions.append("(" + partition_expression + ' and ' + bucket_condition + ")") -%}
+            {%- endfor -%}
+        {%- endfor -%}
+    {%- else -%}
+        {%- do batch_conditions.extend(ns.partitions) -%}
+    {%- endif -%}
+    {%- set start_index = i * athena_partitions_limit -%}
+    {%- set end_index = start_index + athena_partitions_limit -%}
+    {%- do partitions_batches.append(batch_conditions[start_index:end_index] | join(' or ')) -%}
+{%- endfor -%}
+"""
+
+
+class JinjaAdapter:
+    """The adapter methods called by the Jinja planner."""
+
+    convert_type = AthenaAdapter.convert_type
+
+    def format_value_for_partition(self, value: Any, column_type: str) -> Any:
+        return format_partition_condition_value(value, column_type)
+
+    def format_one_partition_key(self, partition_key: str) -> str:
+        return format_partition_key(partition_key)
+
+    def murmur3_hash(self, value: Any, num_buckets: int) -> int:
+        return get_bucket_number(value, num_buckets)
+
+
+def synthetic_table(num_rows: int) -> agate.Table:
+    start = date(2000, 1, 1)
+    rows = [(start + timedelta(days=i // 240), Decimal(i % 24), f"source_{i // 24 % 10}") for i in range(num_rows)]
+    return agate.Table(rows, PARTITIONED_BY, [agate.Date(), agate.Number(), agate.Text()])
+
+
+def jinja(table: agate.Table) -> List[str]:
+    env = Environment(extensions=["jinja2.ext.do"])
+    partitions_batches: List[str] = []
+    env.from_string(JINJA_PLANNER).render(
+        table=table,
+        partitioned_by=PARTITIONED_BY,
+        athena_partitions_limit=PARTITIONS_LIMIT,
+        partitions_batches=partitions_batches,
+        adapter=JinjaAdapter(),
+        modules={"re": re},
+        zip=zip,
+    )
+    return partitions_batches
+
+
+def python(table: agate.Table) -> List[str]:
+    column_types = [AthenaAdapter.convert_type(table, idx) for idx in range(len(table.column_names))]
+    return get_partition_batches(PARTITIONED_BY, column_types, table.rows, PARTITIONS_LIMIT)
+
+
+def measure(name: str, num_rows: int, plan: Callable[[], List[str]]) -> List[str]:
+    started_at = time.perf_counter()
+    batches = plan()
+    elapsed = time.perf_counter() - started_at
+    length = sum(len(batch) for batch in batches)
+    print(f"{name:<8} {num_rows:>10} rows {len(batches):>8} batches {length:>12} predicate chars {elapsed:>8.2f}s")
+    return batches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--jinja-rows", type=int, default=5_000)
+    args = parser.parse_args()
+
+    table = synthetic_table(args.rows)
+    measure("python", args.rows, lambda: python(table))
+    jinja_table = synthetic_table(min(args.rows, args.jinja_rows))
+    expected = measure("jinja", len(jinja_table.rows), lambda: jinja(jinja_table))
+    assert len(python(jinja_table)) == len(expected), "the planners batch differently"
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
 import datetime
 import decimal
+import json
+import os
+import threading
+import time
 from multiprocessing import get_context
 from unittest import mock
 from unittest.mock import patch
+from uuid import uuid4
 
 import agate
 import boto3
@@ -12,12 +17,14 @@ from dbt_common.clients import agate_helper
 from dbt_common.exceptions import ConnectionError, DbtRuntimeError
 from moto import mock_aws
 from moto.core import DEFAULT_ACCOUNT_ID
+from pyathena.error import OperationalError
 
 from dbt.adapters.athena import AthenaAdapter
 from dbt.adapters.athena import Plugin as AthenaPlugin
 from dbt.adapters.athena.column import AthenaColumn
 from dbt.adapters.athena.connections import AthenaCursor, AthenaParameterFormatter
 from dbt.adapters.athena.exceptions import S3LocationException
+from dbt.adapters.athena.polling import QueryRuntimeHistory
 from dbt.adapters.athena.relation import AthenaRelation, TableType
 from dbt.adapters.athena.utils import AthenaCatalogType
 from dbt.adapters.contracts.connection import ConnectionState
@@ -340,6 +347,73 @@ class TestAthenaAdapter:
         s3 = boto3.client("s3", region_name=AWS_REGION)
         keys = [obj["Key"] for obj in s3.list_objects_v2(Bucket=BUCKET)["Contents"]]
         assert set(keys) == {"tables/table/dt=2022-01-03/data1.parquet", "tables/table/dt=2022-01-03/data2.parquet"}
+        assert "Deleted 2 partitions of" in log_records
+        glue = boto3.client("glue", region_name=AWS_REGION)
+        partitions = glue.get_partitions(DatabaseName=DATABASE_NAME, TableName="table")["Partitions"]
+        assert [p["Values"] for p in partitions] == [["2022-01-03"]]
+
+    @mock_aws
+    def test_clean_up_partitions_by_values(self, dbt_debug_caplog, mock_aws_service):
+        mock_aws_service.create_data_catalog()
+        mock_aws_service.create_database()
+        self.adapter.acquire_connection("dummy")
+        table_name = "table"
+        mock_aws_service.create_table(table_name)
+        mock_aws_service.add_data_in_table(table_name)
+        relation = self.adapter.Relation.create(
+            database=DATA_CATALOG_NAME,
+            schema=DATABASE_NAME,
+            identifier=table_name,
+        )
+        partitions = agate.Table(
+            [(datetime.date(2022, 1, 1),), (datetime.date(2022, 1, 2),), (datetime.date(2022, 1, 3),)],
+            ["dt"],
+            [agate.Date()],
+        )
+        self.adapter.clean_up_partitions_by_values(relation, ["dt"], partitions)
+        log_records = dbt_debug_caplog.getvalue()
+        assert "Compiled 3 partitions of" in log_records
+        assert "into 1 expressions" in log_records
+        glue = boto3.client("glue", region_name=AWS_REGION)
+        assert glue.get_partitions(DatabaseName=DATABASE_NAME, TableName=table_name)["Partitions"] == []
+        s3 = boto3.client("s3", region_name=AWS_REGION)
+        assert s3.list_objects_v2(Bucket=BUCKET)["KeyCount"] == 0
+
+    @mock_aws
+    def test_clean_up_partitions_by_values_string_key(self, mock_aws_service):
+        mock_aws_service.create_data_catalog()
+        mock_aws_service.create_database()
+        self.adapter.acquire_connection("dummy")
+        s3 = boto3.client("s3", region_name=AWS_REGION)
+        s3.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": AWS_REGION})
+        glue = boto3.client("glue", region_name=AWS_REGION)
+        glue.create_table(
+            DatabaseName=DATABASE_NAME,
+            TableInput={
+                "Name": "table",
+                "StorageDescriptor": {
+                    "Columns": [{"Name": "id", "Type": "string"}],
+                    "Location": f"s3://{BUCKET}/tables/table",
+                },
+                "PartitionKeys": [{"Name": "hour", "Type": "string"}],
+                "TableType": "table",
+            },
+        )
+        for hour in ("1", "2", "3", "10", "20"):
+            glue.create_partition(
+                DatabaseName=DATABASE_NAME,
+                TableName="table",
+                PartitionInput={
+                    "Values": [hour],
+                    "StorageDescriptor": {"Location": f"s3://{BUCKET}/tables/table/hour={hour}"},
+                },
+            )
+        relation = self.adapter.Relation.create(database=DATA_CATALOG_NAME, schema=DATABASE_NAME, identifier="table")
+        # agate infers the digits of the string key as numbers
+        partitions = agate.Table([(decimal.Decimal(v),) for v in (1, 2, 3)], ["hour"], [agate.Number()])
+        self.adapter.clean_up_partitions_by_values(relation, ["hour"], partitions)
+        remaining = glue.get_partitions(DatabaseName=DATABASE_NAME, TableName="table")["Partitions"]
+        assert sorted(p["Values"][0] for p in remaining) == ["10", "20"]
 
     @mock_aws
     def test_clean_up_table_table_does_not_exist(self, dbt_debug_caplog, mock_aws_service):
@@ -394,6 +468,119 @@ class TestAthenaAdapter:
         objs = s3.list_objects_v2(Bucket=BUCKET)
         assert objs["KeyCount"] == 0
 
+    @mock_aws
+    def test_delete_from_s3(self, dbt_debug_caplog, mock_aws_service):
+        s3 = boto3.client("s3", region_name=AWS_REGION)
+        s3.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": AWS_REGION})
+        for key in ["data.parquet", "dt=2022-01-01/data1.parquet", "dt=2022-01-01/data2.parquet", "dt=2022-01-02/x"]:
+            s3.put_object(Body=b"{}", Bucket=BUCKET, Key=f"tables/table/{key}")
+        s3.put_object(Body=b"{}", Bucket=BUCKET, Key="tables/table_2/data.parquet")
+        self.adapter.acquire_connection("dummy")
+        with patch.object(self.adapter, "DELETE_OBJECTS_API_LIMIT", 2):
+            self.adapter.delete_from_s3(f"s3://{BUCKET}/tables/table")
+        keys = [obj["Key"] for obj in s3.list_objects_v2(Bucket=BUCKET)["Contents"]]
+        assert keys == ["tables/table_2/data.parquet"]
+        assert f"Deleted 4 objects (8 bytes) from s3://{BUCKET}/tables/table" in dbt_debug_caplog.getvalue()
+
+    @mock_aws
+    def test_delete_from_s3_path_does_not_exist(self, dbt_debug_caplog, mock_aws_service):
+        s3 = boto3.client("s3", region_name=AWS_REGION)
+        s3.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": AWS_REGION})
+        self.adapter.acquire_connection("dummy")
+        self.adapter.delete_from_s3(f"s3://{BUCKET}/tables/table")
+        assert "S3 path does not exist" in dbt_debug_caplog.getvalue()
+
+    @mock_aws
+    def test_clean_up_table_deferred(self, dbt_debug_caplog, mock_aws_service):
+        s3 = boto3.client("s3", region_name=AWS_REGION)
+        s3.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": AWS_REGION})
+        unique_location = f"s3://{BUCKET}/tables/table/{uuid4()}"
+        for location in [unique_location, f"s3://{BUCKET}/tables/other"]:
+            s3.put_object(Body=b"{}", Bucket=BUCKET, Key=f"{location[len(f's3://{BUCKET}/'):]}/data.parquet")
+        self.adapter.acquire_connection("dummy")
+        self.adapter._defer_s3_deletes = True
+        relation = self.adapter.Relation.create(database=DATA_CATALOG_NAME, schema=DATABASE_NAME, identifier="table")
+        with patch.object(self.adapter, "get_glue_table_location", return_value=unique_location):
+            self.adapter.clean_up_table(relation)
+        assert f"Deferring the deletion of {unique_location}" in dbt_debug_caplog.getvalue()
+        # locations which are not unique could be reused right away, they are deleted synchronously
+        with patch.object(self.adapter, "get_glue_table_location", return_value=f"s3://{BUCKET}/tables/other"):
+            self.adapter.clean_up_table(relation)
+        assert "Deferring the deletion of s3://test-dbt-athena/tables/other" not in dbt_debug_caplog.getvalue()
+
+        self.adapter.cleanup_connections()
+        assert s3.list_objects_v2(Bucket=BUCKET)["KeyCount"] == 0
+        assert self.adapter._deferred_deletes == {}
+
+    def test_query_runtime_history_persisted(self, tmp_path):
+        self.config.project_root = str(tmp_path)
+        self.config.credentials.poll_history = True
+        history = QueryRuntimeHistory()
+        history.record("a", 10.0)
+        with patch("dbt.adapters.athena.impl.query_runtime_history", history):
+            self.adapter.cleanup_connections()
+            history_path = os.path.join(self.config.project_target_path, "athena_query_runtimes.json")
+            assert self.adapter._query_runtime_history_path == history_path
+        with open(history_path) as f:
+            assert json.load(f) == {"a": 10.0}
+
+        next_history = QueryRuntimeHistory()
+        with patch("dbt.adapters.athena.impl.query_runtime_history", next_history):
+            AthenaAdapter(self.config, get_context("spawn"))
+        assert next_history.expected_runtime("a") == 10.0
+
+    @patch("dbt.adapters.athena.impl.time.sleep")
+    def test__delete_s3_objects_retries_failed_keys(self, mock_sleep):
+        s3_client = mock.Mock()
+        s3_client.delete_objects.side_effect = [
+            {
+                "Errors": [
+                    {"Key": "a", "Code": "SlowDown", "Message": "Please reduce your request rate."},
+                    {"Key": "b", "Code": "AccessDenied", "Message": "Access Denied"},
+                ]
+            },
+            {},
+        ]
+        errors = self.adapter._delete_s3_objects(s3_client, BUCKET, ["a", "b", "c"], num_retries=3)
+        assert [err["Key"] for err in errors] == ["b"]
+        assert s3_client.delete_objects.call_count == 2
+        assert s3_client.delete_objects.call_args.kwargs["Delete"]["Objects"] == [{"Key": "a"}]
+        mock_sleep.assert_called_once()
+
+    @patch("dbt.adapters.athena.impl.time.sleep")
+    def test__delete_s3_objects_gives_up_after_retries(self, mock_sleep):
+        s3_client = mock.Mock()
+        s3_client.delete_objects.return_value = {"Errors": [{"Key": "a", "Code": "SlowDown", "Message": "Slow"}]}
+        errors = self.adapter._delete_s3_objects(s3_client, BUCKET, ["a"], num_retries=2)
+        assert [err["Key"] for err in errors] == ["a"]
+        assert s3_client.delete_objects.call_count == 3
+
+    def test__get_partitions_single_page(self):
+        glue_client = mock.Mock()
+        glue_client.get_partitions.return_value = {"Partitions": [{"Values": ["1"]}]}
+        relation = self.adapter.Relation.create(schema=DATABASE_NAME, identifier="table")
+        partitions = self.adapter._get_partitions(glue_client, None, relation, expression="dt > 0")
+        assert partitions == [{"Values": ["1"]}]
+        assert glue_client.get_partitions.call_args.kwargs["Expression"] == "dt > 0"
+        glue_client.get_paginator.assert_not_called()
+
+    def test__get_partitions_scans_segments_concurrently(self, dbt_debug_caplog):
+        glue_client = mock.Mock()
+        glue_client.get_partitions.return_value = {"Partitions": [{"Values": ["0"]}], "NextToken": "token"}
+
+        def paginate(**kwargs):
+            segment = kwargs["Segment"]
+            assert segment["TotalSegments"] == 4
+            return [{"Partitions": [{"Values": [f"{segment['SegmentNumber']}-{page}"]}]} for page in range(2)]
+
+        glue_client.get_paginator.return_value.paginate.side_effect = paginate
+        self.adapter._metadata_concurrency = 4
+        relation = self.adapter.Relation.create(schema=DATABASE_NAME, identifier="table")
+        partitions = self.adapter._get_partitions(glue_client, None, relation)
+        assert [p["Values"][0] for p in partitions] == [f"{seg}-{page}" for seg in range(4) for page in range(2)]
+        assert "Listed 8 partitions of" in dbt_debug_caplog.getvalue()
+        assert "in 4 segments" in dbt_debug_caplog.getvalue()
+
     @pytest.mark.parametrize(
         "column,quote_config,quote_character,expected",
         [
@@ -448,6 +635,36 @@ class TestAthenaAdapter:
         with pytest.raises(ValueError):
             self.adapter._get_one_catalog(mock_information_schema, {"baz"}, self.used_schemas)
 
+    def test_metadata_concurrency_defaults_to_threads(self):
+        self.config.threads = 32
+        assert self.adapter._metadata_concurrency == 32
+        # the boto3 clients shared by the metadata thread pool have a connection per worker
+        assert self.adapter._boto3_clients.metadata_concurrency == 32
+
+    def test__map_metadata(self):
+        assert self.adapter._map_metadata(lambda i: i * 2, range(20)) == [i * 2 for i in range(20)]
+        executor = self.adapter._metadata_executor
+        assert executor is not None
+        assert self.adapter._map_metadata(str, [1, 2]) == ["1", "2"]
+        # the pool is shared by the whole invocation
+        assert self.adapter._metadata_executor is executor
+        self.adapter.cleanup_connections()
+        assert self.adapter._metadata_executor is None
+
+    @mock_aws
+    def test__get_one_catalog_skips_unused_schemas(self, mock_aws_service):
+        mock_aws_service.create_data_catalog()
+        mock_aws_service.create_database("foo")
+        mock_aws_service.create_table(table_name="bar", database_name="foo")
+        mock_information_schema = mock.MagicMock()
+        mock_information_schema.database = "awsdatacatalog"
+
+        self.adapter.acquire_connection("dummy")
+        # the unused schema does not exist, fetching it would raise an EntityNotFoundException
+        actual = self.adapter._get_one_catalog(mock_information_schema, {"foo", "unused"}, self.used_schemas)
+        assert len(actual.rows) == 3
+        assert {row["table_schema"] for row in actual.rows} == {"foo"}
+
     @mock_aws
     def test__get_one_catalog_by_relations(self, mock_aws_service):
         mock_aws_service.create_data_catalog()
@@ -490,6 +707,30 @@ class TestAthenaAdapter:
         assert actual.column_names == expected_column_names
         assert actual.rows == expected_rows
 
+    @mock_aws
+    def test__get_one_catalog_by_relations_filters_tables(self, mock_aws_service):
+        mock_aws_service.create_data_catalog()
+        mock_aws_service.create_database("foo")
+        mock_aws_service.create_database("quux")
+        mock_aws_service.create_table(database_name="foo", table_name="bar")
+        # shares a prefix with the selected relation, so it is matched by the GetTables expression
+        mock_aws_service.create_table(database_name="foo", table_name="bar_2")
+        mock_aws_service.create_table(database_name="quux", table_name="baz")
+        mock_information_schema = mock.MagicMock()
+        mock_information_schema.database = "awsdatacatalog"
+
+        self.adapter.acquire_connection("dummy")
+        relations = [
+            self.adapter.Relation.create(database="awsdatacatalog", schema="foo", identifier="bar"),
+            self.adapter.Relation.create(database="awsdatacatalog", schema="quux", identifier="baz"),
+            self.adapter.Relation.create(database="awsdatacatalog", schema="quux", identifier="missing"),
+        ]
+        actual = self.adapter._get_one_catalog_by_relations(mock_information_schema, relations, self.used_schemas)
+        assert {(row["table_schema"], row["table_name"]) for row in actual.rows} == {("foo", "bar"), ("quux", "baz")}
+        assert len(actual.rows) == 6
+        # fetched tables are cached for the rest of the invocation
+        assert self.adapter._glue_tables.stats()["size"] == 3
+
     @mock_aws
     def test__get_one_catalog_shared_catalog(self, mock_aws_service):
         mock_aws_service.create_data_catalog(catalog_name=SHARED_DATA_CATALOG_NAME, catalog_id=SHARED_DATA_CATALOG_NAME)
@@ -606,6 +847,15 @@ class TestAthenaAdapter:
         res = self.adapter._get_data_catalog(DATA_CATALOG_NAME)
         assert {"Name": "awsdatacatalog", "Type": "GLUE", "Parameters": {"catalog-id": DEFAULT_ACCOUNT_ID}} == res
 
+    @mock_aws
+    def test__get_data_catalog_is_memoized(self, mock_aws_service):
+        mock_aws_service.create_data_catalog()
+        self.adapter.acquire_connection("dummy")
+        with patch.object(self.adapter, "_lookup_data_catalog", wraps=self.adapter._lookup_data_catalog) as lookup:
+            first = self.adapter._get_data_catalog(DATA_CATALOG_NAME)
+            assert self.adapter._get_data_catalog(DATA_CATALOG_NAME) == first
+            lookup.assert_called_once_with(DATA_CATALOG_NAME)
+
     def _test_list_relations_without_caching(self, schema_relation):
         self.adapter.acquire_connection("dummy")
         relations = self.adapter.list_relations_without_caching(schema_relation)
@@ -662,6 +912,24 @@ class TestAthenaAdapter:
         )
         self._test_list_relations_without_caching(schema_relation)
 
+    @mock_aws
+    def test_list_relations_without_caching_streams_pages(self, mock_aws_service):
+        mock_aws_service.create_data_catalog()
+        mock_aws_service.create_database()
+        for i in range(5):
+            mock_aws_service.create_table(f"table_{i}")
+        schema_relation = self.adapter.Relation.create(
+            database=DATA_CATALOG_NAME,
+            schema=DATABASE_NAME,
+            quote_policy=self.adapter.config.quoting,
+        )
+        self.adapter.acquire_connection("dummy")
+        with patch.object(self.adapter, "GET_TABLES_API_LIMIT", 2):
+            relations = self.adapter.list_relations_without_caching(schema_relation)
+        assert sorted(r.identifier for r in relations) == [f"table_{i}" for i in range(5)]
+        # listed tables prewarm the Glue table cache
+        assert self.adapter._glue_tables.stats()["size"] == 5
+
     @mock_aws
     def test_list_relations_without_caching_on_unknown_schema(self, mock_aws_service):
         schema_relation = self.adapter.Relation.create(
@@ -723,6 +991,78 @@ class TestAthenaAdapter:
         self.adapter.swap_table(source_relation, target_relation)
         assert self.adapter.get_glue_table_location(target_relation) == f"s3://{BUCKET}/tables/{source_table}"
 
+    @mock_aws
+    def test_swap_table_only_touches_changed_partitions(self, mock_aws_service, dbt_debug_caplog):
+        mock_aws_service.create_data_catalog()
+        mock_aws_service.create_database()
+        self.adapter.acquire_connection("dummy")
+        target_table = "target_table"
+        source_table = "source_table"
+        mock_aws_service.create_table(source_table)
+        mock_aws_service.add_partitions_to_table(DATABASE_NAME, source_table)
+        mock_aws_service.create_table(target_table)
+        mock_aws_service.add_partitions_to_table(DATABASE_NAME, target_table)
+        source_relation = self.adapter.Relation.create(
+            database=DATA_CATALOG_NAME,
+            schema=DATABASE_NAME,
+            identifier=source_table,
+        )
+        target_relation = self.adapter.Relation.create(
+            database=DATA_CATALOG_NAME,
+            schema=DATABASE_NAME,
+            identifier=target_table,
+        )
+        self.adapter._swap_partitions_diff = True
+        self.adapter.swap_table(source_relation, target_relation)
+        # same partition values, with other locations
+        log = dbt_debug_caplog.getvalue()
+        assert "0 deleted, 0 created, 26 updated, 0 unchanged, in 1 API calls instead of 3" in log
+        glue_client = boto3.client("glue", region_name=AWS_REGION)
+        partitions = glue_client.get_partitions(DatabaseName=DATABASE_NAME, TableName=target_table)["Partitions"]
+        assert {p["StorageDescriptor"]["Location"].rsplit("/", 2)[-2] for p in partitions} == {source_table}
+
+        self.adapter.swap_table(source_relation, target_relation)
+        log = dbt_debug_caplog.getvalue()
+        assert "0 deleted, 0 created, 0 updated, 26 unchanged, in 0 API calls instead of 3" in log
+
+    @mock_aws
+    @pytest.mark.parametrize("swap_partitions_diff", (False, True))
+    def test_swap_table_partitions_only_in_one_table(self, mock_aws_service, swap_partitions_diff):
+        mock_aws_service.create_data_catalog()
+        mock_aws_service.create_database()
+        self.adapter.acquire_connection("dummy")
+        self.adapter._swap_partitions_diff = swap_partitions_diff
+        glue_client = boto3.client("glue", region_name=AWS_REGION)
+        for table_name, dt in (("source_table", "2022-03-01"), ("target_table", "2022-02-01")):
+            mock_aws_service.create_table(table_name)
+            mock_aws_service.add_partitions_to_table(DATABASE_NAME, table_name)
+            partition = glue_client.get_partition(
+                DatabaseName=DATABASE_NAME, TableName=table_name, PartitionValues=["2022-01-01"]
+            )["Partition"]
+            partition["StorageDescriptor"]["Location"] = f"s3://{BUCKET}/tables/{table_name}/dt={dt}"
+            glue_client.create_partition(
+                DatabaseName=DATABASE_NAME,
+                TableName=table_name,
+                PartitionInput={
+                    "Values": [dt],
+                    "StorageDescriptor": partition["StorageDescriptor"],
+                    "Parameters": partition["Parameters"],
+                },
+            )
+        source_relation = self.adapter.Relation.create(
+            database=DATA_CATALOG_NAME, schema=DATABASE_NAME, identifier="source_table"
+        )
+        target_relation = self.adapter.Relation.create(
+            database=DATA_CATALOG_NAME, schema=DATABASE_NAME, identifier="target_table"
+        )
+        self.adapter.swap_table(source_relation, target_relation)
+        partitions = glue_client.get_partitions(DatabaseName=DATABASE_NAME, TableName="target_table")["Partitions"]
+        # the partition only in the target is deleted, the one only in the source is created
+        assert sorted(p["Values"][0] for p in partitions) == [f"2022-01-{day:02d}" for day in range(1, 27)] + [
+            "2022-03-01"
+        ]
+        assert {p["StorageDescriptor"]["Location"].rsplit("/", 2)[-2] for p in partitions} == {"source_table"}
+
     @mock_aws
     def test_swap_table_without_partitions(self, mock_aws_service):
         mock_aws_service.create_data_catalog()
@@ -1071,6 +1411,22 @@ class TestAthenaAdapter:
         )
         assert columns == []
 
+    @mock_aws
+    def test_get_glue_table_is_cached(self, mock_aws_service):
+        mock_aws_service.create_data_catalog()
+        mock_aws_service.create_database()
+        mock_aws_service.create_table("tbl_name")
+        self.adapter.acquire_connection("dummy")
+        relation = self.adapter.Relation.create(database=DATA_CATALOG_NAME, schema=DATABASE_NAME, identifier="tbl_name")
+        with patch.object(self.adapter, "_get_boto3_client", wraps=self.adapter._get_boto3_client) as get_client:
+            assert self.adapter.get_glue_table_type(relation) == TableType.TABLE
+            assert self.adapter.get_glue_table_location(relation) == "s3://test-dbt-athena/tables/tbl_name"
+            assert len(self.adapter.get_columns_in_relation(relation)) == 3
+            assert [c.args for c in get_client.call_args_list].count(("glue",)) == 1
+
+        self.adapter.delete_from_glue_catalog(relation)
+        assert self.adapter.get_glue_table(relation) is None
+
     @mock_aws
     def test_delete_from_glue_catalog(self, mock_aws_service):
         mock_aws_service.create_data_catalog()
@@ -1233,6 +1589,67 @@ class TestAthenaAdapter:
         with pytest.raises(ValueError):
             self.adapter.format_value_for_partition("test", "unsupported_type")
 
+    def test_get_partition_batches(self):
+        table = agate.Table(
+            [("eu", decimal.Decimal(1)), ("eu", decimal.Decimal(2)), ("us", decimal.Decimal(1))],
+            ["region", "id"],
+            [agate.Text(), agate.Number()],
+        )
+        assert self.adapter.get_partition_batches(table, ["region", "id"], 2) == [
+            "region='eu' and id in (1, 2)",
+            "region='us' and id=1",
+        ]
+
+    def test_get_partition_batches_by_size(self):
+        table = agate.Table(
+            [("eu", decimal.Decimal(90)), ("uk", decimal.Decimal(20)), ("us", decimal.Decimal(70))],
+            ["region", "partition_rows"],
+            [agate.Text(), agate.Number()],
+        )
+        assert self.adapter.get_partition_batches(table, ["region"], 100, batch_max_rows=100) == [
+            "region='eu'",
+            "region in ('uk', 'us')",
+        ]
+
+    @pytest.mark.parametrize("concurrency", (1, 3))
+    def test_run_batches(self, concurrency):
+        connection = mock.MagicMock()
+        running = []
+        max_running = []
+        lock = threading.Lock()
+
+        def run_query(sql, catch_partitions_limit, conn):
+            assert conn is connection
+            with lock:
+                running.append(sql)
+                max_running.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(sql)
+
+        sqls = [f"insert into table select {i}" for i in range(6)]
+        with mock.patch.object(
+            self.adapter.connections, "get_thread_connection", return_value=connection
+        ), mock.patch.object(self.adapter, "_run_query", side_effect=run_query) as _run_query:
+            self.adapter.run_batches(sqls, concurrency)
+        assert sorted(c.args[0] for c in _run_query.call_args_list) == sqls
+        assert max(max_running) == concurrency
+
+    def test_run_batches_skips_remaining_batches_on_failure(self):
+        def run_query(sql, catch_partitions_limit, conn):
+            time.sleep(0.05)
+            if sql.endswith("1"):
+                raise OperationalError("HIVE_PARTITION_SCHEMA_MISMATCH")
+
+        sqls = [f"insert into table select {i}" for i in range(6)]
+        with mock.patch.object(self.adapter.connections, "get_thread_connection"), mock.patch.object(
+            self.adapter, "_run_query", side_effect=run_query
+        ) as _run_query:
+            with pytest.raises(DbtRuntimeError, match="Batch 2 of 6 failed: HIVE_PARTITION_SCHEMA_MISMATCH"):
+                self.adapter.run_batches(sqls, 2)
+        # the batches running when the second one failed complete, the following ones are skipped
+        assert _run_query.call_count < len(sqls)
+
 
 class TestAthenaFilterCatalog:
     def test__catalog_filter_table(self):
@@ -0,0 +1,98 @@
+from unittest import mock
+
+import pytest
+
+from dbt.adapters.athena.cache import (
+    DataCatalogCache,
+    GlueTableCache,
+    get_written_relations,
+)
+
+
+@pytest.mark.parametrize(
+    ("sql", "expected"),
+    (
+        pytest.param("select * from schema.tbl", set(), id="select"),
+        pytest.param('/* {"app": "dbt"} */\n  with cte as (select 1) select * from cte', set(), id="comment"),
+        pytest.param('create table "awsdatacatalog"."schema"."tbl" as select 1', {("schema", "tbl")}, id="ctas"),
+        pytest.param("drop table if exists `schema`.`tbl`", {("schema", "tbl")}, id="drop"),
+        pytest.param("insert into schema.tbl select * from schema.other", {("schema", "tbl")}, id="insert"),
+        pytest.param(
+            "alter table `schema`.`tbl__ha` rename to `schema`.`tbl`",
+            {("schema", "tbl__ha"), ("schema", "tbl")},
+            id="rename",
+        ),
+        pytest.param("drop table tbl", None, id="unqualified"),
+        pytest.param("optimize schema.tbl rewrite data using bin_pack", None, id="unknown"),
+    ),
+)
+def test_get_written_relations(sql, expected):
+    assert get_written_relations(sql) == expected
+
+
+class TestGlueTableCache:
+    @staticmethod
+    def _table(schema, name):
+        return {"Table": {"DatabaseName": schema, "Name": name}}
+
+    def test_get_put(self):
+        cache = GlueTableCache()
+        assert cache.get("123", "schema", "tbl") is None
+        cache.put("123", self._table("schema", "tbl"), cache.generation)
+        assert cache.get("123", "Schema", "TBL") == self._table("schema", "tbl")
+        assert cache.get("456", "schema", "tbl") is None
+        assert cache.stats() == {"hits": 1, "misses": 2, "size": 1}
+
+    def test_put_after_invalidation_is_ignored(self):
+        cache = GlueTableCache()
+        generation = cache.generation
+        cache.invalidate("schema", "tbl")
+        cache.put("123", self._table("schema", "tbl"), generation)
+        assert cache.get("123", "schema", "tbl") is None
+
+    def test_invalidate_unqualified_relation(self):
+        cache = GlueTableCache()
+        cache.put_many("123", [self._table("schema", "tbl")["Table"]], 0)
+        assert cache.get("123", None, "tbl") is None
+        cache.invalidate("schema", None)
+        assert cache.stats()["size"] == 0
+        assert cache.generation == 1
+
+    def test_modified_identifiers(self):
+        cache = GlueTableCache()
+        assert cache.modified_identifiers() == set()
+        cache.invalidate_for_statement('create table "schema"."TBL__dbt_tmp" as select 1')
+        cache.invalidate("schema", "other")
+        assert cache.modified_identifiers() == {"tbl__dbt_tmp", "other"}
+        cache.invalidate_for_statement("vacuum other")
+        assert cache.modified_identifiers() is None
+
+    def test_invalidate_for_statement(self):
+        cache = GlueTableCache()
+        cache.put_many("123", [self._table("schema", "tbl")["Table"], self._table("schema", "other")["Table"]], 0)
+        cache.invalidate_for_statement("select * from schema.tbl")
+        assert cache.stats()["size"] == 2
+        cache.invalidate_for_statement("drop table `schema`.`tbl`")
+        assert cache.get("123", "schema", "tbl") is None
+        assert cache.get("123", "schema", "other") is not None
+        cache.invalidate_for_statement("vacuum other")
+        assert cache.stats()["size"] == 0
+
+
+class TestDataCatalogCache:
+    def test_get_or_load(self):
+        cache = DataCatalogCache()
+        loader = mock.Mock(return_value={"Name": "awsdatacatalog", "Type": "GLUE"})
+        assert cache.get_or_load("awsdatacatalog", loader) == {"Name": "awsdatacatalog", "Type": "GLUE"}
+        assert cache.get_or_load("AwsDataCatalog", loader) == {"Name": "awsdatacatalog", "Type": "GLUE"}
+        loader.assert_called_once()
+        assert cache.stats() == {"hits": 1, "misses": 1}
+
+    def test_get_or_load_expired(self):
+        cache = DataCatalogCache(ttl=60)
+        loader = mock.Mock(return_value=None)
+        with mock.patch("dbt.adapters.athena.cache.time.monotonic", side_effect=[0, 30, 90, 100]):
+            cache.get_or_load("catalog", loader)
+            cache.get_or_load("catalog", loader)
+            cache.get_or_load("catalog", loader)
+        assert loader.call_count == 2
@@ -0,0 +1,48 @@
+from decimal import Decimal
+
+import pytest
+
+from dbt.adapters.athena.catalog import CATALOG_COLUMN_NAMES, CatalogRows
+
+
+def _columns(*names):
+    return [{"Name": name, "Type": "string", "Comment": ""} for name in names]
+
+
+class TestCatalogRows:
+    def test_rows(self):
+        rows = CatalogRows()
+        rows.add_table("awsdatacatalog", "foo", "bar", "table", "", _columns("id", "dt"))
+        rows.add_table("awsdatacatalog", "foo", "baz", "view", "a view", [{"Name": "id", "Type": "int"}])
+        expected = [
+            ("awsdatacatalog", "foo", "bar", "table", None, "id", 0, "string", None),
+            ("awsdatacatalog", "foo", "bar", "table", None, "dt", 1, "string", None),
+            ("awsdatacatalog", "foo", "baz", "view", "a view", "id", 0, "int", None),
+        ]
+        assert len(rows) == 3
+        assert rows.num_tables == 2
+        assert list(rows) == expected
+        assert rows[-1] == expected[-1]
+        assert rows[1:] == expected[1:]
+        with pytest.raises(IndexError):
+            rows[3]
+
+    def test_extend(self):
+        rows = CatalogRows()
+        rows.add_table("awsdatacatalog", "foo", "bar", "table", None, _columns("id"))
+        other = CatalogRows()
+        other.add_table("awsdatacatalog", "quux", "baz", "table", None, _columns("id", "dt"))
+        rows.extend(other)
+        assert [(row[1], row[2], row[5]) for row in rows] == [
+            ("foo", "bar", "id"),
+            ("quux", "baz", "id"),
+            ("quux", "baz", "dt"),
+        ]
+
+    def test_to_table(self):
+        rows = CatalogRows()
+        # numeric names must not be coerced to numbers
+        rows.add_table("9876543210", "foo", "123", "table", None, _columns("id"))
+        table = rows.to_table()
+        assert table.column_names == CATALOG_COLUMN_NAMES
+        assert table.rows[0].values() == ("9876543210", "foo", "123", "table", None, "id", Decimal(0), "string", None)
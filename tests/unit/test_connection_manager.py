@@ -2,10 +2,18 @@ from multiprocessing import get_context
 from unittest import mock
 
 import pytest
+from dbt_common.exceptions import DbtRuntimeError
+from pyathena.error import OperationalError
 from pyathena.model import AthenaQueryExecution
+from pyathena.util import RetryConfig
 
 from dbt.adapters.athena import AthenaConnectionManager
-from dbt.adapters.athena.connections import AthenaAdapterResponse
+from dbt.adapters.athena.connections import (
+    AthenaAdapterResponse,
+    AthenaCursor,
+    client_request_scope,
+    result_reuse_max_age,
+)
 
 
 class TestAthenaConnectionManager:
@@ -21,15 +29,229 @@ class TestAthenaConnectionManager:
         cursor.rowcount = 1
         cursor.state = state
         cursor.data_scanned_in_bytes = 123
+        cursor.reused_previous_result = True
         cm = AthenaConnectionManager(mock.MagicMock(), get_context("spawn"))
         response = cm.get_response(cursor)
         assert isinstance(response, AthenaAdapterResponse)
         assert response.code == result
         assert response.rows_affected == 1
         assert response.data_scanned_in_bytes == 123
+        assert response.reused_previous_result is True
 
     def test_data_type_code_to_name(self):
         cm = AthenaConnectionManager(mock.MagicMock(), get_context("spawn"))
         assert cm.data_type_code_to_name("array<string>") == "ARRAY"
         assert cm.data_type_code_to_name("map<int, boolean>") == "MAP"
         assert cm.data_type_code_to_name("DECIMAL(3, 7)") == "DECIMAL"
+
+    @pytest.mark.parametrize(
+        ("unload_results", "fetch", "sql", "unloaded"),
+        (
+            pytest.param(True, True, "select 1", True, id="unloaded"),
+            pytest.param(False, True, "select 1", False, id="disabled"),
+            pytest.param(True, False, "select 1", False, id="no_fetch"),
+            pytest.param(True, True, "insert into schema.table select 1", False, id="not_a_query"),
+            pytest.param(True, True, "select a from t order by a;", False, id="sorted"),
+        ),
+    )
+    def test_execute_unload_results(self, unload_results, fetch, sql, unloaded):
+        cm = AthenaConnectionManager(mock.MagicMock(), get_context("spawn"))
+        connection = mock.MagicMock()
+        connection.credentials.unload_results = unload_results
+        connection.credentials.arrow_results = False
+        connection.credentials.s3_staging_dir = "s3://bucket/staging/"
+        cursor = mock.MagicMock()
+        cursor.state = AthenaQueryExecution.STATE_SUCCEEDED
+        with mock.patch.object(cm, "get_thread_connection", return_value=connection), mock.patch.object(
+            cm, "add_query", return_value=(connection, cursor)
+        ) as add_query, mock.patch.object(cm, "get_result_from_unload") as get_result_from_unload, mock.patch.object(
+            cm, "delete_unloaded_results"
+        ) as delete_unloaded_results, mock.patch.object(
+            cm, "get_result_from_cursor"
+        ):
+            cm.execute(sql, fetch=fetch)
+        executed_sql = add_query.call_args.args[0]
+        assert executed_sql.startswith("UNLOAD (") == unloaded
+        assert get_result_from_unload.called == unloaded
+        assert delete_unloaded_results.called == unloaded
+        if unloaded:
+            s3_path = get_result_from_unload.call_args.args[1]
+            assert s3_path.startswith("s3://bucket/staging/unload/")
+            assert f"TO '{s3_path}'" in executed_sql
+            delete_unloaded_results.assert_called_once_with(connection, s3_path)
+
+    def test_execute_unload_results_deletes_files_of_failed_query(self):
+        cm = AthenaConnectionManager(mock.MagicMock(), get_context("spawn"))
+        connection = mock.MagicMock()
+        connection.credentials.unload_results = True
+        connection.credentials.s3_staging_dir = "s3://bucket/staging/"
+        with mock.patch.object(cm, "get_thread_connection", return_value=connection), mock.patch.object(
+            cm, "add_query", side_effect=DbtRuntimeError("failed")
+        ), mock.patch.object(cm, "delete_unloaded_results") as delete_unloaded_results:
+            with pytest.raises(DbtRuntimeError):
+                cm.execute("select 1", fetch=True)
+        assert delete_unloaded_results.call_args.args[1].startswith("s3://bucket/staging/unload/")
+
+    def test_execute_arrow_results(self):
+        cm = AthenaConnectionManager(mock.MagicMock(), get_context("spawn"))
+        connection = mock.MagicMock()
+        connection.credentials.unload_results = False
+        connection.credentials.arrow_results = True
+        cursor = mock.MagicMock()
+        cursor.state = AthenaQueryExecution.STATE_SUCCEEDED
+        with mock.patch.object(cm, "get_thread_connection", return_value=connection), mock.patch.object(
+            cm, "add_query", return_value=(connection, cursor)
+        ) as add_query, mock.patch.object(cm, "get_result_from_output") as get_result_from_output:
+            cm.execute("show tables", fetch=True)
+        assert add_query.call_args.args[0] == "show tables"
+        get_result_from_output.assert_called_once_with(connection, cursor, None)
+
+    @pytest.mark.parametrize(
+        ("output_location", "description"),
+        (
+            pytest.param("s3://bucket/staging/query.txt", [("tab_name", "string")], id="ddl"),
+            pytest.param("s3://bucket/staging/query.csv", None, id="no_result"),
+        ),
+    )
+    def test_get_result_from_output_falls_back_to_cursor(self, output_location, description):
+        cm = AthenaConnectionManager(mock.MagicMock(), get_context("spawn"))
+        cursor = mock.MagicMock()
+        cursor.output_location = output_location
+        cursor.description = description
+        with mock.patch.object(cm, "get_result_from_cursor") as get_result_from_cursor:
+            cm.get_result_from_output(mock.MagicMock(), cursor, 10)
+        get_result_from_cursor.assert_called_once_with(cursor, 10)
+
+    @pytest.mark.parametrize(
+        ("profile_max_age", "model_max_age", "sql", "max_age"),
+        (
+            pytest.param(60, None, "select 1", 60, id="profile"),
+            pytest.param(60, 10, "select 1", 10, id="model"),
+            pytest.param(60, 0, "select 1", 0, id="model_disabled"),
+            pytest.param(None, None, "select 1", None, id="disabled"),
+            pytest.param(60, None, "insert into schema.table select 1", None, id="not_a_query"),
+            pytest.param(60, None, 'select distinct "dt" from "schema"."table__dbt_tmp"', None, id="tmp_relation"),
+            pytest.param(60, None, "select max(dt) from schema.modified", None, id="modified_relation"),
+        ),
+    )
+    def test_get_result_reuse_max_age(self, profile_max_age, model_max_age, sql, max_age):
+        cm = AthenaConnectionManager(mock.MagicMock(), get_context("spawn"))
+        connection = mock.MagicMock()
+        connection.name = "model.test.model"
+        connection.credentials.result_reuse_max_age = profile_max_age
+        cm.result_reuse_max_ages[connection.name] = model_max_age
+        cm.glue_tables.invalidate("schema", "modified")
+        assert cm.get_result_reuse_max_age(connection, sql) == max_age
+
+    @pytest.mark.parametrize(
+        ("fetch", "max_age"),
+        (
+            pytest.param(True, 60, id="fetch"),
+            pytest.param(False, None, id="no_fetch"),
+        ),
+    )
+    def test_execute_result_reuse(self, fetch, max_age):
+        cm = AthenaConnectionManager(mock.MagicMock(), get_context("spawn"))
+        connection = mock.MagicMock()
+        connection.credentials.unload_results = False
+        connection.credentials.arrow_results = False
+        connection.credentials.result_reuse_max_age = 60
+        max_ages = []
+        with mock.patch.object(cm, "get_thread_connection", return_value=connection), mock.patch(
+            "dbt.adapters.sql.connections.SQLConnectionManager.execute",
+            side_effect=lambda *args, **kwargs: max_ages.append(result_reuse_max_age.get()),
+        ):
+            cm.execute("select 1", fetch=fetch)
+        assert max_ages == [max_age]
+        assert result_reuse_max_age.get() is None
+
+    @pytest.mark.parametrize(
+        ("max_age", "reuse_kwargs"),
+        (
+            pytest.param(60, {"result_reuse_enable": True, "result_reuse_minutes": 60}, id="reused"),
+            pytest.param(None, {}, id="not_reused"),
+        ),
+    )
+    def test_cursor_execute_result_reuse(self, max_age, reuse_kwargs):
+        connection = mock.MagicMock()
+        connection.cursor_kwargs = {"num_iceberg_retries": 0}
+        cursor = AthenaCursor(
+            connection=connection,
+            converter=mock.MagicMock(),
+            formatter=mock.MagicMock(),
+            retry_config=RetryConfig(attempt=1),
+        )
+        query_execution = mock.MagicMock()
+        query_execution.state = AthenaQueryExecution.STATE_SUCCEEDED
+        token = result_reuse_max_age.set(max_age)
+        try:
+            with mock.patch.object(cursor, "_execute", return_value="query_id") as execute, mock.patch.object(
+                cursor, "_poll", return_value=query_execution
+            ), mock.patch.object(cursor, "_result_set_class"):
+                cursor.execute("select 1")
+        finally:
+            result_reuse_max_age.reset(token)
+        called_kwargs = execute.call_args.kwargs
+        assert {k: v for k, v in called_kwargs.items() if k.startswith("result_reuse")} == reuse_kwargs
+
+    def _cursor(self, attempts):
+        connection = mock.MagicMock()
+        connection.cursor_kwargs = {"num_iceberg_retries": 0}
+        return AthenaCursor(
+            connection=connection,
+            converter=mock.MagicMock(),
+            formatter=mock.MagicMock(),
+            retry_config=RetryConfig(attempt=attempts, max_delay=0),
+        )
+
+    def _execute_with_scope(self, cursor, execute, poll):
+        tokens = []
+
+        def start_query_execution(*args, **kwargs):
+            tokens.append(cursor._build_start_query_execution_request("select 1").get("ClientRequestToken"))
+            return execute(*args, **kwargs)
+
+        token = client_request_scope.set("model.test.model")
+        try:
+            with mock.patch.object(cursor, "_execute", side_effect=start_query_execution), mock.patch.object(
+                cursor, "_poll", side_effect=poll
+            ) as poll_mock, mock.patch.object(cursor, "_result_set_class"):
+                cursor.execute("select 1")
+        finally:
+            client_request_scope.reset(token)
+        return tokens, poll_mock
+
+    def _query_execution(self, state):
+        query_execution = mock.MagicMock()
+        query_execution.state = state
+        return query_execution
+
+    def test_cursor_execute_retries_submission_with_same_token(self):
+        cursor = self._cursor(attempts=2)
+        execute = mock.MagicMock(side_effect=[OperationalError("Throttled"), "query_id"])
+        succeeded = self._query_execution(AthenaQueryExecution.STATE_SUCCEEDED)
+        tokens, _ = self._execute_with_scope(cursor, execute, [succeeded])
+        assert len(tokens) == 2
+        assert tokens[0] is not None and tokens[0] == tokens[1]
+
+    def test_cursor_execute_polls_again_without_submitting(self):
+        cursor = self._cursor(attempts=2)
+        execute = mock.MagicMock(return_value="query_id")
+        succeeded = self._query_execution(AthenaQueryExecution.STATE_SUCCEEDED)
+        tokens, poll = self._execute_with_scope(cursor, execute, [OperationalError("Throttled"), succeeded])
+        assert len(tokens) == 1
+        assert [c.args for c in poll.call_args_list] == [("query_id",), ("query_id",)]
+
+    def test_cursor_execute_failed_query_gets_new_token(self):
+        cursor = self._cursor(attempts=2)
+        execute = mock.MagicMock(side_effect=["query_id", "other_query_id"])
+        failed = self._query_execution(AthenaQueryExecution.STATE_FAILED)
+        succeeded = self._query_execution(AthenaQueryExecution.STATE_SUCCEEDED)
+        tokens, poll = self._execute_with_scope(cursor, execute, [failed, succeeded])
+        assert len(tokens) == 2
+        assert tokens[0] != tokens[1]
+        assert [c.args for c in poll.call_args_list] == [("query_id",), ("other_query_id",)]
+
+    def test_cursor_execute_without_scope_has_no_token(self):
+        cursor = self._cursor(attempts=1)
+        assert "ClientRequestToken" not in cursor._build_start_query_execution_request("select 1")
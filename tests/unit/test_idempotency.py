@@ -0,0 +1,33 @@
+from unittest import mock
+
+from dbt.adapters.athena.idempotency import ClientRequestTokens, normalize_statement
+
+
+class TestClientRequestTokens:
+    def test_normalize_statement(self):
+        assert normalize_statement("select *\n  from  table\n") == "select * from table"
+
+    def test_next_token_is_deterministic(self):
+        with mock.patch("dbt.adapters.athena.idempotency.get_invocation_id", return_value="invocation"):
+            first = [ClientRequestTokens().next_token("model.test.model", "select 1") for _ in range(2)]
+        assert first[0] == first[1]
+        assert 32 <= len(first[0]) <= 128
+
+    def test_next_token_per_submission(self):
+        tokens = ClientRequestTokens()
+        with mock.patch("dbt.adapters.athena.idempotency.get_invocation_id", return_value="invocation"):
+            first = tokens.next_token("model.test.model", "select 1")
+            second = tokens.next_token("model.test.model", "select  1")
+            other_model = tokens.next_token("model.test.other_model", "select 1")
+            other_statement = tokens.next_token("model.test.model", "select 2")
+        assert len({first, second, other_model, other_statement}) == 4
+
+    def test_next_token_per_invocation(self):
+        tokens = ClientRequestTokens()
+        with mock.patch("dbt.adapters.athena.idempotency.get_invocation_id", return_value="invocation"):
+            first = tokens.next_token("model.test.model", "select 1")
+        with mock.patch("dbt.adapters.athena.idempotency.get_invocation_id", return_value="other_invocation"):
+            second = tokens.next_token("model.test.model", "select 1")
+        assert first != second
+        # the submissions of the previous invocation are forgotten
+        assert list(tokens._submissions.values()) == [1]
@@ -0,0 +1,343 @@
+import re
+import sqlite3
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, List, Tuple
+
+import pytest
+from dbt_common.exceptions import DbtRuntimeError
+
+from dbt.adapters.athena.partitions import (
+    format_partition_value,
+    get_bucket_number,
+    get_bucket_numbers,
+    get_glue_column_type,
+    get_partition_batches,
+    get_partition_expressions,
+    get_partition_predicates,
+    iceberg_hash,
+    pack_partitions,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "column_type", "expected"),
+    (
+        pytest.param(Decimal(1), "integer", "1", id="integer"),
+        pytest.param("foo", "string", "'foo'", id="string"),
+        pytest.param(date(2024, 1, 1), "date", "'2024-01-01'", id="date"),
+        pytest.param(datetime(2024, 1, 1, 12), "timestamp", "'2024-01-01 12:00:00'", id="timestamp"),
+    ),
+)
+def test_format_partition_value(value, column_type, expected):
+    assert format_partition_value(value, column_type) == expected
+
+
+def test_format_partition_value_unsupported_type():
+    with pytest.raises(DbtRuntimeError, match="Need to add support for column type double"):
+        format_partition_value(1.5, "double")
+
+
+@pytest.mark.parametrize(
+    ("glue_type", "expected"),
+    (
+        pytest.param("bigint", "integer", id="bigint"),
+        pytest.param("date", "date", id="date"),
+        pytest.param("varchar(10)", "string", id="varchar"),
+        pytest.param("decimal(10, 2)", "number", id="decimal"),
+        pytest.param("double", "number", id="double"),
+    ),
+)
+def test_get_glue_column_type(glue_type, expected):
+    assert get_glue_column_type(glue_type) == expected
+
+
+def test_get_glue_column_type_unsupported_type():
+    with pytest.raises(DbtRuntimeError, match="Need to add support for column type array<string>"):
+        get_glue_column_type("array<string>")
+
+
+class TestGetPartitionPredicates:
+    def test_date_ranges(self):
+        partitions = [(date(2024, 1, d),) for d in (1, 2, 3, 4, 6, 9, 10)]
+        assert get_partition_predicates(["dt"], ["date"], partitions) == [
+            "dt between '2024-01-01' and '2024-01-04'",
+            "dt in ('2024-01-06', '2024-01-09', '2024-01-10')",
+        ]
+
+    def test_integer_ranges(self):
+        partitions = [(Decimal(v),) for v in (5, 1, 2, 3, 7)]
+        assert get_partition_predicates(["id"], ["integer"], partitions) == ["id between 1 and 3", "id in (5, 7)"]
+
+    def test_single_value(self):
+        assert get_partition_predicates(["region"], ["string"], [("eu",)]) == ["region='eu'"]
+
+    def test_string_key_with_numeric_values(self):
+        # e.g. the digits of a string key, inferred as numbers by agate
+        partitions = [(Decimal(v),) for v in (1, 2, 3)]
+        assert get_partition_predicates(["hour"], ["string"], partitions) == ["hour in ('1', '2', '3')"]
+
+    def test_number_key_without_ranges(self):
+        partitions = [(Decimal(v),) for v in (1, 2, 3)]
+        assert get_partition_predicates(["price"], ["number"], partitions) == ["price in (1, 2, 3)"]
+
+    def test_multiple_keys(self):
+        partitions = [("eu", date(2024, 1, d)) for d in (1, 2, 3)]
+        partitions += [("us", date(2024, 1, 1)), ("eu", date(2024, 1, 3))]
+        assert get_partition_predicates(["region", "dt"], ["string", "date"], partitions) == [
+            "region='eu' and dt between '2024-01-01' and '2024-01-03'",
+            "region='us' and dt='2024-01-01'",
+        ]
+
+    def test_in_lists_are_split(self):
+        partitions = [(f"value_{i}",) for i in range(10)]
+        predicates = get_partition_predicates(["key"], ["string"], partitions, max_len=50)
+        assert all(len(p) <= 50 for p in predicates)
+        assert sum(p.count("value_") for p in predicates) == 10
+
+
+def test_get_partition_expressions():
+    partitions = [(date(2024, 1, d),) for d in (1, 2, 3, 10)]
+    assert get_partition_expressions(["dt"], ["date"], partitions) == [
+        "(dt between '2024-01-01' and '2024-01-03') or (dt='2024-01-10')"
+    ]
+
+
+def test_get_partition_expressions_max_len():
+    partitions = [(date(2024, 1, d),) for d in range(1, 32, 2)]
+    expressions = get_partition_expressions(["dt"], ["date"], partitions, max_len=100)
+    assert len(expressions) > 1
+    assert all(len(e) <= 100 for e in expressions)
+    assert sum(e.count("'2024-01-") for e in expressions) == 16
+
+
+class TestIcebergBuckets:
+    # https://iceberg.apache.org/spec/#appendix-b-32-bit-hash-requirements
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        (
+            pytest.param(34, 2017239379, id="int"),
+            pytest.param(Decimal(34), 2017239379, id="integer decimal"),
+            pytest.param(date(2017, 11, 16), -653330422, id="date"),
+            pytest.param(datetime(2017, 11, 16, 22, 31, 8), -2047944441, id="timestamp"),
+            pytest.param(
+                datetime(2017, 11, 16, 14, 31, 8, tzinfo=timezone(timedelta(hours=-8))), -2047944441, id="timestamptz"
+            ),
+            pytest.param("iceberg", 1210000089, id="string"),
+            pytest.param(bytes([0, 1, 2, 3]), -188683207, id="binary"),
+        ),
+    )
+    def test_spec_hashes(self, value, expected):
+        assert iceberg_hash(value) == expected
+
+    def test_bucket_numbers(self):
+        values = [34, "iceberg", date(2017, 11, 16), None, 34]
+        expected = [(h & 0x7FFFFFFF) % 16 for h in (2017239379, 1210000089, -653330422)]
+        assert get_bucket_numbers(values, 16) == expected + [None, expected[0]]
+        assert [get_bucket_number(value, 16) for value in values] == get_bucket_numbers(values, 16)
+
+    def test_unsupported_type(self):
+        with pytest.raises(TypeError):
+            get_bucket_numbers([1, 1.5], 16)
+        with pytest.raises(TypeError):
+            get_bucket_numbers([Decimal("1.5")], 16)
+
+    # buckets assigned by the BucketTransform of pyiceberg 0.7.1, with 7, 16 and 1024 buckets
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        (
+            pytest.param(-1000, [0, 12, 284], id="negative"),
+            pytest.param(-1, [5, 8, 232], id="minus_one"),
+            pytest.param(0, [1, 12, 764], id="zero"),
+            pytest.param(34, [1, 3, 339], id="int"),
+            pytest.param(2**31, [6, 14, 542], id="long"),
+            pytest.param(-(2**63), [4, 5, 805], id="long_min"),
+            pytest.param(2**63 - 1, [5, 15, 191], id="long_max"),
+            pytest.param(date(1969, 12, 31), [5, 8, 232], id="date_before_epoch"),
+            pytest.param(date(1970, 1, 1), [1, 12, 764], id="date_epoch"),
+            pytest.param(date(2017, 11, 16), [6, 10, 10], id="date"),
+            pytest.param(date(1, 1, 1), [3, 9, 521], id="date_min"),
+            pytest.param(date(9999, 12, 31), [0, 9, 697], id="date_max"),
+            pytest.param(datetime(1969, 12, 31, 23, 59, 59, 999999), [5, 8, 232], id="timestamp_before_epoch"),
+            pytest.param(datetime(1970, 1, 1), [1, 12, 764], id="timestamp_epoch"),
+            pytest.param(datetime(2017, 11, 16, 22, 31, 8), [5, 7, 263], id="timestamp"),
+            pytest.param(datetime(2024, 2, 29, 12, 0, 0, 1), [0, 9, 249], id="timestamp_micros"),
+            pytest.param("", [0, 0, 0], id="empty_string"),
+            pytest.param("iceberg", [4, 9, 729], id="string"),
+            pytest.param("é", [3, 7, 903], id="two_byte_string"),
+            pytest.param("日本", [3, 2, 322], id="three_byte_string"),
+            pytest.param("user_42", [2, 13, 77], id="ascii_string"),
+        ),
+    )
+    def test_pyiceberg_buckets(self, value, expected):
+        assert [get_bucket_numbers([value], num_buckets)[0] for num_buckets in (7, 16, 1024)] == expected
+        assert [get_bucket_number(value, num_buckets) for num_buckets in (7, 16, 1024)] == expected
+
+    def test_pyiceberg_conformance(self):
+        transforms = pytest.importorskip("pyiceberg.transforms")
+        types = pytest.importorskip("pyiceberg.types")
+        pyiceberg_datetime = pytest.importorskip("pyiceberg.utils.datetime")
+        start = datetime(1969, 12, 25, 23, 59, 59, 999999)
+        columns = [
+            (types.LongType(), list(range(-1000, 1000)), lambda v: v),
+            (types.DateType(), _days(date(1969, 6, 1), date(1971, 6, 1)), pyiceberg_datetime.date_to_days),
+            (
+                types.TimestampType(),
+                [start + timedelta(hours=i, microseconds=i) for i in range(1000)],
+                pyiceberg_datetime.datetime_to_micros,
+            ),
+            (types.StringType(), [f"user_{i}" for i in range(1000)] + ["", "é", "日本"], lambda v: v),
+        ]
+        for num_buckets in (1, 7, 16, 1024):
+            for column_type, values, to_iceberg in columns:
+                bucket = transforms.BucketTransform(num_buckets).transform(column_type)
+                assert get_bucket_numbers(values, num_buckets) == [bucket(to_iceberg(v)) for v in values]
+
+
+class TestGetPartitionBatches:
+    def test_batches(self):
+        rows = [("eu", date(2024, 1, d)) for d in (1, 2, 3)] + [("us", None)]
+        assert get_partition_batches(["region", "day(dt)"], ["string", "date"], rows, 3) == [
+            "region='eu' and date_trunc('day', dt) between DATE'2024-01-01' and DATE'2024-01-03'",
+            "region='us' and date_trunc('day', dt) is null",
+        ]
+
+    def test_in_lists_by_leading_key(self):
+        rows = [("eu", Decimal(1)), ("eu", Decimal(5)), ("us", Decimal(1)), (None, Decimal(2))]
+        assert get_partition_batches(["region", "id"], ["string", "integer"], rows, 100) == [
+            "(region is null and id=2) or (region='eu' and id in (1, 5)) or (region='us' and id=1)"
+        ]
+
+    def test_duplicate_partitions(self):
+        rows = [("it's", Decimal(1)), ("it's", Decimal(1)), ("it's", Decimal(2))]
+        assert get_partition_batches(["name", "id"], ["string", "integer"], rows, 100) == [
+            "name='it''s' and id in (1, 2)"
+        ]
+
+    def test_no_partitions(self):
+        assert get_partition_batches(["dt"], ["date"], [], 100) == []
+
+    def test_bucketed_partitions(self):
+        rows = [(date(2024, 1, 1), "a"), (date(2024, 1, 1), "b"), (date(2024, 1, 2), "a")]
+        buckets = {}
+        for value in ("a", "b"):
+            buckets.setdefault(get_bucket_number(value, 2), []).append(f"'{value}'")
+        predicates = [
+            f"(dt in (DATE'2024-01-01', DATE'2024-01-02')) and user_id IN ({', '.join(literals)})"
+            for literals in buckets.values()
+        ]
+        expected = predicates[0] if len(predicates) == 1 else " or ".join(f"({p})" for p in predicates)
+        assert get_partition_batches(["dt", "bucket(user_id, 2)"], ["date", "string"], rows, 100) == [expected]
+
+    def test_bucketed_key_with_nulls(self):
+        rows = [("a",), (None,)]
+        batches = get_partition_batches(["bucket(user_id, 1)"], ["string"], rows, 100)
+        assert batches == ["(user_id IN ('a')) or (user_id is null)"]
+
+    def test_bucketed_key_only(self):
+        rows = [("a",), ("b",)]
+        batches = get_partition_batches(["bucket(user_id, 1)"], ["string"], rows, 100)
+        assert batches == ["user_id IN ('a', 'b')"]
+
+    def test_batches_by_size(self):
+        rows = [(Decimal(i), Decimal(size)) for i, size in enumerate((50, 10, 40, 10, 90))]
+        batches = get_partition_batches(["id"], ["integer"], rows, 2, sizes=[r[1] for r in rows], max_batch_size=100)
+        assert batches == ["id=4", "id in (0, 3)", "id in (1, 2)"]
+
+    def test_bucketed_partitions_by_count(self):
+        rows = [("a", 10), ("b", 10)]
+        batches = get_partition_batches(["bucket(user_id, 1)"], ["string"], rows, 100, sizes=[10, 10], max_batch_size=1)
+        assert batches == ["user_id IN ('a', 'b')"]
+
+    def test_unsupported_type(self):
+        with pytest.raises(ValueError, match="Unsupported column type: double"):
+            get_partition_batches(["value"], ["double"], [(1.5,)], 100)
+
+
+def _days(start: date, end: date) -> List[date]:
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def _scenario_rows(partitioned_by: List[str]) -> List[Tuple[Any, ...]]:
+    """The rows of the models of tests/functional/adapter/test_partitions.py, by partitioning."""
+    days = _days(date(2023, 1, 1), date(2023, 7, 31))
+    if partitioned_by == ["day(date_column)", "doy"]:
+        return [(day, Decimal(day.timetuple().tm_yday)) for day in days]
+    if partitioned_by == ["id", "date_column"]:
+        return [(Decimal(i), day) for i, day in enumerate(days, start=1)] + [(None, None), (None, days[0])]
+    if partitioned_by == ["id"]:
+        return [(Decimal(i),) for i in range(1, 201)] + [(None,)]
+    if partitioned_by == ["day(date_column)", "doy", "bucket(non_random_str, 5)"]:
+        return [(day, Decimal(day.timetuple().tm_yday), f"str_{i % 3}") for i, day in enumerate(days[:205])]
+    return [(f"str_{i % 3}",) for i in range(205)]
+
+
+def _sqlite_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return int(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+class TestPartitionBatchesScenarios:
+    """
+    Each batch matches exactly its partitions: evaluated on the partitions of the model, the predicates of the
+    batches select disjoint sets of partitions, which cover all of them.
+    """
+
+    COLUMN_TYPES = {
+        "day(date_column)": "date",
+        "date_column": "date",
+        "doy": "integer",
+        "id": "integer",
+        "bucket(non_random_str, 5)": "string",
+    }
+
+    @pytest.mark.parametrize(
+        "partitioned_by",
+        (
+            ["day(date_column)", "doy"],
+            ["id", "date_column"],
+            ["id"],
+            ["day(date_column)", "doy", "bucket(non_random_str, 5)"],
+            ["bucket(non_random_str, 5)"],
+        ),
+    )
+    @pytest.mark.parametrize("partitions_limit", (1, 7, 100))
+    def test_batches_match_partitions(self, partitioned_by, partitions_limit):
+        rows = _scenario_rows(partitioned_by)
+        column_types = [self.COLUMN_TYPES[key] for key in partitioned_by]
+        batches = get_partition_batches(partitioned_by, column_types, rows, partitions_limit)
+        columns = [re.sub(r"^\w+\((\w+).*\)$", r"\1", key) for key in partitioned_by]
+
+        # sqlite compares ISO dates as strings, the dates are already truncated
+        db = sqlite3.connect(":memory:")
+        db.create_function("date_trunc", 2, lambda unit, value: value)
+        db.execute(f"create table partitions ({', '.join(columns)})")
+        db.executemany(
+            f"insert into partitions values ({', '.join('?' for _ in columns)})",
+            [tuple(_sqlite_value(v) for v in row) for row in rows],
+        )
+        matched: List[Tuple[Any, ...]] = []
+        for batch in batches:
+            predicate = batch.replace("DATE'", "'")
+            matched.extend(db.execute(f"select distinct * from partitions where {predicate}").fetchall())
+        distinct_rows = db.execute("select distinct * from partitions").fetchall()
+        assert len(matched) == len(set(matched)) == len(distinct_rows)
+        if not any(key.startswith("bucket(") for key in partitioned_by):
+            assert len(batches) == -(-len(distinct_rows) // partitions_limit)
+
+
+class TestPackPartitions:
+    def test_balanced_batches(self):
+        sizes = {"a": 30, "b": 30, "c": 20, "d": 20, "e": 10, "f": 10}
+        assert pack_partitions(sizes, 10, 60) == [["a", "c", "e"], ["b", "d", "f"]]
+
+    def test_partitions_limit(self):
+        sizes = {str(i): 1 for i in range(5)}
+        assert pack_partitions(sizes, 2, 100) == [["0", "3"], ["1", "4"], ["2"]]
+
+    def test_oversized_partition(self):
+        sizes = {"small": 10, "huge": 1000, "other": 10}
+        assert pack_partitions(sizes, 100, 100) == [["huge"], ["small", "other"]]
@@ -0,0 +1,251 @@
+import threading
+from unittest import mock
+
+import pytest
+from botocore.exceptions import ClientError
+from pyathena.error import OperationalError
+from pyathena.model import AthenaQueryExecution
+from pyathena.util import RetryConfig
+
+from dbt.adapters.athena.connections import AthenaCursor
+from dbt.adapters.athena.polling import (
+    PollStats,
+    QueryPoller,
+    QueryRuntimeHistory,
+    get_poll_delay,
+    get_statement_fingerprint,
+)
+
+
+class TestPolling:
+    def test_get_poll_delay_backs_off(self):
+        delays = [get_poll_delay(polls, 0, 0.1, 1.0) for polls in range(8)]
+        assert delays[0] == 0.1
+        assert delays == sorted(delays)
+        assert delays[-1] == 1.0
+
+    def test_get_poll_delay_long_query(self):
+        # a 40 minutes statement with the default intervals
+        polls, elapsed = 0, 0.0
+        while elapsed < 40 * 60:
+            elapsed += get_poll_delay(polls, elapsed, 0.1, 5.0)
+            polls += 1
+        assert polls < 500
+
+    @pytest.mark.parametrize(
+        ("polls", "elapsed", "expected"),
+        (
+            pytest.param(0, 0, 0.1, id="warmup"),
+            pytest.param(5, 2.0, 30 * 0.8 - 2.0, id="skip_ahead"),
+            pytest.param(5, 25.0, 0.1 * 1.5**5, id="after_expected_end"),
+        ),
+    )
+    def test_get_poll_delay_with_expected_runtime(self, polls, elapsed, expected):
+        assert get_poll_delay(polls, elapsed, 0.1, 5.0, expected_runtime=30) == pytest.approx(expected)
+
+    def test_get_statement_fingerprint(self):
+        sql = "insert into t__0b1c2d3e_4f5a_6b7c_8d9e_0f1a2b3c4d5e select 1"
+        fingerprint = get_statement_fingerprint(sql, "model.a")
+        assert fingerprint == get_statement_fingerprint(
+            "INSERT INTO  t__1b1c2d3e_4f5a_6b7c_8d9e_0f1a2b3c4d5f\nselect 2", "model.a"
+        )
+        # the query comment changes between invocations, e.g. with the invocation id
+        assert fingerprint == get_statement_fingerprint(f'/* {{"invocation_id": "a1b2"}} */\n{sql}', "model.a")
+        assert fingerprint != get_statement_fingerprint(sql, "model.b")
+
+    def test_query_runtime_history(self):
+        history = QueryRuntimeHistory()
+        assert history.expected_runtime("a") is None
+        history.record("a", 10.0)
+        history.record("a", 20.0)
+        assert history.expected_runtime("a") == 15.0
+
+    def test_query_runtime_history_max_statements(self):
+        history = QueryRuntimeHistory()
+        with mock.patch("dbt.adapters.athena.polling.POLL_HISTORY_MAX_STATEMENTS", 2):
+            history.record("a", 1.0)
+            history.record("b", 2.0)
+            history.record("a", 3.0)
+            history.record("c", 4.0)
+        # the least recently run statement is dropped
+        assert [history.expected_runtime(f) for f in "abc"] == [2.0, None, 4.0]
+
+    def test_query_runtime_history_persisted(self, tmp_path):
+        path = str(tmp_path / "target" / "athena_query_runtimes.json")
+        history = QueryRuntimeHistory()
+        history.load(path)
+        history.record("a", 10.0)
+        history.record("b", 20.0)
+        history.save(path)
+
+        next_history = QueryRuntimeHistory()
+        next_history.record("b", 5.0)
+        next_history.load(path)
+        assert next_history.expected_runtime("a") == 10.0
+        assert next_history.expected_runtime("b") == 5.0
+
+    def test_query_runtime_history_corrupt_file(self, tmp_path):
+        path = tmp_path / "athena_query_runtimes.json"
+        path.write_text("{")
+        history = QueryRuntimeHistory()
+        history.load(str(path))
+        assert history.expected_runtime("a") is None
+
+    @staticmethod
+    def _query_execution(query_id, state):
+        return {"QueryExecutionId": query_id, "Query": "select 1", "Status": {"State": state}}
+
+    def test_query_poller_batches_queries(self):
+        client = mock.MagicMock()
+        states = {"a": ["RUNNING", "SUCCEEDED"], "b": ["RUNNING", "RUNNING", "FAILED"]}
+
+        def batch_get_query_execution(QueryExecutionIds):
+            return {"QueryExecutions": [self._query_execution(q, states[q].pop(0)) for q in QueryExecutionIds]}
+
+        client.batch_get_query_execution.side_effect = batch_get_query_execution
+        stats = PollStats()
+        poller = QueryPoller()
+        with mock.patch("dbt.adapters.athena.polling.poll_stats", stats):
+            with poller._condition:
+                # both queries are registered before the first poll
+                future_a = poller.poll(client, RetryConfig(), "a", 0.01, 0.01)
+                future_b = poller.poll(client, RetryConfig(), "b", 0.01, 0.01)
+            query_execution_a, polls_a = future_a.result(timeout=5)
+            query_execution_b, polls_b = future_b.result(timeout=5)
+        assert (query_execution_a.state, polls_a) == (AthenaQueryExecution.STATE_SUCCEEDED, 2)
+        assert (query_execution_b.state, polls_b) == (AthenaQueryExecution.STATE_FAILED, 3)
+        assert client.batch_get_query_execution.call_args_list[0].kwargs["QueryExecutionIds"] == ["a", "b"]
+        assert stats.stats()["calls"] == client.batch_get_query_execution.call_count == 3
+
+    def test_query_poller_shares_client(self):
+        # the clients of the connections of the dbt threads, with the same region and credentials
+        clients = [mock.MagicMock() for _ in range(3)]
+        clients[0].batch_get_query_execution.side_effect = lambda QueryExecutionIds: {
+            "QueryExecutions": [self._query_execution(q, "SUCCEEDED") for q in QueryExecutionIds]
+        }
+        poller = QueryPoller()
+        with poller._condition:
+            futures = [
+                poller.poll(client, RetryConfig(), str(i), 0.01, 0.01, client_key=("eu-west-1", "key"))
+                for i, client in enumerate(clients)
+            ]
+        assert [future.result(timeout=5)[0].state for future in futures] == [AthenaQueryExecution.STATE_SUCCEEDED] * 3
+        assert clients[0].batch_get_query_execution.call_count == 1
+        assert clients[0].batch_get_query_execution.call_args.kwargs["QueryExecutionIds"] == ["0", "1", "2"]
+        clients[1].batch_get_query_execution.assert_not_called()
+        clients[2].batch_get_query_execution.assert_not_called()
+
+    def test_query_poller_calls_concurrently(self):
+        throttled, client = mock.MagicMock(), mock.MagicMock()
+        release = threading.Event()
+
+        def throttled_call(QueryExecutionIds):
+            release.wait(timeout=5)
+            return {"QueryExecutions": [self._query_execution(q, "SUCCEEDED") for q in QueryExecutionIds]}
+
+        throttled.batch_get_query_execution.side_effect = throttled_call
+        client.batch_get_query_execution.side_effect = lambda QueryExecutionIds: {
+            "QueryExecutions": [self._query_execution(q, "SUCCEEDED") for q in QueryExecutionIds]
+        }
+        poller = QueryPoller()
+        with poller._condition:
+            throttled_future = poller.poll(throttled, RetryConfig(), "a", 0.01, 0.01, client_key="us-east-1")
+            future = poller.poll(client, RetryConfig(), "b", 0.01, 0.01, client_key="eu-west-1")
+        # the query of the other region is done while the throttled call is still running
+        assert future.result(timeout=2)[0].state == AthenaQueryExecution.STATE_SUCCEEDED
+        assert not throttled_future.done()
+        release.set()
+        assert throttled_future.result(timeout=5)[0].state == AthenaQueryExecution.STATE_SUCCEEDED
+
+    def test_query_poller_unprocessed_query(self):
+        client = mock.MagicMock()
+        client.batch_get_query_execution.return_value = {
+            "QueryExecutions": [],
+            "UnprocessedQueryExecutionIds": [
+                {"QueryExecutionId": "a", "ErrorCode": "InvalidRequestException", "ErrorMessage": "not found"}
+            ],
+        }
+        future = QueryPoller().poll(client, RetryConfig(), "a", 0.01, 0.01)
+        with pytest.raises(OperationalError, match="not found"):
+            future.result(timeout=5)
+
+    def test_query_poller_batch_denied(self):
+        client = mock.MagicMock()
+        client.batch_get_query_execution.side_effect = ClientError(
+            {"Error": {"Code": "AccessDeniedException", "Message": "not authorized"}}, "BatchGetQueryExecution"
+        )
+        client.get_query_execution.side_effect = lambda QueryExecutionId: {
+            "QueryExecution": self._query_execution(QueryExecutionId, "SUCCEEDED")
+        }
+        stats = PollStats()
+        poller = QueryPoller()
+        with mock.patch("dbt.adapters.athena.polling.poll_stats", stats):
+            with poller._condition:
+                futures = [poller.poll(client, RetryConfig(), q, 0.01, 0.01, client_key="key") for q in "ab"]
+            assert [future.result(timeout=5)[0].state for future in futures] == ["SUCCEEDED", "SUCCEEDED"]
+            # the credentials are not allowed to call BatchGetQueryExecution, it is not called again
+            future = poller.poll(client, RetryConfig(), "c", 0.01, 0.01, client_key="key")
+            assert future.result(timeout=5)[0].state == AthenaQueryExecution.STATE_SUCCEEDED
+        assert client.batch_get_query_execution.call_count == 1
+        assert client.get_query_execution.call_count == 3
+        assert stats.stats()["calls"] == 4
+
+    def test_query_poller_batch_error(self):
+        client = mock.MagicMock()
+        client.batch_get_query_execution.side_effect = [
+            ClientError({"Error": {"Code": "InternalServerException", "Message": "try again"}}, "BatchGet"),
+            {"QueryExecutions": [self._query_execution("a", "RUNNING")]},
+            {"QueryExecutions": [self._query_execution("a", "SUCCEEDED")]},
+        ]
+        client.get_query_execution.side_effect = lambda QueryExecutionId: {
+            "QueryExecution": self._query_execution(QueryExecutionId, "RUNNING")
+        }
+        query_execution, polls = QueryPoller().poll(client, RetryConfig(), "a", 0.01, 0.01).result(timeout=5)
+        # the failed batch call is made up for by a GetQueryExecution call, the next polls are made in batch again
+        assert (query_execution.state, polls) == (AthenaQueryExecution.STATE_SUCCEEDED, 3)
+        assert client.get_query_execution.call_count == 1
+        assert client.batch_get_query_execution.call_count == 3
+
+    def test_query_poller_fails_only_unpolled_queries(self):
+        client = mock.MagicMock()
+        client.batch_get_query_execution.side_effect = ClientError(
+            {"Error": {"Code": "InternalServerException", "Message": "try again"}}, "BatchGetQueryExecution"
+        )
+
+        def get_query_execution(QueryExecutionId):
+            if QueryExecutionId == "b":
+                raise ClientError({"Error": {"Code": "InvalidRequestException", "Message": "not found"}}, "Get")
+            return {"QueryExecution": self._query_execution(QueryExecutionId, "SUCCEEDED")}
+
+        client.get_query_execution.side_effect = get_query_execution
+        poller = QueryPoller()
+        with poller._condition:
+            future_a = poller.poll(client, RetryConfig(), "a", 0.01, 0.01)
+            future_b = poller.poll(client, RetryConfig(), "b", 0.01, 0.01)
+        assert future_a.result(timeout=5)[0].state == AthenaQueryExecution.STATE_SUCCEEDED
+        with pytest.raises(OperationalError, match="not found"):
+            future_b.result(timeout=5)
+
+    def test_cursor_poll(self):
+        connection = mock.MagicMock()
+        connection.cursor_kwargs = {"poll_min_interval": 0.1, "poll_max_interval": 5.0, "poll_history": True}
+        cursor = AthenaCursor(
+            connection=connection,
+            converter=mock.MagicMock(),
+            formatter=mock.MagicMock(),
+            retry_config=RetryConfig(),
+            poll_interval=1.0,
+        )
+        cursor._statement_fingerprint = get_statement_fingerprint("select 1")
+        succeeded = AthenaQueryExecution({"QueryExecution": self._query_execution("query_id", "SUCCEEDED")})
+        stats = PollStats()
+        history = QueryRuntimeHistory()
+        poller = mock.MagicMock()
+        poller.poll.return_value.result.return_value = (succeeded, 4)
+        with mock.patch("dbt.adapters.athena.connections.query_poller", poller), mock.patch(
+            "dbt.adapters.athena.connections.poll_stats", stats
+        ), mock.patch("dbt.adapters.athena.connections.query_runtime_history", history):
+            assert cursor._poll("query_id") is succeeded
+        assert poller.poll.call_args.args[2:5] == ("query_id", 0.1, 5.0)
+        assert stats.stats() == {"queries": 1, "polls": 4, "calls": 0}
+        assert history.expected_runtime(cursor._statement_fingerprint) is not None
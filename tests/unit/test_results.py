@@ -0,0 +1,153 @@
+import sys
+from datetime import date
+from decimal import Decimal
+
+import boto3
+import pytest
+from dbt_common.exceptions import DbtRuntimeError
+from moto import mock_aws
+
+from dbt.adapters.athena.results import (
+    arrow_to_agate,
+    batches_to_agate,
+    delete_s3_prefix,
+    import_pyarrow,
+    is_query,
+    is_reusable_query,
+    is_sorted,
+    iter_parquet_batches,
+    read_csv_result,
+    wrap_unload,
+)
+
+from .constants import AWS_REGION, BUCKET
+
+
+@pytest.mark.parametrize(
+    ("sql", "expected"),
+    (
+        pytest.param("select 1", True, id="select"),
+        pytest.param('/* {"app": "dbt"} */\nWITH a AS (select 1) select * from a', True, id="comment"),
+        pytest.param("-- comment\n  select 1", True, id="line_comment"),
+        pytest.param("insert into schema.table select 1", False, id="insert"),
+        pytest.param("create table schema.table as select 1", False, id="ctas"),
+        pytest.param("show tables", False, id="show"),
+    ),
+)
+def test_is_query(sql, expected):
+    assert is_query(sql) == expected
+
+
+@pytest.mark.parametrize(
+    ("sql", "modified", "expected"),
+    (
+        pytest.param("select max(ts) from schema.events", set(), True, id="query"),
+        pytest.param("insert into schema.events select 1", set(), False, id="not_a_query"),
+        pytest.param(
+            'select distinct "dt" from "schema"."model__dbt_tmp" order by "dt"', set(), False, id="incremental_tmp"
+        ),
+        pytest.param("select distinct dt from schema.model__ha", set(), False, id="ha_tmp"),
+        pytest.param(
+            "select dt from schema.model__dbt_tmp_0f8fad5b_d9cb_469f_a165_70867728950e", set(), False, id="unique_tmp"
+        ),
+        pytest.param("select max(ts) from schema.Events", {"events"}, False, id="modified"),
+        pytest.param("select max(ts) from schema.events", {"other"}, True, id="other_modified"),
+        pytest.param("/* model__ha */ select max(ts) from schema.events", set(), True, id="comment"),
+        pytest.param("select max(ts) from schema.events", None, False, id="unknown_modified"),
+    ),
+)
+def test_is_reusable_query(sql, modified, expected):
+    assert is_reusable_query(sql, modified) == expected
+
+
+@pytest.mark.parametrize(
+    ("sql", "expected"),
+    (
+        pytest.param("select a from t", False, id="unsorted"),
+        pytest.param("select a from t\nORDER\n  BY a;", True, id="order_by"),
+        pytest.param("select a from (select a from t order by a) as s", False, id="subquery"),
+        pytest.param("select row_number() over (order by a) from t", False, id="window"),
+        pytest.param("select a from (select a from t) as s order by a", True, id="after_subquery"),
+        pytest.param("select 'order by' as a from t", False, id="literal"),
+        pytest.param("-- order by\nselect a from t", False, id="comment"),
+    ),
+)
+def test_is_sorted(sql, expected):
+    assert is_sorted(sql) == expected
+
+
+def test_wrap_unload():
+    sql = wrap_unload("select 1 as a", "s3://bucket/unload/id/")
+    assert sql == (
+        "UNLOAD (\nselect 1 as a\n) TO 's3://bucket/unload/id/' WITH (format = 'PARQUET', compression = 'SNAPPY')"
+    )
+
+
+@pytest.mark.parametrize("sql", ("select 1 as a;", "select 1 as a ;\n", "select 1 as a;;  \n"))
+def test_wrap_unload_strips_semicolons(sql):
+    assert wrap_unload(sql, "s3://bucket/unload/id/").startswith("UNLOAD (\nselect 1 as a\n) TO ")
+
+
+def test_import_pyarrow_missing(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(DbtRuntimeError, match="requires pyarrow"):
+        import_pyarrow()
+
+
+@mock_aws
+def test_iter_parquet_batches(aws_credentials):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    s3 = boto3.client("s3", region_name=AWS_REGION)
+    s3.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": AWS_REGION})
+    for idx in range(3):
+        sink = pa.BufferOutputStream()
+        table = pa.table({"id": [idx * 2, idx * 2 + 1], "name": ["a", None], "tags": [["x"], None]})
+        pq.write_table(table, sink)
+        s3.put_object(Bucket=BUCKET, Key=f"unload/id/file_{idx}", Body=sink.getvalue().to_pybytes())
+
+    batches = iter_parquet_batches(s3, BUCKET, "unload/id/", max_workers=2)
+    table = batches_to_agate(batches, limit=5)
+    assert table.column_names == ("id", "name", "tags")
+    assert [row["id"] for row in table.rows] == [0, 1, 2, 3, 4]
+    assert table.rows[0]["tags"] == '["x"]'
+    assert table.rows[1]["name"] is None
+
+
+@mock_aws
+def test_delete_s3_prefix(aws_credentials):
+    s3 = boto3.client("s3", region_name=AWS_REGION)
+    s3.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": AWS_REGION})
+    for key in ("unload/id/file_0", "unload/id/file_1", "unload/other/file_0"):
+        s3.put_object(Bucket=BUCKET, Key=key, Body=b"")
+    assert delete_s3_prefix(s3, BUCKET, "unload/id/") == 2
+    assert [obj["Key"] for obj in s3.list_objects_v2(Bucket=BUCKET)["Contents"]] == ["unload/other/file_0"]
+
+
+def test_read_csv_result():
+    pytest.importorskip("pyarrow")
+    body = (
+        b'"dt","hour","price","active","name","tags"\n'
+        b'"2024-01-01","1","1.50","true","a","[x, y]"\n'
+        b'"2024-01-02",,,,"",\n'
+    )
+    description = [
+        ("dt", "date", None, None, 0, 0, "UNKNOWN"),
+        ("hour", "integer", None, None, 10, 0, "UNKNOWN"),
+        ("price", "decimal", None, None, 10, 2, "UNKNOWN"),
+        ("active", "boolean", None, None, 0, 0, "UNKNOWN"),
+        ("name", "varchar", None, None, 2147483647, 0, "UNKNOWN"),
+        ("tags", "array", None, None, 0, 0, "UNKNOWN"),
+    ]
+    table = arrow_to_agate(read_csv_result(body, description))
+    assert table.column_names == ("dt", "hour", "price", "active", "name", "tags")
+    assert tuple(table.rows[0]) == (date(2024, 1, 1), 1, Decimal("1.50"), True, "a", "[x, y]")
+    assert tuple(table.rows[1]) == (date(2024, 1, 2), None, None, None, "", None)
+
+
+def test_arrow_to_agate_limit():
+    pa = pytest.importorskip("pyarrow")
+    table = arrow_to_agate(pa.table({"id": list(range(10)), "value": [float(i) for i in range(10)]}), limit=3)
+    assert [row["id"] for row in table.rows] == [0, 1, 2]
+    assert table.rows[2]["value"] == Decimal("2.0")
@@ -1,12 +1,17 @@
 from unittest.mock import Mock, patch
 from uuid import UUID
 
+import boto3
 import botocore.session
 import pytest
 from dbt_common.exceptions import DbtRuntimeError
 
 from dbt.adapters.athena import AthenaCredentials
-from dbt.adapters.athena.session import AthenaSparkSessionManager, get_boto3_session
+from dbt.adapters.athena.session import (
+    AthenaSparkSessionManager,
+    Boto3ClientRegistry,
+    get_boto3_session,
+)
 from dbt.adapters.contracts.connection import Connection
 
 
@@ -41,6 +46,45 @@ class TestSession:
         assert session.profile_name == boto_profile_name
 
 
+class TestBoto3ClientRegistry:
+    @staticmethod
+    def _connection(num_boto3_retries=None):
+        credentials = AthenaCredentials(
+            database="db",
+            schema="schema",
+            s3_staging_dir="dir",
+            region_name="eu-west-1",
+            num_boto3_retries=num_boto3_retries,
+        )
+        handle = Mock(session=boto3.session.Session(region_name="eu-west-1"), region_name="eu-west-1")
+        return Mock(handle=handle, credentials=credentials)
+
+    def test_get_client_is_reused(self, aws_credentials):
+        registry = Boto3ClientRegistry()
+        connection = self._connection()
+        glue = registry.get_client(connection, "glue")
+        assert registry.get_client(connection, "glue") is glue
+        assert registry.get_client(connection, "s3") is not glue
+        assert registry.stats() == {"hits": 1, "misses": 2}
+
+    def test_get_client_is_keyed_by_connection_and_retries(self, aws_credentials):
+        registry = Boto3ClientRegistry()
+        connection = self._connection()
+        other_connection = self._connection()
+        other_connection.handle = connection.handle
+        other_connection.credentials = self._connection(num_boto3_retries=10).credentials
+        glue = registry.get_client(connection, "glue")
+        assert registry.get_client(self._connection(), "glue") is not glue
+        assert registry.get_client(other_connection, "glue") is not glue
+        assert registry.stats() == {"hits": 0, "misses": 3}
+
+    @pytest.mark.parametrize(("metadata_concurrency", "expected"), ((0, 10), (32, 32)))
+    def test_get_client_pool_fits_metadata_concurrency(self, aws_credentials, metadata_concurrency, expected):
+        registry = Boto3ClientRegistry(metadata_concurrency)
+        glue = registry.get_client(self._connection(), "glue")
+        assert glue.meta.config.max_pool_connections == expected
+
+
 @pytest.mark.usefixtures("athena_credentials", "athena_client")
 class TestAthenaSparkSessionManager:
     """
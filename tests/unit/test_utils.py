@@ -4,6 +4,7 @@ from dbt.adapters.athena.utils import (
     clean_sql_comment,
     ellipsis_comment,
     get_chunks,
+    get_table_name_expressions,
     is_valid_table_parameter_key,
     stringify_table_parameter_value,
 )
@@ -61,6 +62,14 @@ def test_get_chunks_more_elements_than_chunk():
     assert len(chunks) == 1
 
 
+def test_get_table_name_expressions():
+    assert list(get_table_name_expressions(["b", "A", "c-1", "a"])) == ["a|b|c\\-1"]
+
+
+def test_get_table_name_expressions_max_len():
+    assert list(get_table_name_expressions(["aaa", "bbb", "ccc"], max_len=7)) == ["aaa|bbb", "ccc"]
+
+
 @pytest.mark.parametrize(
     ("max_len", "expected"),
     (